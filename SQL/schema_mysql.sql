@@ -306,6 +306,7 @@ CREATE TABLE IF NOT EXISTS `Ingredients` (
   `IngredientID` int NOT NULL AUTO_INCREMENT,
   `Name` varchar(255) NOT NULL,
   `CreatedAt` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  `AllergenMask` bigint NOT NULL DEFAULT '0',
   PRIMARY KEY (`IngredientID`),
   UNIQUE KEY `Name` (`Name`)
 ) ENGINE=InnoDB AUTO_INCREMENT=112 DEFAULT CHARSET=utf8mb4;
@@ -715,8 +716,10 @@ CREATE TABLE IF NOT EXISTS `Recipes` (
   `NutritionInfoJSON` json DEFAULT NULL,
   `CreatedAt` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
   `UpdatedAt` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  `AllergenMask` bigint NOT NULL DEFAULT '0',
   PRIMARY KEY (`RecipeID`),
-  KEY `UserID` (`UserID`)
+  KEY `UserID` (`UserID`),
+  KEY `ix_recipes_public_created` (`is_public`,`CreatedAt`)
 ) ENGINE=InnoDB AUTO_INCREMENT=22 DEFAULT CHARSET=utf8mb4;
 
 --
@@ -1048,6 +1051,23 @@ ALTER TABLE `ForumPostTags`
 --
 ALTER TABLE `Recipes`
   ADD CONSTRAINT `recipes_ibfk_1` FOREIGN KEY (`UserID`) REFERENCES `users` (`UserID`) ON DELETE CASCADE;
+
+--
+-- Allergen bitmasks: bit (id - 1) for each allergy with id <= 63
+--
+UPDATE `Ingredients` i
+  JOIN (SELECT `ingredient_id`, BIT_OR(1 << (`allergy_intolerance_id` - 1)) AS `mask`
+        FROM `IngredientAllergiesIntolerances`
+        WHERE `allergy_intolerance_id` BETWEEN 1 AND 63
+        GROUP BY `ingredient_id`) a ON a.`ingredient_id` = i.`IngredientID`
+  SET i.`AllergenMask` = a.`mask`;
+
+UPDATE `Recipes` r
+  JOIN (SELECT ri.`RecipeID`, BIT_OR(i.`AllergenMask`) AS `mask`
+        FROM `RecipeIngredients` ri
+        JOIN `Ingredients` i ON i.`IngredientID` = ri.`IngredientID`
+        GROUP BY ri.`RecipeID`) m ON m.`RecipeID` = r.`RecipeID`
+  SET r.`AllergenMask` = m.`mask`;
 COMMIT;
 
 /*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
@@ -16,25 +16,74 @@ class AllergyAnalyzer:
             self.df.columns = [col.lower().replace(' ', '_') for col in self.df.columns]
             if 'food' not in self.df.columns:
                 raise ValueError("CSV must contain a 'Food' column.")
+            self._build_matcher()
         except Exception as e:
             raise ValueError(f"Error loading or processing allergy CSV: {e}")
 
-    def get_allergies(self, ingredient_name):
-        ingredient_name_lower = ingredient_name.lower()
-        
-        self.df.columns = [col.lower() for col in self.df.columns]
+    def _build_matcher(self):
+        """
+        Compiles every food name into an Aho-Corasick automaton. Bit i of an allergen
+        mask stands for self.allergens[i]; each food's mask is the union of its rows'
+        flags, and each automaton state's output mask also includes the masks of the
+        foods that end at its failure links, so one pass over an ingredient name finds
+        every food it contains.
+        """
         allergy_columns = [col for col in self.df.columns if col != 'food']
+        self.allergens = [col.replace('_', ' ') for col in allergy_columns]
+
+        flags = (self.df[allergy_columns] == 1).to_numpy()
+        food_masks = {}
+        for food_name, row_flags in zip(self.df['food'], flags):
+            if not isinstance(food_name, str):
+                continue
+            mask = sum(1 << i for i in row_flags.nonzero()[0].tolist())
+            food_masks[food_name] = food_masks.get(food_name, 0) | mask
 
-        allergies = []
+        # An empty food name is a substring of every ingredient.
+        self._empty_mask = food_masks.pop('', 0)
+        self._goto = [{}]
+        self._output = [0]
+        for food_name, mask in food_masks.items():
+            state = 0
+            for char in food_name:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._output.append(0)
+                state = next_state
+            self._output[state] |= mask
 
-        for index, row in self.df.iterrows():
-            food_name = row['food'].lower()
-            if food_name in ingredient_name_lower:
-                for allergen in allergy_columns:
-                    if row[allergen] == 1:
-                        formatted_allergen = allergen.replace('_', ' ')
-                        allergies.append(formatted_allergen)
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+                queue.append(next_state)
 
-        return list(set(allergies))
+    def get_allergen_mask(self, ingredient_name):
+        """Returns the union of the allergen masks of every food contained in ingredient_name."""
+        goto, fail, output = self._goto, self._fail, self._output
+        mask = self._empty_mask
+        state = 0
+        for char in ingredient_name.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            mask |= output[state]
+        return mask
 
+    def allergens_for_mask(self, mask):
+        return [allergen for i, allergen in enumerate(self.allergens) if mask >> i & 1]
+
+    def get_allergies(self, ingredient_name):
+        return self.allergens_for_mask(self.get_allergen_mask(ingredient_name))
 
+    def analyze_many(self, ingredient_names):
+        """Returns a dict mapping each ingredient name to its allergens, matching each distinct name once."""
+        return {name: self.get_allergies(name) for name in dict.fromkeys(ingredient_names)}
@@ -1,35 +1,48 @@
 import spacy
 import os
 import json
-from backend.ai_models.food_classification.food_classifier import FoodClassifier
+from typing import TYPE_CHECKING
 from backend.services.main.food_lookup_service import FoodLookupService
 from backend.services.main.substitution_service import SubstitutionService
+from backend.utils.spacy_registry import spacy_registry
+
+if TYPE_CHECKING:
+    # Imports TensorFlow; with inference workers the chatbot is handed a RemoteClassifier instead
+    from backend.ai_models.food_classification.food_classifier import FoodClassifier
 
 class FoodChatbot:
-    def __init__(self, food_classifier_instance: FoodClassifier,
+    # Intent parsing reads lemmas, POS tags, dependencies and noun chunks; no entities
+    SPACY_COMPONENTS = ('tagger', 'parser', 'lemmatizer')
+
+    def __init__(self, food_classifier_instance: 'FoodClassifier',
                  food_lookup_service_instance: FoodLookupService,
                  substitution_service_instance: SubstitutionService,
                  spacy_model_name="en_core_web_sm",
-                 config_path="backend/ai_models/chatbot/chatbot_config.json"):
+                 config_path="backend/ai_models/chatbot/chatbot_config.json",
+                 classification_cache=None):
         """
         Initializes the FoodChatbot with injected dependencies.
 
         Args:
-            food_classifier_instance (FoodClassifier): An instance of FoodClassifier.
+            food_classifier_instance (FoodClassifier): An instance of FoodClassifier, or a RemoteClassifier
+                when classifiers run in inference workers.
             food_lookup_service_instance (FoodLookupService): An instance of FoodLookupService.
             substitution_service_instance (SubstitutionService): An instance of SubstitutionService.
-            spacy_model_name (str): The name of the spaCy model to load.
+            spacy_model_name (str): The name of the spaCy model, shared through spacy_registry.
             config_path (str): Path to the chatbot configuration file.
+            classification_cache (ImageResultCache, optional): Cache of food classification results,
+                shared with ClassificationService so an image classified by either is not run twice.
         """
         self.nlp = None
         self.food_classifier = food_classifier_instance
         self.food_lookup_service = food_lookup_service_instance
         self.substitution_service = substitution_service_instance
+        self.classification_cache = classification_cache
         self.all_models_loaded = False
         self.config = self._load_config(config_path)
 
         try:
-            self.nlp = spacy.load(spacy_model_name)
+            self.nlp = spacy_registry.get(spacy_model_name, self.SPACY_COMPONENTS)
             print(f"FoodChatbot: SpaCy model '{spacy_model_name}' loaded successfully.")
 
             if self.nlp and self.food_classifier and self.food_lookup_service and self.substitution_service:
@@ -50,7 +63,7 @@ class FoodChatbot:
                 print(f"Attempting to download spaCy model: {spacy_model_name}")
                 try:
                     spacy.cli.download(spacy_model_name)
-                    self.nlp = spacy.load(spacy_model_name)
+                    self.nlp = spacy_registry.get(spacy_model_name, self.SPACY_COMPONENTS)
                     if self.nlp:
                         print(f"Successfully downloaded and loaded spaCy model '{spacy_model_name}'. Re-checking overall status.")
                         if self.nlp and self.food_classifier and self.food_lookup_service and self.substitution_service:
@@ -91,13 +104,14 @@ class FoodChatbot:
         """Checks if the chatbot and its core components are loaded."""
         return self.all_models_loaded
 
-    def process_query(self, text_query, image_path=None):
+    def process_query(self, text_query, image=None):
         """
         Processes a user's query.
 
         Args:
             text_query (str): The text part of the user's query.
-            image_path (str, optional): Path to an image file, if provided.
+            image (optional): The image to classify, if provided: a file path, image bytes
+                or a binary file-like object such as an upload stream.
 
         Returns:
             dict: A dictionary containing the chatbot's response.
@@ -105,10 +119,10 @@ class FoodChatbot:
         if not self.is_ready():
             return {"error": "Chatbot is not ready. Core models may have failed to load."}
 
-        image_provided = image_path is not None
+        image_provided = image is not None
         intent, entities = self._recognize_intent(text_query, image_provided)
 
-        response = self._handle_intent(intent, entities, text_query, image_path)
+        response = self._handle_intent(intent, entities, text_query, image)
 
         return response
 
@@ -338,15 +352,15 @@ class FoodChatbot:
         print(f"Recognized intent: {intent}, Entities: {entities} (Query: '{text_query}', Image provided: {image_provided})")
         return intent, entities
 
-    def _handle_intent(self, intent, entities, text_query, image_path=None):
+    def _handle_intent(self, intent, entities, text_query, image=None):
         """
         Handles the recognized intent and generates a response.
         """
         response_text = "I'm sorry, I didn't understand that. Can you please rephrase or try asking about food classification, substitutes, or nutrition?"
 
         if intent == "classify_food_image":
-            if image_path and self.food_classifier and (not hasattr(self.food_classifier, 'is_model_loaded') or self.food_classifier.is_model_loaded()):
-                predictions = self.food_classifier.predict_food(image_path)
+            if image is not None and self.food_classifier and (not hasattr(self.food_classifier, 'is_model_loaded') or self.food_classifier.is_model_loaded()):
+                predictions = self._classify_image(image)
                 if predictions:
                     pred_strings = [f"{p['name']} ({p['confidence']:.0%})" for p in predictions[:3]]
                     classification_response = f"Top results: {', '.join(pred_strings)}."
@@ -385,7 +399,7 @@ class FoodChatbot:
                         response_text = classification_response
                 else:
                     response_text = "Could not classify the image."
-            elif not image_path:
+            elif image is None:
                 response_text = "Please provide an image for classification."
             else:
                 response_text = "Food image classification model is not available or not loaded."
@@ -523,6 +537,26 @@ class FoodChatbot:
 
         return {"response": response_text}
 
+    def _classify_image(self, image):
+        """
+        Returns the food classifier's top predictions for the image, through classification_cache when set.
+        """
+        if self.classification_cache is None:
+            return self.food_classifier.predict_food(image)
+        try:
+            decoded = self.food_classifier.load_image(image)
+        except Exception as e:
+            print(f"FoodChatbot: Could not decode image for classification: {e}")
+            return []
+        cache_key = self.classification_cache.key('food', decoded)
+        cached = self.classification_cache.get(cache_key)
+        if cached is not None:
+            return cached['predictions']
+        predictions = self.food_classifier.predict_food(decoded)
+        if predictions:
+            self.classification_cache.put(cache_key, {'predictions': predictions})
+        return predictions
+
     def _format_nutrition(self, nutrition_data):
         """
         Formats nutrition data into a concise string.
@@ -2,14 +2,28 @@ import tensorflow as tf
 import numpy as np
 import json
 import os
+from PIL import Image
 from tensorflow.keras.preprocessing import image as keras_image
+from backend.utils.image_decode import decode_image, is_image_path
 from backend.utils.logging_utils import log_success, log_error, log_warning
+from backend.utils.micro_batcher import MicroBatcher
+from backend.utils.tf_runtime import compile_inference
+from backend.utils.tflite_runtime import TFLiteModel
 
 class FoodClassifier:
-    def __init__(self, model_base_path=None, model_file_name="food_model.keras", indices_json_name="class_names.json", image_size=(224, 224)):
+    def __init__(self, model_base_path=None, model_file_name="food_model.keras", indices_json_name="class_names.json", image_size=(224, 224),
+                 backend='keras', tflite_file_name="food_model.tflite", tflite_threads=None):
+        """
+        :param backend: 'keras' runs the .keras model under TensorFlow; 'tflite' runs the converted
+                        tflite_file_name (see backend.ai_models.tflite_conversion), falling back to
+                        Keras when it has not been converted.
+        :param tflite_threads: TFLite interpreter threads (None = one per core).
+        """
         self.image_size = image_size
         self.model_loaded = False
         self.model = None
+        self.batcher = None
+        self._infer = None
         self.idx_to_class = {}
         self.input_shape_for_model = image_size + (3,)
         self.input_dtype_for_model = tf.float32
@@ -17,7 +31,13 @@ class FoodClassifier:
         if model_base_path is None:
             model_base_path = os.path.dirname(os.path.abspath(__file__))
 
-        model_path = os.path.join(model_base_path, model_file_name)
+        self.tflite_path = os.path.join(model_base_path, tflite_file_name)
+        if backend == 'tflite' and not os.path.exists(self.tflite_path):
+            log_warning(f"TFLite model not found at {self.tflite_path}, using the Keras model.", "FoodClassifier")
+            backend = 'keras'
+        self.backend = backend
+
+        model_path = self.tflite_path if backend == 'tflite' else os.path.join(model_base_path, model_file_name)
         indices_path = os.path.join(model_base_path, indices_json_name)
 
         if not os.path.exists(model_path):
@@ -36,19 +56,24 @@ class FoodClassifier:
             self.idx_to_class = {i: name for i, name in enumerate(class_names_list)}
             log_success(f"Loaded {len(self.idx_to_class)} class names from JSON: {indices_path}", "FoodClassifier")
 
-            # Try loading with compile=False first to avoid compatibility issues
-            try:
-                self.model = tf.keras.models.load_model(model_path, compile=False)
-                log_success(f"Loaded model from .keras file: {model_path}", "FoodClassifier")
-            except Exception as model_load_error:
-                log_warning(f"Initial model load failed, trying alternative method: {model_load_error}", "FoodClassifier")
-                # Try with different loading method
+            if backend == 'tflite':
+                self.model = TFLiteModel(model_path, num_threads=tflite_threads)
+                self._infer = self.model.predict
+                log_success(f"Loaded TFLite model: {model_path}", "FoodClassifier")
+            else:
+                # Try loading with compile=False first to avoid compatibility issues
                 try:
-                    import keras
-                    self.model = keras.models.load_model(model_path, compile=False)
-                    log_success(f"Loaded model with Keras fallback from .keras file: {model_path}", "FoodClassifier")
-                except Exception as keras_load_error:
-                    raise Exception(f"Failed to load model with both TensorFlow and Keras: {keras_load_error}")
+                    self.model = tf.keras.models.load_model(model_path, compile=False)
+                    log_success(f"Loaded model from .keras file: {model_path}", "FoodClassifier")
+                except Exception as model_load_error:
+                    log_warning(f"Initial model load failed, trying alternative method: {model_load_error}", "FoodClassifier")
+                    # Try with different loading method
+                    try:
+                        import keras
+                        self.model = keras.models.load_model(model_path, compile=False)
+                        log_success(f"Loaded model with Keras fallback from .keras file: {model_path}", "FoodClassifier")
+                    except Exception as keras_load_error:
+                        raise Exception(f"Failed to load model with both TensorFlow and Keras: {keras_load_error}")
 
             self.model_loaded = True
 
@@ -59,22 +84,58 @@ class FoodClassifier:
     def is_model_loaded(self):
         return self.model_loaded
 
-    def preprocess_image(self, image_path):
+    def enable_batching(self, max_batch_size=16, max_wait_ms=5.0):
+        """Routes predict_food through a MicroBatcher so concurrent requests share forward passes."""
+        self.batcher = MicroBatcher(self.predict_batch, max_batch_size, max_wait_ms, name='food_classifier')
+        return self.batcher
+
+    def compile_inference(self, warmup=True):
+        """Runs predict_batch through a tf.function traced for any batch of input_shape_for_model images."""
+        if self.backend == 'tflite':
+            # The TFLite interpreter already runs a static graph
+            return
+        self._infer = compile_inference(self.model, self.input_shape_for_model, warmup, name='food_classifier')
+
+    def predict_batch(self, images):
+        """Runs one forward pass over a (n, height, width, 3) batch of preprocessed images."""
+        if self._infer is not None:
+            return self._infer(images)
+        predictions = self.model(images, training=False)
+        return predictions.numpy() if hasattr(predictions, 'numpy') else np.asarray(predictions)
+
+    def load_image(self, image_source):
+        """
+        Decodes image_source into an RGB PIL image of image_size.
+
+        :param image_source: Path to an image file, or image bytes / a binary file-like object
+                             (e.g. an upload stream), which is decoded in memory.
+        """
+        if is_image_path(image_source):
+            return keras_image.load_img(image_source, target_size=self.image_size)
+        return decode_image(image_source, self.image_size)
+
+    def preprocess_image(self, image_source):
+        """
+        :param image_source: Anything load_image accepts, or a PIL image it already returned.
+        """
         if not self.is_model_loaded():
             raise RuntimeError("Model is not loaded.")
-        img = keras_image.load_img(image_path, target_size=self.image_size)
+        img = image_source if isinstance(image_source, Image.Image) else self.load_image(image_source)
         img_array = keras_image.img_to_array(img)
         img_array_preprocessed = tf.keras.applications.mobilenet_v2.preprocess_input(img_array)
         return np.expand_dims(img_array_preprocessed, axis=0)
 
-    def predict_food(self, img_path, top_k=3):
+    def predict_food(self, img_source, top_k=3):
         if not self.is_model_loaded():
             log_error("Model is not loaded.", "FoodClassifier")
             return []
 
         try:
-            preprocessed_image = self.preprocess_image(img_path)
-            predictions = self.model.predict(preprocessed_image)
+            preprocessed_image = self.preprocess_image(img_source)
+            if self.batcher is not None:
+                predictions = self.batcher.predict(preprocessed_image)
+            else:
+                predictions = self.predict_batch(preprocessed_image)
 
             if predictions.ndim == 2 and predictions.shape[0] == 1:
                 predictions_1d = predictions[0]
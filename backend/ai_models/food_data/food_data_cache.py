@@ -0,0 +1,70 @@
+"""
+Columnar binary cache of FOOD-DATA.csv used by NutritionDatabase.
+
+The per-food nutrient values are stored as one float64 matrix (NaN where the CSV
+value is missing or invalid), the food names as string tables and the trigram
+index used for substring search, all memory-mapped so every worker process
+shares one page-cache copy. Artifacts live under
+'<csv dir>/.food_data_cache/<csv name>/<fingerprint>' and are rebuilt
+automatically when the CSV or CACHE_VERSION changes.
+
+Build it ahead of time with:
+    python -m backend.ai_models.food_data.food_data_cache [csv_path]
+"""
+import os
+import sys
+
+from backend.utils import mmap_tables
+
+CACHE_VERSION = 2
+CACHE_DIR_NAME = '.food_data_cache'
+
+NUMERIC_TABLES = (
+    'values',
+    'sorted_name_rows',
+    'lookup_rows',
+    'trigram_offsets',
+    'trigram_rows',
+)
+STRING_TABLES = (
+    'columns',
+    'names',
+    'sorted_names',
+    'lookup_keys',
+    'names_lower',
+    'trigrams',
+)
+
+
+_cache = mmap_tables.ArtifactCache(
+    'food data cache', CACHE_VERSION, NUMERIC_TABLES, STRING_TABLES,
+    salt=f"food-data-cache-v{CACHE_VERSION}",
+    source_paths=lambda csv_path: [csv_path],
+    default_root=lambda csv_path: mmap_tables.csv_cache_root(csv_path, CACHE_DIR_NAME),
+    manifest_extra=lambda csv_path: {'source_file': os.path.basename(csv_path)}
+)
+# source_fingerprint(csv_path), default_cache_root(csv_path),
+# load_tables(csv_path, cache_root=None, mmap=True), save_tables(csv_path, tables, cache_root=None)
+source_fingerprint = _cache.source_fingerprint
+default_cache_root = _cache.default_cache_root
+load_tables = _cache.load_tables
+save_tables = _cache.save_tables
+
+
+def main(argv=None):
+    from backend.ai_models.food_data.nutrition_database import NutritionDatabase, DEFAULT_CSV_PATH
+
+    argv = sys.argv[1:] if argv is None else argv
+    csv_path = argv[0] if argv else DEFAULT_CSV_PATH
+
+    database = NutritionDatabase(csv_path=csv_path, use_cache=False)
+    artifact_dir = save_tables(csv_path, database.export_tables())
+    if artifact_dir is None:
+        print("Food data cache was not written.")
+        return 1
+    print(f"Food data cache written to {artifact_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,88 @@
 import csv
-import json
 import os
+from bisect import bisect_left
+from collections.abc import Mapping
+
+import numpy as np
+
+from backend.ai_models.food_data import food_data_cache
+
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(__file__), 'Data', 'FOOD-DATA.csv')
+
+QUERY_OPERATORS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '==': np.equal,
+}
+
+
+class _FoodDataView(Mapping):
+    """Read-only {food name: {column: value or None}} view over the value matrix."""
+
+    def __init__(self, database):
+        self._database = database
+
+    def __getitem__(self, food_name):
+        row = self._database._row_for_name(food_name)
+        if row is None:
+            raise KeyError(food_name)
+        return self._database._row_values(row)
+
+    def __iter__(self):
+        return iter(self._database.names)
+
+    def __len__(self):
+        return len(self._database.names)
+
+
+class _NameLookupView(Mapping):
+    """Read-only {lowercase name: original name} view, iterated in sorted key order."""
+
+    def __init__(self, database):
+        self._database = database
+
+    def __getitem__(self, key):
+        database = self._database
+        index = _sorted_index(database.lookup_keys, key)
+        if index is None:
+            raise KeyError(key)
+        return database.names[int(database.lookup_rows[index])]
+
+    def __iter__(self):
+        return iter(self._database.lookup_keys)
+
+    def __len__(self):
+        return len(self._database.lookup_keys)
+
+
+def _sorted_index(sorted_values, value):
+    if not isinstance(value, str):
+        return None
+    index = bisect_left(sorted_values, value)
+    if index < len(sorted_values) and sorted_values[index] == value:
+        return index
+    return None
+
 
 class NutritionDatabase:
-    def __init__(self, csv_path = os.path.join(os.path.dirname(__file__), 'Data', 'FOOD-DATA.csv')):
-        self.food_data = {}
-        self.name_lookup = {}
-        self.load_data(csv_path)
+    def __init__(self, csv_path=DEFAULT_CSV_PATH, use_cache=True, cache_dir=None):
+        """
+        :param csv_path: FOOD-DATA style CSV with a 'food' column and one column per nutrient.
+        :param use_cache: Load from (and refresh) the memory-mapped cache in food_data_cache,
+                          so worker processes share one copy instead of each parsing the CSV.
+        :param cache_dir: Optional cache location, see food_data_cache.default_cache_root.
+        """
+        tables = food_data_cache.load_tables(csv_path, cache_dir) if use_cache else None
+        if tables is None:
+            tables = self._read_csv(csv_path)
+            if use_cache:
+                food_data_cache.save_tables(csv_path, tables, cache_dir)
+        self._load_tables(tables)
+        self._payloads = {}
+        self.food_data = _FoodDataView(self)
+        self.name_lookup = _NameLookupView(self)
         self.unit_map = self._build_unit_map()
 
     def _build_unit_map(self):
@@ -47,16 +123,106 @@ class NutritionDatabase:
             "Nutrition Density": ""
         }
 
-    def load_data(self, path):
+    def _read_csv(self, path):
+        """
+        Parses the CSV into the columnar layout stored by food_data_cache. As with a
+        dict keyed by name, a repeated food name keeps its first position and last values.
+        """
+        food_rows = {}
+        name_lookup = {}
         with open(path, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
+            columns = [column for column in (reader.fieldnames or []) if column != 'food']
             for row in reader:
                 original_name = row['food'].strip()
-                key = original_name.lower()
-                self.food_data[original_name] = {
-                    k: self._parse_value(v) for k, v in row.items() if k != 'food'
-                }
-                self.name_lookup[key] = original_name
+                food_rows[original_name] = [self._parse_value(row[column]) for column in columns]
+                name_lookup[original_name.lower()] = original_name
+
+        names = list(food_rows)
+        row_by_name = {name: row for row, name in enumerate(names)}
+        values = np.array(
+            [[np.nan if value is None else value for value in food_rows[name]] for name in names],
+            dtype=np.float64
+        ).reshape(len(names), len(columns))
+        sorted_names = sorted(names)
+        lookup_keys = sorted(name_lookup)
+        names_lower = [name.lower() for name in names]
+        return {
+            **self._build_trigram_index(names_lower),
+            'columns': columns,
+            'names': names,
+            'values': values,
+            'sorted_names': sorted_names,
+            'sorted_name_rows': np.array([row_by_name[name] for name in sorted_names], dtype=np.int32),
+            'lookup_keys': lookup_keys,
+            'lookup_rows': np.array([row_by_name[name_lookup[key]] for key in lookup_keys], dtype=np.int32),
+            'names_lower': names_lower
+        }
+
+    @staticmethod
+    def _build_trigram_index(names_lower):
+        """
+        Builds an inverted index from every 3-character substring of the lowercased
+        names to the (ascending) rows containing it. Trigrams are sorted for bisection
+        and their row lists are slices trigram_offsets[i]:trigram_offsets[i + 1].
+        """
+        postings = {}
+        for row, name in enumerate(names_lower):
+            for trigram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                postings.setdefault(trigram, []).append(row)
+
+        trigrams = sorted(postings)
+        offsets = [0]
+        rows = []
+        for trigram in trigrams:
+            rows.extend(postings[trigram])
+            offsets.append(len(rows))
+        return {
+            'trigrams': trigrams,
+            'trigram_offsets': np.array(offsets, dtype=np.int64),
+            'trigram_rows': np.array(rows, dtype=np.int32)
+        }
+
+    def _load_tables(self, tables):
+        self.columns = list(tables['columns'])
+        self.names = tables['names']
+        self.values = tables['values']
+        self.sorted_names = tables['sorted_names']
+        self.sorted_name_rows = tables['sorted_name_rows']
+        self.lookup_keys = tables['lookup_keys']
+        self.lookup_rows = tables['lookup_rows']
+        self.names_lower = tables['names_lower']
+        self.trigrams = tables['trigrams']
+        self.trigram_offsets = tables['trigram_offsets']
+        self.trigram_rows = tables['trigram_rows']
+        self._column_index = {column.lower(): i for i, column in enumerate(self.columns)}
+
+    def export_tables(self):
+        """Returns the loaded tables in the layout stored by food_data_cache."""
+        return {
+            'columns': self.columns,
+            'names': self.names,
+            'values': self.values,
+            'sorted_names': self.sorted_names,
+            'sorted_name_rows': self.sorted_name_rows,
+            'lookup_keys': self.lookup_keys,
+            'lookup_rows': self.lookup_rows,
+            'names_lower': self.names_lower,
+            'trigrams': self.trigrams,
+            'trigram_offsets': self.trigram_offsets,
+            'trigram_rows': self.trigram_rows
+        }
+
+    def _row_for_name(self, food_name):
+        index = _sorted_index(self.sorted_names, food_name)
+        return None if index is None else int(self.sorted_name_rows[index])
+
+    def _row_values(self, row):
+        # NaN marks values _parse_value rejected; it never returns NaN itself.
+        return {
+            column: None if value != value else value
+            for column, value in zip(self.columns, self.values[row].tolist())
+        }
 
     def _parse_value(self, val):
         try:
@@ -77,43 +243,129 @@ class NutritionDatabase:
             if name in self.name_lookup:
                 return [self.name_lookup[name]]
 
-        matches = [
-            original_name for original_name in self.food_data
-            if any(term in original_name.lower() for term in candidates)
-        ]
-        return matches
+        rows = np.unique(np.concatenate([self._substring_rows(term) for term in candidates]))
+        return [self.names[row] for row in rows.tolist()]
+
+    def _trigram_postings(self, trigram):
+        index = _sorted_index(self.trigrams, trigram)
+        if index is None:
+            return np.empty(0, dtype=np.int32)
+        return self.trigram_rows[self.trigram_offsets[index]:self.trigram_offsets[index + 1]]
+
+    def _substring_rows(self, term):
+        """
+        Returns the rows whose lowercased name contains term. Terms of three or more
+        characters intersect the posting lists of their trigrams and then confirm the
+        (few) remaining rows; shorter terms scan names_lower.
+        """
+        if len(term) < 3:
+            return np.array([row for row, name in enumerate(self.names_lower) if term in name], dtype=np.int32)
+
+        postings = sorted((self._trigram_postings(term[i:i + 3]) for i in range(len(term) - 2)), key=len)
+        rows = postings[0]
+        for other in postings[1:]:
+            if rows.size == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+
+        if len(term) > 3 and rows.size:
+            # Trigram postings only say each piece occurs; check the whole term does.
+            rows = np.array([row for row in rows.tolist() if term in self.names_lower[row]], dtype=np.int32)
+        return rows
 
     def get_food_info(self, query):
         matches = self.find_matches(query)
         if len(matches) == 1:
-            return self._format_food_json(matches[0])
+            return self._format_food(matches[0])
         elif len(matches) > 1:
-            return json.dumps({
+            return {
                 "matches": matches,
                 "message": "Multiple matches found. Please select one."
-            }, indent=2)
+            }
         else:
-            return json.dumps({"error": "Food not found"}, indent=2)
+            return {"error": "Food not found"}
 
     def get_food_by_exact_name(self, food_name):
         if food_name in self.food_data:
-            return self._format_food_json(food_name)
+            return self._format_food(food_name)
         else:
-            return json.dumps({"error": "Exact food name not found"}, indent=2)
-
-    def _format_food_json(self, food_name):
-        raw_data = self.food_data[food_name]
-        formatted_data = {}
-
-        for k, v in raw_data.items():
-            if v is not None:
-                unit = self.unit_map.get(k, "")
-                formatted_data[k] = {
-                    "value": v,
-                    "unit": unit
+            return {"error": "Exact food name not found"}
+
+    def resolve_column(self, column):
+        """Returns the canonical name of a nutrient column (case-insensitive). Raises ValueError if unknown."""
+        index = self._column_index.get(str(column).strip().lower())
+        if index is None:
+            raise ValueError(f"Unknown nutrient '{column}'")
+        return self.columns[index]
+
+    def query_foods(self, filters=None, sort_by=None, limit=20):
+        """
+        Vectorized filter / sort / top-N over the foods x nutrients matrix, e.g. fiber > 5 g
+        and sugar < 2 g, top 20 by protein:
+            query_foods([('Dietary Fiber', '>', 5), ('Sugars', '<', 2)], [('Protein', True)], 20)
+
+        :param filters: Iterable of (column, operator, value); operators are the keys of
+                        QUERY_OPERATORS and values are in the column's unit (see unit_map).
+                        Foods missing a filtered value never match.
+        :param sort_by: Iterable of (column, descending) pairs, primary key first. Missing
+                        values sort last; ties keep CSV order.
+        :param limit: Maximum number of foods returned (None for all).
+        :returns: {'total': number of matching foods, 'results': [{'food', 'data'}]}, where
+                  'data' holds the filtered and sorted columns in the _format_food shape.
+        """
+        filters = [(self.resolve_column(column), operator, value) for column, operator, value in (filters or [])]
+        sort_by = [(self.resolve_column(column), bool(descending)) for column, descending in (sort_by or [])]
+
+        mask = np.ones(len(self.names), dtype=bool)
+        for column, operator, value in filters:
+            if operator not in QUERY_OPERATORS:
+                raise ValueError(f"Unsupported operator '{operator}'")
+            mask &= QUERY_OPERATORS[operator](self.values[:, self._column_index[column.lower()]], float(value))
+        rows = np.flatnonzero(mask)
+
+        if sort_by:
+            keys = []
+            for column, descending in reversed(sort_by):
+                key = self.values[rows, self._column_index[column.lower()]]
+                keys.append(np.nan_to_num(-key if descending else key, nan=np.inf))
+            rows = rows[np.lexsort(keys)]
+        if limit is not None:
+            rows = rows[:limit]
+
+        columns = list(dict.fromkeys([column for column, _, _ in filters] + [column for column, _ in sort_by]))
+        indexes = [self._column_index[column.lower()] for column in columns]
+        results = []
+        for row, values in zip(rows.tolist(), self.values[np.ix_(rows, indexes)].tolist()):
+            results.append({
+                "food": self.names[row],
+                "data": {
+                    column: {"value": value, "unit": self.unit_map.get(column, "")}
+                    for column, value in zip(columns, values) if value == value
                 }
+            })
+        return {"total": int(mask.sum()), "results": results}
 
-        return json.dumps({
-            "food": food_name,
-            "data": formatted_data
-        }, indent=2)
\ No newline at end of file
+    def _format_food(self, food_name):
+        """
+        Returns the {'food', 'data'} payload for food_name. It is built on the first
+        request for each food and the same dict is returned afterwards, so callers
+        must treat it as read-only; JSON encoding happens once, at the HTTP boundary.
+        """
+        row = self._row_for_name(food_name)
+        if row is None:
+            raise KeyError(food_name)
+        payload = self._payloads.get(row)
+        if payload is None:
+            formatted_data = {}
+            for k, v in self._row_values(row).items():
+                if v is not None:
+                    formatted_data[k] = {
+                        "value": v,
+                        "unit": self.unit_map.get(k, "")
+                    }
+            payload = {
+                "food": food_name,
+                "data": formatted_data
+            }
+            self._payloads[row] = payload
+        return payload
@@ -1,9 +1,8 @@
 import os
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
 import json
 
+
 class GeminiNlpParser:
     def __init__(self):
         dotenv_path = os.path.join(os.path.dirname(__file__), '../../.env')
@@ -18,6 +17,12 @@ class GeminiNlpParser:
         if not self.api_key:
             print("Warning: GEMINI_API_KEY not found in environment variables.")
 
+    def _client(self):
+        # google.genai takes most of a second to import, so it is only imported once a request calls Gemini
+        from google import genai
+
+        return genai.Client(api_key=self.api_key)
+
     def parse_recipe(self, recipe_text: str):
         if not self.api_key:
             print("ERROR in GeminiNlpParser: GEMINI_API_KEY not found or not loaded.")
@@ -25,7 +30,9 @@ class GeminiNlpParser:
             return {"error": "API key not configured", "Title": "Error: API Key Missing", "Ingredients": [], "Instructions": []}
 
         try:
-            client = genai.Client(api_key=self.api_key)
+            from google.genai import types
+
+            client = self._client()
             model_name = "gemini-1.5-flash-8b"
             system_instruction_text = '''When user uploads a text that potentially contains a recipe, extract infotmation and  parse them into the given sample json format. nothing can be a NULL value.
                 {
@@ -157,7 +164,9 @@ class GeminiNlpParser:
             """
 
 
-            client = genai.Client(api_key=self.api_key)
+            from google.genai import types
+
+            client = self._client()
             model_name = "gemini-1.5-flash-8b"
             # print(nutrition_prompt)
             
@@ -261,7 +270,9 @@ class GeminiNlpParser:
             }}
             """
 
-            client = genai.Client(api_key=self.api_key)
+            from google.genai import types
+
+            client = self._client()
             model_name = "gemini-1.5-flash-8b"
             
             current_contents = [
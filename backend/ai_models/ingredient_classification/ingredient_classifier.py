@@ -1,12 +1,18 @@
 import numpy as np
 import tensorflow as tf
 from keras.preprocessing import image
+from PIL import Image
 import os
 import json
+from backend.utils.image_decode import decode_image, is_image_path
 from backend.utils.logging_utils import log_success, log_error, log_warning
+from backend.utils.micro_batcher import MicroBatcher
+from backend.utils.tf_runtime import compile_inference
+from backend.utils.tflite_runtime import TFLiteModel
 
 class FoodIngredientClassifier:
-    def __init__(self, model_base_path=None, model_file_name='ingredient_model.keras', class_names_file='class_names.json', img_size=(224, 224)):
+    def __init__(self, model_base_path=None, model_file_name='ingredient_model.keras', class_names_file='class_names.json', img_size=(224, 224),
+                 backend='keras', tflite_file_name='ingredient_model.tflite', tflite_threads=None):
         """
         Initializes the classifier.
         :param model_base_path: Base path to the 'ingredient_classification' directory.
@@ -14,15 +20,29 @@ class FoodIngredientClassifier:
         :param model_file_name: Name of the Keras model file.
         :param class_names_file: Name of the JSON file for class names.
         :param img_size: Tuple for image target size.
+        :param backend: 'keras', or 'tflite' to run the converted tflite_file_name (see
+                        backend.ai_models.tflite_conversion); falls back to Keras if it is missing.
+        :param tflite_file_name: Name of the TFLite model file.
+        :param tflite_threads: TFLite interpreter threads (None = one per core).
         """
         if model_base_path is None:
             model_base_path = os.path.dirname(os.path.abspath(__file__))
 
+        self.tflite_path = os.path.join(model_base_path, tflite_file_name)
+        if backend == 'tflite' and not os.path.exists(self.tflite_path):
+            log_warning(f"TFLite model not found at {self.tflite_path}, using the Keras model.", "FoodIngredientClassifier")
+            backend = 'keras'
+        self.backend = backend
+        if backend == 'tflite':
+            model_file_name = tflite_file_name
+
         self.model_path = os.path.join(model_base_path, model_file_name)
         self.class_names_path = os.path.join(model_base_path, class_names_file)
         self.img_size = img_size
         
         self.model = None
+        self.batcher = None
+        self._infer = None
         self.idx_to_class = {}
         self.model_loaded = False
 
@@ -32,21 +52,26 @@ class FoodIngredientClassifier:
             if not os.path.exists(self.class_names_path):
                 raise FileNotFoundError(f"Class names JSON not found at: {self.class_names_path}. User needs to place '{class_names_file}' here.")
 
-            import keras
-            
-            # Try loading with compile=False to avoid potential issues
-            try:
-                self.model = keras.models.load_model(self.model_path, compile=False)
-                log_success(f"Model loaded from {self.model_path}", "FoodIngredientClassifier")
-            except Exception as model_load_error:
-                # Try with custom objects if the first attempt fails
-                log_warning(f"Initial model load failed, trying with compile=False: {model_load_error}", "FoodIngredientClassifier")
+            if backend == 'tflite':
+                self.model = TFLiteModel(self.model_path, num_threads=tflite_threads)
+                self._infer = self.model.predict
+                log_success(f"TFLite model loaded from {self.model_path}", "FoodIngredientClassifier")
+            else:
+                import keras
+
+                # Try loading with compile=False to avoid potential issues
                 try:
-                    import tensorflow as tf
-                    self.model = tf.keras.models.load_model(self.model_path, compile=False)
-                    log_success(f"Model loaded with TensorFlow fallback from {self.model_path}", "FoodIngredientClassifier")
-                except Exception as tf_load_error:
-                    raise Exception(f"Failed to load model with both Keras and TensorFlow: {tf_load_error}")
+                    self.model = keras.models.load_model(self.model_path, compile=False)
+                    log_success(f"Model loaded from {self.model_path}", "FoodIngredientClassifier")
+                except Exception as model_load_error:
+                    # Try with custom objects if the first attempt fails
+                    log_warning(f"Initial model load failed, trying with compile=False: {model_load_error}", "FoodIngredientClassifier")
+                    try:
+                        import tensorflow as tf
+                        self.model = tf.keras.models.load_model(self.model_path, compile=False)
+                        log_success(f"Model loaded with TensorFlow fallback from {self.model_path}", "FoodIngredientClassifier")
+                    except Exception as tf_load_error:
+                        raise Exception(f"Failed to load model with both Keras and TensorFlow: {tf_load_error}")
             
             with open(self.class_names_path, 'r') as f:
                 class_names = json.load(f)
@@ -65,30 +90,66 @@ class FoodIngredientClassifier:
     def is_model_loaded(self):
         return self.model_loaded
 
-    def preprocess_image(self, img_path):
+    def enable_batching(self, max_batch_size=16, max_wait_ms=5.0):
+        """Routes predict_ingredient through a MicroBatcher so concurrent requests share forward passes."""
+        self.batcher = MicroBatcher(self.predict_batch, max_batch_size, max_wait_ms, name='ingredient_classifier')
+        return self.batcher
+
+    def compile_inference(self, warmup=True):
+        """Runs predict_batch through a tf.function traced for any batch of img_size RGB images."""
+        if self.backend == 'tflite':
+            # The TFLite interpreter already runs a static graph
+            return
+        self._infer = compile_inference(self.model, self.img_size + (3,), warmup, name='ingredient_classifier')
+
+    def predict_batch(self, images):
+        """
+        Runs one forward pass over a (n, height, width, 3) batch of preprocessed images.
+        :return: numpy array of shape (n, num_classes).
+        """
+        if self._infer is not None:
+            return self._infer(images)
+        raw_predictions = self.model(images, training=False)
+        if hasattr(raw_predictions, 'numpy'):
+            return raw_predictions.numpy()
+        if isinstance(raw_predictions, np.ndarray):
+            return raw_predictions
+        raise ValueError(f"Unexpected prediction output type: {type(raw_predictions)}")
+
+    def load_image(self, img_source):
+        """
+        Decodes img_source into an RGB PIL image of img_size.
+
+        :param img_source: Path to an image file, or image bytes / a binary file-like object
+                           (e.g. an upload stream), which is decoded in memory.
+        """
+        if is_image_path(img_source):
+            return image.load_img(img_source, target_size=self.img_size)
+        return decode_image(img_source, self.img_size)
+
+    def preprocess_image(self, img_source):
+        """
+        :param img_source: Anything load_image accepts, or a PIL image it already returned.
+        """
         if not self.is_model_loaded():
             raise RuntimeError("Model is not loaded. Cannot preprocess image.")
-        img = image.load_img(img_path, target_size=self.img_size)
+        img = img_source if isinstance(img_source, Image.Image) else self.load_image(img_source)
         img_array = image.img_to_array(img) / 255.0
         return np.expand_dims(img_array, axis=0)
 
-    def predict_ingredient(self, img_path, top_k=3):
+    def predict_ingredient(self, img_source, top_k=3):
         if not self.is_model_loaded():
             log_warning("Prediction skipped, model not loaded.", "FoodIngredientClassifier")
             return []
 
         try:
-            processed_img = self.preprocess_image(img_path)
+            processed_img = self.preprocess_image(img_source)
             if self.model is None:
                 raise RuntimeError("Model is not loaded.")
-            raw_predictions = self.model(processed_img, training=False)
-
-            if hasattr(raw_predictions, 'numpy'):
-                preds = raw_predictions.numpy()[0]
-            elif isinstance(raw_predictions, np.ndarray):
-                preds = raw_predictions[0]
+            if self.batcher is not None:
+                preds = self.batcher.predict(processed_img)[0]
             else:
-                raise ValueError(f"Unexpected prediction output type: {type(raw_predictions)}")
+                preds = self.predict_batch(processed_img)[0]
 
             top_indices = np.argsort(preds)[-top_k:][::-1]
             
@@ -100,5 +161,6 @@ class FoodIngredientClassifier:
             
             return results
         except Exception as e:
-            log_error(f"Error during prediction for {img_path} - {e}", "FoodIngredientClassifier")
+            source_name = img_source if is_image_path(img_source) else "uploaded image"
+            log_error(f"Error during prediction for {source_name} - {e}", "FoodIngredientClassifier")
             return []
@@ -0,0 +1,75 @@
+"""
+Columnar binary cache of the USDA nutrition tables used by OfflineNutritionLookup.
+
+Parsing food.csv / nutrient.csv / food_nutrient.csv with pandas dominates worker
+start-up, so the parsed and indexed tables are written once as .npy files and
+memory-mapped on later boots. Descriptions and tokens stay in mmap'd string
+tables (see backend.utils.mmap_tables), so all worker processes share one
+page-cache copy instead of each holding a DataFrame. Each artifact lives in a
+directory named after a fingerprint of the source CSVs (name, size and mtime)
+plus CACHE_VERSION, so it is rebuilt automatically whenever a CSV changes or
+the layout below changes.
+
+Build it ahead of time with:
+    python -m backend.ai_models.nutrition_lookup.nutrition_cache [data_folder]
+"""
+import os
+import sys
+
+from backend.utils import mmap_tables
+
+CACHE_VERSION = 3
+CACHE_DIR_NAME = '.nutrition_cache'
+SOURCE_FILES = ('food.csv', 'nutrient.csv', 'food_nutrient.csv')
+
+NUMERIC_TABLES = (
+    'food_fdc_ids',
+    'nutrient_ids',
+    'nutrient_fdc_ids',
+    'nutrient_offsets',
+    'nutrient_codes',
+    'nutrient_amounts',
+    'token_offsets',
+    'token_positions',
+)
+STRING_TABLES = (
+    'food_descriptions',
+    'food_descriptions_clean',
+    'nutrient_names',
+    'nutrient_units',
+    'tokens',
+)
+
+
+_cache = mmap_tables.ArtifactCache(
+    'nutrition cache', CACHE_VERSION, NUMERIC_TABLES, STRING_TABLES,
+    salt=f"nutrition-cache-v{CACHE_VERSION}",
+    source_paths=lambda data_folder: [os.path.join(data_folder, file_name) for file_name in SOURCE_FILES],
+    default_root=lambda data_folder: os.path.join(data_folder, CACHE_DIR_NAME),
+    manifest_extra=lambda data_folder: {'source_files': list(SOURCE_FILES)}
+)
+# source_fingerprint(data_folder), default_cache_root(data_folder),
+# load_tables(data_folder, cache_root=None, mmap=True), save_tables(data_folder, tables, cache_root=None)
+source_fingerprint = _cache.source_fingerprint
+default_cache_root = _cache.default_cache_root
+load_tables = _cache.load_tables
+save_tables = _cache.save_tables
+
+
+def main(argv=None):
+    from backend.ai_models.nutrition_lookup.nutrition_lookup import OfflineNutritionLookup
+
+    argv = sys.argv[1:] if argv is None else argv
+    data_folder = argv[0] if argv else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data')
+
+    lookup = OfflineNutritionLookup(data_folder=data_folder, use_cache=False)
+    artifact_dir = save_tables(data_folder, lookup.export_tables())
+    if artifact_dir is None:
+        print("Nutrition cache was not written.")
+        return 1
+    print(f"Nutrition cache written to {artifact_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
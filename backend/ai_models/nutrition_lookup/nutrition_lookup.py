@@ -1,25 +1,48 @@
 import os
+from bisect import bisect_left
+import numpy as np
 import pandas as pd
-from rapidfuzz import process
+from rapidfuzz import fuzz, process
 import json
 import re
 import warnings
+from backend.ai_models.nutrition_lookup import nutrition_cache
 
 class OfflineNutritionLookup:
-    def __init__(self, data_folder):
+    _NOT_CACHED = object()
+
+    def __init__(self, data_folder, use_cache=True, cache_dir=None, match_cache=None):
+        """
+        :param data_folder: Folder containing food.csv, nutrient.csv and food_nutrient.csv.
+        :param use_cache: Load from (and refresh) the binary cache in nutrition_cache
+                          instead of parsing the CSVs on every start-up.
+        :param cache_dir: Optional cache location, defaults to '<data_folder>/.nutrition_cache'.
+        :param match_cache: Optional LRUCache of best matches keyed by cleaned food name.
+        """
+        self.match_cache = match_cache
+        tables = nutrition_cache.load_tables(data_folder, cache_dir) if use_cache else None
+        if tables is not None:
+            self._load_tables(tables)
+            return
+
+        self._load_csv(data_folder)
+        if use_cache:
+            nutrition_cache.save_tables(data_folder, self.export_tables(), cache_dir)
+
+    def _load_csv(self, data_folder):
         # Suppress pandas DtypeWarnings for this specific case
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=pd.errors.DtypeWarning)
-            
+
             # Build full paths
             food_csv = os.path.join(data_folder, "food.csv")
             nutrient_csv = os.path.join(data_folder, "nutrient.csv")
             food_nutrient_csv = os.path.join(data_folder, "food_nutrient.csv")
 
-            self.food_df = pd.read_csv(food_csv)
-            self.food_df = self.food_df.dropna(subset=['description'])
+            food_df = pd.read_csv(food_csv)
+            food_df = food_df.dropna(subset=['description'])
             self.nutrient_df = pd.read_csv(nutrient_csv)
-            
+
             # Define dtype for mixed columns to avoid warning
             food_nutrient_dtypes = {
                 'footnote': 'str',  # Column 9 has mixed types, force to string
@@ -27,55 +50,307 @@ class OfflineNutritionLookup:
                 'max': 'str',
                 'median': 'str'
             }
-            self.food_nutrient_df = pd.read_csv(food_nutrient_csv, dtype=food_nutrient_dtypes, low_memory=False)
+            food_nutrient_df = pd.read_csv(food_nutrient_csv, dtype=food_nutrient_dtypes, low_memory=False)
 
-        self.food_df['description_clean'] = self.food_df['description'].apply(self._clean_string)
+        food_df['description_clean'] = food_df['description'].apply(self._clean_string)
+        self._food_df = food_df
+        self.food_fdc_ids = food_df['fdc_id'].to_numpy(dtype=np.int64)
+        self.food_descriptions = [str(d) for d in food_df['description']]
+        self._descriptions_clean = food_df['description_clean'].tolist()
         self.nutrient_lookup = self.nutrient_df.set_index('id')[['name', 'unit_name']].to_dict('index')
+        self._build_nutrient_index(food_nutrient_df)
+        self._build_token_index()
+
+    def _load_tables(self, tables):
+        """
+        Uses the cached tables in place: numeric arrays and food string tables stay
+        memory-mapped, so worker processes share them through the page cache.
+        Only the small nutrient name/unit tables are decoded into Python objects.
+        """
+        self._food_df = None
+        self.food_fdc_ids = tables['food_fdc_ids']
+        self.food_descriptions = tables['food_descriptions']
+        self._descriptions_clean = tables['food_descriptions_clean']
+        self.nutrient_df = pd.DataFrame({
+            'id': tables['nutrient_ids'],
+            'name': tables['nutrient_names'],
+            'unit_name': tables['nutrient_units']
+        })
+        self.nutrient_lookup = {
+            int(nutrient_id): {'name': name, 'unit_name': unit}
+            for nutrient_id, name, unit in zip(tables['nutrient_ids'], tables['nutrient_names'], tables['nutrient_units'])
+        }
+        self.nutrient_ids = tables['nutrient_ids']
+        self.nutrient_names = list(tables['nutrient_names'])
+        self.nutrient_units = list(tables['nutrient_units'])
+        self.nutrient_fdc_ids = tables['nutrient_fdc_ids']
+        self.nutrient_offsets = tables['nutrient_offsets']
+        self.nutrient_codes = tables['nutrient_codes']
+        self.nutrient_amounts = tables['nutrient_amounts']
+        self._food_nutrient_df = None
+        self.tokens = tables['tokens']
+        self.token_offsets = tables['token_offsets']
+        self.token_positions = tables['token_positions']
+
+    def export_tables(self):
+        """Returns the loaded tables in the layout stored by nutrition_cache."""
+        return {
+            'food_fdc_ids': self.food_fdc_ids,
+            'food_descriptions': self.food_descriptions,
+            'food_descriptions_clean': self._descriptions_clean,
+            'nutrient_ids': self.nutrient_ids,
+            'nutrient_names': self.nutrient_names,
+            'nutrient_units': self.nutrient_units,
+            'nutrient_fdc_ids': self.nutrient_fdc_ids,
+            'nutrient_offsets': self.nutrient_offsets,
+            'nutrient_codes': self.nutrient_codes,
+            'nutrient_amounts': self.nutrient_amounts,
+            'tokens': self.tokens,
+            'token_offsets': self.token_offsets,
+            'token_positions': self.token_positions
+        }
+
+    def _build_nutrient_index(self, food_nutrient_df):
+        """
+        Groups food_nutrient rows by fdc_id into contiguous sorted arrays so a
+        food's nutrients are the slice offsets[i]:offsets[i + 1] of the row arrays.
+        Nutrient names and units are resolved once into a small code table.
+        """
+        self.nutrient_names = []
+        self.nutrient_units = []
+        code_by_id = {}
+        for nutrient_id, info in self.nutrient_lookup.items():
+            code_by_id[nutrient_id] = len(self.nutrient_names)
+            self.nutrient_names.append(info['name'])
+            self.nutrient_units.append(info['unit_name'])
+        self.nutrient_ids = np.array(list(code_by_id.keys()), dtype=np.int64)
+
+        rows = food_nutrient_df[['fdc_id', 'nutrient_id', 'amount']]
+        rows = rows[rows['nutrient_id'].isin(code_by_id.keys()) & rows['fdc_id'].notna()]
+        rows = rows.sort_values('fdc_id', kind='mergesort')
+
+        fdc_ids = rows['fdc_id'].to_numpy(dtype=np.int64)
+        self.nutrient_fdc_ids, starts = np.unique(fdc_ids, return_index=True)
+        self.nutrient_offsets = np.append(starts, len(fdc_ids)).astype(np.int64)
+        self.nutrient_codes = rows['nutrient_id'].map(code_by_id).to_numpy(dtype=np.int32)
+        self.nutrient_amounts = rows['amount'].to_numpy(dtype=np.float64)
+        self._food_nutrient_df = None
+
+    def _build_token_index(self):
+        """
+        Builds an inverted index from each word of description_clean to the
+        (ascending) food positions containing it, stored as one positions
+        array sliced by token_offsets. Tokens are kept sorted so they can be
+        looked up by bisection, including from a memory-mapped string table.
+        """
+        postings = {}
+        for position, description in enumerate(self._descriptions_clean):
+            for token in set(description.split()):
+                postings.setdefault(token, []).append(position)
+
+        self.tokens = sorted(postings)
+        offsets = [0]
+        positions = []
+        for token in self.tokens:
+            positions.extend(postings[token])
+            offsets.append(len(positions))
+        self.token_offsets = np.array(offsets, dtype=np.int64)
+        self.token_positions = np.array(positions, dtype=np.int32)
+
+    def _token_postings(self, token):
+        token_id = bisect_left(self.tokens, token)
+        if token_id == len(self.tokens) or self.tokens[token_id] != token:
+            return np.empty(0, dtype=np.int32)
+        return self.token_positions[self.token_offsets[token_id]:self.token_offsets[token_id + 1]]
+
+    def _candidate_positions(self, base_word):
+        """
+        Returns the food positions whose description contains base_word as
+        whole words, with an optional plural 's' on the last word - the same
+        rows the regex post-filter in _match_food_scan accepts. Returns None for
+        queries the index cannot answer exactly (empty or irregular whitespace).
+        """
+        tokens = base_word.split()
+        if not tokens or ' '.join(tokens) != base_word:
+            return None
+
+        *leading, last = tokens
+        candidates = np.union1d(self._token_postings(last), self._token_postings(last + 's'))
+        for token in leading:
+            if candidates.size == 0:
+                break
+            candidates = np.intersect1d(candidates, self._token_postings(token), assume_unique=True)
+
+        if leading and candidates.size:
+            # Posting lists only say the words occur; check they are adjacent and in order.
+            pattern = re.compile(r'\b' + re.escape(base_word) + r's?\b')
+            candidates = np.array([p for p in candidates.tolist() if pattern.search(self._descriptions_clean[p])], dtype=np.int32)
+        return candidates
+
+    @property
+    def food_df(self):
+        """fdc_id / description / description_clean rows, rebuilt from the tables on first access."""
+        if self._food_df is None:
+            self._food_df = pd.DataFrame({
+                'fdc_id': self.food_fdc_ids,
+                'description': list(self.food_descriptions),
+                'description_clean': list(self._descriptions_clean)
+            })
+        return self._food_df
+
+    @property
+    def food_nutrient_df(self):
+        """fdc_id / nutrient_id / amount rows, rebuilt from the index on first access."""
+        if self._food_nutrient_df is None:
+            self._food_nutrient_df = pd.DataFrame({
+                'fdc_id': np.repeat(self.nutrient_fdc_ids, np.diff(self.nutrient_offsets)),
+                'nutrient_id': self.nutrient_ids[self.nutrient_codes],
+                'amount': self.nutrient_amounts
+            })
+        return self._food_nutrient_df
 
     def _clean_string(self, text):
         if not isinstance(text, str):
             text = ''
         return re.sub(r'[^a-z0-9\s]', '', text.lower().strip())
 
+    def _food_match(self, position, score):
+        return {
+            'fdc_id': int(self.food_fdc_ids[position]),
+            'description': self.food_descriptions[position],
+            'score': float(score)
+        }
+
     def _match_food(self, food_name, top_n=10):
+        """
+        Returns the top_n best-scoring foods among those whose description contains the
+        query's base word (see _candidate_positions). Unlike _match_food_scan, which keeps
+        only the base-word rows that made the global top_n, rows without the word (e.g.
+        'eggplant' for 'egg') cannot crowd the matches out, so a query can find matches
+        the scan misses.
+        """
         query_clean = self._clean_string(food_name)
-        choices = self.food_df['description_clean'].tolist()
+        base_word = query_clean.rstrip('s')
+        candidates = self._candidate_positions(base_word)
+        if candidates is None:
+            return self._match_food_scan(food_name, top_n)
+
+        choices = [self._descriptions_clean[p] for p in candidates.tolist()]
         matches = process.extract(query_clean, choices, limit=top_n)
 
+        results = [self._food_match(int(candidates[index]), score) for match_clean, score, index in matches]
+
+        return sorted(results, key=lambda x: x['score'], reverse=True)
+
+    def _match_food_scan(self, food_name, top_n=10):
+        """
+        Scores every description, keeps the global top_n and drops those without the query's
+        base word. Used for queries the token index cannot answer.
+        """
+        query_clean = self._clean_string(food_name)
+        matches = process.extract(query_clean, self._descriptions_clean, limit=top_n)
+
+        base_word = query_clean.rstrip('s')
+        query_pattern = r'\b' + re.escape(base_word) + r's?\b'
         results = []
         for match_clean, score, index in matches:
-            row = self.food_df.iloc[index]
-
-            base_word = query_clean.rstrip('s')
-            query_pattern = r'\b' + re.escape(base_word) + r's?\b'
-            if not re.search(query_pattern, row['description_clean']):
+            if not re.search(query_pattern, match_clean):
                 continue
-
-            results.append({
-                'fdc_id': int(row['fdc_id']),
-                'description': row['description'],
-                'score': float(score)
-            })
+            results.append(self._food_match(index, score))
 
         return sorted(results, key=lambda x: x['score'], reverse=True)
 
-    def get_nutrition_for_food(self, food_name):
-        matches = self._match_food(food_name)
+    def _match_foods_batch(self, food_names, workers=1):
+        """
+        Returns the best match (or None) for each name, like _match_food(name)[0].
+        All indexable queries are scored against the union of their shortlists in
+        one rapidfuzz cdist call; workers is passed through (-1 uses all cores).
+        """
+        queries = [self._clean_string(name) for name in food_names]
+        candidates = [self._candidate_positions(query.rstrip('s')) for query in queries]
+        best = [None] * len(food_names)
+
+        indexed = [i for i, c in enumerate(candidates) if c is not None and c.size]
+        for i, c in enumerate(candidates):
+            if c is None:
+                matches = self._match_food_scan(food_names[i])
+                best[i] = matches[0] if matches else None
+        if not indexed:
+            return best
+
+        columns = np.unique(np.concatenate([candidates[i] for i in indexed]))
+        choices = [self._descriptions_clean[p] for p in columns.tolist()]
+        scores = process.cdist([queries[i] for i in indexed], choices, scorer=fuzz.WRatio,
+                               dtype=np.float64, workers=workers)
+
+        for row, i in enumerate(indexed):
+            own_columns = np.searchsorted(columns, candidates[i])
+            own_scores = scores[row, own_columns]
+            # argmax keeps the lowest position on ties, matching process.extract ordering
+            top = int(np.argmax(own_scores))
+            best[i] = self._food_match(int(candidates[i][top]), own_scores[top])
+        return best
+
+    def find_food_matches(self, food_names, workers=1):
+        """Batch version of find_food_match sharing the same match_cache entries."""
+        results = [None] * len(food_names)
+        pending = []
+        for i, name in enumerate(food_names):
+            cached = self._NOT_CACHED
+            if self.match_cache is not None:
+                cached = self.match_cache.get(self._clean_string(name), self._NOT_CACHED)
+            if cached is self._NOT_CACHED:
+                pending.append(i)
+            else:
+                results[i] = cached
+
+        if pending:
+            matched = self._match_foods_batch([food_names[i] for i in pending], workers=workers)
+            for i, top in zip(pending, matched):
+                results[i] = top
+                if self.match_cache is not None:
+                    self.match_cache.put(self._clean_string(food_names[i]), top)
+        return results
+
+    def find_food_match(self, food_name):
+        """
+        Returns the best match for food_name as {'fdc_id', 'description', 'score'}, or None.
+        Results (including misses) are memoised in match_cache when one is configured.
+        """
+        if self.match_cache is None:
+            matches = self._match_food(food_name)
+            return matches[0] if matches else None
 
-        if not matches:
+        key = self._clean_string(food_name)
+        top = self.match_cache.get(key, self._NOT_CACHED)
+        if top is self._NOT_CACHED:
+            matches = self._match_food(food_name)
+            top = matches[0] if matches else None
+            self.match_cache.put(key, top)
+        return top
+
+    def get_nutrition_for_food(self, food_name, nutrients=None):
+        """
+        Looks up the best matching food and returns its nutrition.
+        :param nutrients: Optional iterable of nutrient names (e.g. 'Energy', 'Protein').
+                          When given, only those nutrients are included in the result.
+        """
+        top = self.find_food_match(food_name)
+
+        if top is None:
             if food_name.lower().endswith('s'):
                 alt_food_name = food_name[:-1]
             else:
                 alt_food_name = food_name + 's'
-            matches = self._match_food(alt_food_name)
-        else:
-            alt_food_name = None
+            top = self.find_food_match(alt_food_name)
+
+        return self._build_nutrition_result(food_name, top, nutrients)
 
-        if not matches:
+    def _build_nutrition_result(self, food_name, top, nutrients=None):
+        if top is None:
             return {'success': False, 'error': f"No food match found for '{food_name}'"}
 
-        top = matches[0]
-        nutrition = self._get_nutrition(top['fdc_id'])
+        nutrition = self._get_nutrition(top['fdc_id'], nutrients)
 
         result = {
             'success': True,
@@ -92,15 +367,38 @@ class OfflineNutritionLookup:
 
         return result
 
-    def _get_nutrition(self, fdc_id):
-        nutrients = self.food_nutrient_df[self.food_nutrient_df['fdc_id'] == fdc_id]
+    def get_nutrition_for_foods(self, food_names, nutrients=None, workers=1):
+        """
+        Batch version of get_nutrition_for_food. Returns one result per name, in order,
+        each shaped like get_nutrition_for_food's result plus the original 'query'.
+        """
+        tops = self.find_food_matches(food_names, workers=workers)
+
+        retry = [i for i, top in enumerate(tops) if top is None]
+        if retry:
+            alt_names = [food_names[i][:-1] if food_names[i].lower().endswith('s') else food_names[i] + 's' for i in retry]
+            for i, top in zip(retry, self.find_food_matches(alt_names, workers=workers)):
+                tops[i] = top
+
+        return [
+            {'query': name, **self._build_nutrition_result(name, top, nutrients)}
+            for name, top in zip(food_names, tops)
+        ]
+
+    def _get_nutrition(self, fdc_id, nutrients=None):
+        pos = np.searchsorted(self.nutrient_fdc_ids, fdc_id)
+        if pos >= len(self.nutrient_fdc_ids) or self.nutrient_fdc_ids[pos] != fdc_id:
+            return {}
+
+        start, end = self.nutrient_offsets[pos], self.nutrient_offsets[pos + 1]
+        wanted = set(nutrients) if nutrients is not None else None
         nutrition = {}
-        for _, row in nutrients.iterrows():
-            nutrient_id = row['nutrient_id']
-            if nutrient_id in self.nutrient_lookup:
-                nutrient_info = self.nutrient_lookup[nutrient_id]
-                nutrition[nutrient_info['name']] = {
-                    'amount': float(row['amount']),
-                    'unit': nutrient_info['unit_name']
-                }
+        for code, amount in zip(self.nutrient_codes[start:end].tolist(), self.nutrient_amounts[start:end].tolist()):
+            name = self.nutrient_names[code]
+            if wanted is not None and name not in wanted:
+                continue
+            nutrition[name] = {
+                'amount': amount,
+                'unit': self.nutrient_units[code]
+            }
         return nutrition
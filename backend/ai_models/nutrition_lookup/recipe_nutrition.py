@@ -0,0 +1,285 @@
+import re
+from fractions import Fraction
+
+# Output nutrients in the same shape GeminiNlpParser.extract_recipe_nutrition returns.
+# Each key lists the USDA nutrient names to try in order, and the output unit.
+RECIPE_NUTRIENTS = {
+    'calories': (('Energy', 'Energy (Atwater General Factors)', 'Energy (Atwater Specific Factors)'), 'kcal'),
+    'protein': (('Protein',), 'g'),
+    'carbohydrates': (('Carbohydrate, by difference', 'Carbohydrate, by summation', 'Carbohydrates'), 'g'),
+    'fat': (('Total lipid (fat)',), 'g'),
+    'fiber': (('Fiber, total dietary',), 'g'),
+    'sugar': (('Sugars, total including NLEA', 'Total Sugars', 'Sugars, Total'), 'g'),
+    'sodium': (('Sodium, Na',), 'mg'),
+    'cholesterol': (('Cholesterol',), 'mg'),
+}
+USDA_NUTRIENT_NAMES = sorted({name for names, _ in RECIPE_NUTRIENTS.values() for name in names})
+
+# USDA amounts are per 100 g; these convert the source unit to the output unit.
+UNIT_FACTORS = {
+    ('kcal', 'kcal'): 1.0,
+    ('kj', 'kcal'): 1 / 4.184,
+    ('g', 'g'): 1.0,
+    ('mg', 'g'): 0.001,
+    ('mg', 'mg'): 1.0,
+    ('g', 'mg'): 1000.0,
+    ('ug', 'mg'): 0.001,
+    ('µg', 'mg'): 0.001,
+}
+
+MASS_UNITS_G = {
+    'g': 1.0, 'gr': 1.0, 'gram': 1.0,
+    'kg': 1000.0, 'kilogram': 1000.0,
+    'mg': 0.001, 'milligram': 0.001,
+    'oz': 28.3495, 'ounce': 28.3495,
+    'lb': 453.592, 'lbs': 453.592, 'pound': 453.592,
+}
+
+VOLUME_UNITS_ML = {
+    'ml': 1.0, 'milliliter': 1.0, 'millilitre': 1.0,
+    'cl': 10.0, 'dl': 100.0,
+    'l': 1000.0, 'liter': 1000.0, 'litre': 1000.0,
+    'tsp': 4.92892, 'teaspoon': 4.92892,
+    'tbsp': 14.7868, 'tablespoon': 14.7868, 'tbs': 14.7868, 'tbl': 14.7868,
+    'cup': 236.588, 'c': 236.588,
+    'fl oz': 29.5735, 'fluid ounce': 29.5735,
+    'pint': 473.176, 'pt': 473.176,
+    'quart': 946.353, 'qt': 946.353,
+    'gallon': 3785.41, 'gal': 3785.41,
+    'pinch': 0.31, 'dash': 0.62,
+}
+
+UNIT_ALIASES = {'leaves': 'leaf', 'pinches': 'pinch', 'dashes': 'dash', 'bunches': 'bunch', 'lbs': 'lb'}
+
+# Units that count whole items; the item weight comes from PIECE_WEIGHTS_G.
+COUNT_UNITS = {
+    '', 'unit', 'piece', 'pc', 'pcs', 'whole', 'item', 'each', 'ea', 'no', 'nos', 'number',
+    'small', 'medium', 'large', 'serving',
+}
+SIZE_FACTORS = {'small': 0.75, 'large': 1.25}
+
+# Count-like units with a fixed weight regardless of the ingredient.
+FIXED_UNITS_G = {
+    'clove': 3.0, 'slice': 25.0, 'stick': 113.0, 'can': 400.0, 'tin': 400.0, 'jar': 450.0,
+    'packet': 10.0, 'sachet': 10.0, 'bunch': 100.0, 'handful': 30.0, 'sprig': 1.0,
+    'leaf': 0.5, 'stalk': 40.0, 'head': 500.0, 'fillet': 150.0, 'breast': 174.0,
+}
+
+# Typical weight of one item, keyed by a word (or phrase) in the ingredient name.
+PIECE_WEIGHTS_G = {
+    'egg': 50.0, 'garlic': 3.0, 'onion': 110.0, 'shallot': 25.0, 'tomato': 123.0, 'potato': 213.0,
+    'sweet potato': 130.0, 'carrot': 61.0, 'celery': 40.0, 'cucumber': 300.0, 'zucchini': 196.0,
+    'bell pepper': 119.0, 'chili': 45.0, 'chilli': 45.0, 'apple': 182.0, 'banana': 118.0,
+    'lemon': 58.0, 'lime': 67.0, 'orange': 131.0, 'avocado': 150.0, 'mango': 336.0, 'peach': 150.0,
+    'pear': 178.0, 'chicken breast': 174.0, 'chicken thigh': 116.0, 'sausage': 75.0,
+    'tortilla': 45.0, 'bread': 25.0, 'bun': 50.0, 'bagel': 105.0, 'mushroom': 18.0,
+    'eggplant': 458.0, 'cabbage': 908.0, 'lettuce': 360.0, 'ginger': 11.0,
+}
+
+# Grams per millilitre, keyed by a word (or phrase) in the ingredient name.
+DENSITIES_G_PER_ML = {
+    'water': 1.0, 'milk': 1.03, 'cream': 1.01, 'yogurt': 1.03, 'yoghurt': 1.03, 'buttermilk': 1.03,
+    'oil': 0.92, 'butter': 0.96, 'margarine': 0.96, 'ghee': 0.91,
+    'flour': 0.53, 'cornstarch': 0.54, 'cornflour': 0.54, 'cocoa': 0.42, 'oats': 0.41, 'oat': 0.41,
+    'sugar': 0.85, 'brown sugar': 0.93, 'powdered sugar': 0.56, 'icing sugar': 0.56,
+    'honey': 1.42, 'syrup': 1.33, 'molasses': 1.4, 'jam': 1.33,
+    'salt': 1.2, 'baking soda': 0.93, 'baking powder': 0.9, 'yeast': 0.6,
+    'rice': 0.85, 'quinoa': 0.72, 'lentils': 0.82, 'beans': 0.75, 'peas': 0.62, 'corn': 0.65,
+    'cheese': 0.45, 'parmesan': 0.42, 'nuts': 0.6, 'almonds': 0.6, 'peanuts': 0.6, 'walnuts': 0.5,
+    'peanut butter': 1.09, 'mayonnaise': 0.91, 'ketchup': 1.15, 'soy sauce': 1.15, 'vinegar': 1.01,
+    'juice': 1.04, 'broth': 1.0, 'stock': 1.0, 'wine': 0.99, 'coconut milk': 0.97,
+    'spinach': 0.13, 'lettuce': 0.2, 'onion': 0.6, 'tomato': 0.76, 'carrot': 0.54, 'berries': 0.6,
+}
+DEFAULT_DENSITY_G_PER_ML = 1.0
+
+# Amounts that carry no meaningful weight; the ingredient counts as resolved at 0 g.
+NEGLIGIBLE_MARKERS = ('to taste', 'as needed', 'as required', 'optional', 'for garnish')
+
+# Words stripped from ingredient names before the USDA lookup ("2 finely chopped red onions" -> "red onions").
+DESCRIPTOR_WORDS = {
+    'fresh', 'freshly', 'chopped', 'finely', 'roughly', 'coarsely', 'diced', 'minced', 'sliced', 'thinly',
+    'grated', 'shredded', 'crushed', 'ground', 'peeled', 'cubed', 'halved', 'quartered', 'melted',
+    'softened', 'beaten', 'large', 'medium', 'small', 'whole', 'organic', 'boneless', 'skinless',
+    'ripe', 'cold', 'warm', 'hot', 'room', 'temperature', 'packed', 'heaped', 'level', 'about', 'of',
+}
+
+UNICODE_FRACTIONS = {'½': '1/2', '⅓': '1/3', '⅔': '2/3', '¼': '1/4', '¾': '3/4', '⅕': '1/5', '⅛': '1/8',
+                     '⅜': '3/8', '⅝': '5/8', '⅞': '7/8'}
+_QUANTITY_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)(?:\s+(\d+/\d+))?$|^(\d+/\d+)$')
+_RANGE_PATTERN = re.compile(r'\s*(?:-|–|to)\s*')
+
+
+def parse_quantity(value):
+    """
+    Parses a recipe quantity such as 2, '1.5', '1/2', '1 1/2', '½' or '2-3' (averaged).
+    Returns a float, or None when the value cannot be read as a number.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value >= 0 else None
+    if not isinstance(value, str):
+        return None
+
+    text = value.strip().lower()
+    for symbol, fraction in UNICODE_FRACTIONS.items():
+        text = re.sub(rf'(\d){symbol}', rf'\1 {fraction}', text).replace(symbol, fraction)
+    if not text:
+        return None
+
+    parts = _RANGE_PATTERN.split(text)
+    if len(parts) == 2:
+        low, high = parse_quantity(parts[0]), parse_quantity(parts[1])
+        return (low + high) / 2 if low is not None and high is not None else None
+
+    match = _QUANTITY_PATTERN.match(text)
+    if not match:
+        return None
+    whole, fraction, only_fraction = match.groups()
+    try:
+        if only_fraction:
+            return float(Fraction(only_fraction))
+        return float(whole) + (float(Fraction(fraction)) if fraction else 0.0)
+    except ZeroDivisionError:
+        return None
+
+
+def normalize_unit(unit):
+    """Lowercases a unit and drops trailing dots and plurals so 'Tbsps.' and 'tbsp' compare equal."""
+    if unit is None:
+        return ''
+    text = re.sub(r'\s+', ' ', str(unit).strip().lower().rstrip('.'))
+    if text in UNIT_ALIASES:
+        return UNIT_ALIASES[text]
+    if text.endswith('s') and any(text[:-1] in table for table in (MASS_UNITS_G, VOLUME_UNITS_ML, FIXED_UNITS_G, COUNT_UNITS)):
+        return text[:-1]
+    return text
+
+
+def _keyword_value(name, table):
+    """Returns the table value of the longest key that appears as a whole word (or its plural) in name."""
+    padded = f" {name} "
+    best_key = None
+    for key in table:
+        if (f" {key} " in padded or f" {key}s " in padded or f" {key}es " in padded) and \
+                (best_key is None or len(key) > len(best_key)):
+            best_key = key
+    return table[best_key] if best_key is not None else None
+
+
+class RecipeNutritionCalculator:
+    """
+    Estimates per-serving recipe nutrition locally: each ingredient's quantity and unit are
+    converted to grams, the ingredient is matched against the USDA tables through
+    OfflineNutritionLookup, and the per-100 g values are scaled, summed and divided by servings.
+    """
+
+    def __init__(self, lookup, workers=1):
+        self.lookup = lookup
+        self.workers = workers
+
+    @staticmethod
+    def _clean_name(name):
+        text = re.sub(r'\(.*?\)', ' ', str(name).lower())
+        text = text.split(',')[0]
+        text = re.sub(r'[^a-z\s]', ' ', text)
+        words = [word for word in text.split() if word not in DESCRIPTOR_WORDS]
+        return ' '.join(words)
+
+    def to_grams(self, name, quantity, unit):
+        """
+        Converts an ingredient amount to grams. Returns None when the amount or unit
+        cannot be interpreted, so the caller can treat the ingredient as unresolved.
+        """
+        raw_quantity = str(quantity).lower() if quantity is not None else ''
+        raw_unit = str(unit).lower() if unit is not None else ''
+        if any(marker in raw_quantity or marker in raw_unit for marker in NEGLIGIBLE_MARKERS):
+            return 0.0
+
+        unit_key = normalize_unit(unit)
+        amount = parse_quantity(quantity) if quantity not in (None, '') else 1.0
+        if amount is None:
+            return None
+
+        if unit_key in MASS_UNITS_G:
+            return amount * MASS_UNITS_G[unit_key]
+        if unit_key in VOLUME_UNITS_ML:
+            density = _keyword_value(name, DENSITIES_G_PER_ML) or DEFAULT_DENSITY_G_PER_ML
+            return amount * VOLUME_UNITS_ML[unit_key] * density
+        if unit_key in FIXED_UNITS_G:
+            return amount * FIXED_UNITS_G[unit_key]
+        if unit_key in COUNT_UNITS:
+            piece_weight = _keyword_value(name, PIECE_WEIGHTS_G)
+            if piece_weight is None:
+                return None
+            return amount * piece_weight * SIZE_FACTORS.get(unit_key, 1.0)
+        return None
+
+    def _scaled_nutrients(self, nutrition, grams):
+        scaled = {}
+        for key, (usda_names, out_unit) in RECIPE_NUTRIENTS.items():
+            for usda_name in usda_names:
+                entry = nutrition.get(usda_name)
+                if not entry:
+                    continue
+                factor = UNIT_FACTORS.get((str(entry.get('unit', '')).lower(), out_unit))
+                if factor is None:
+                    continue
+                scaled[key] = float(entry['amount']) * factor * grams / 100.0
+                break
+        return scaled
+
+    @staticmethod
+    def parse_servings(servings):
+        value = parse_quantity(servings) if servings is not None else None
+        return value if value and value > 0 else 1.0
+
+    def calculate(self, recipe_data):
+        """
+        Computes per-serving nutrition for a recipe dict in the GeminiNlpParser format
+        ({"Servings": 4, "Ingredients": [{"Ingredient", "Quantity", "Unit"}]}).
+
+        Returns (totals, resolved, unresolved): totals holds the per-serving amounts keyed
+        like RECIPE_NUTRIENTS, resolved lists the matched ingredients with their grams, and
+        unresolved holds the original ingredient dicts that could not be converted or matched.
+        """
+        servings = self.parse_servings(recipe_data.get('Servings'))
+        ingredients = [ing for ing in recipe_data.get('Ingredients') or [] if isinstance(ing, dict)]
+
+        pending, resolved, unresolved = [], [], []
+        for ing in ingredients:
+            name = ing.get('Ingredient') or ''
+            clean_name = self._clean_name(name)
+            grams = self.to_grams(clean_name, ing.get('Quantity'), ing.get('Unit')) if clean_name else None
+            if grams is None:
+                unresolved.append(ing)
+            elif grams == 0:
+                resolved.append({'ingredient': name, 'grams': 0.0, 'matched_item': None})
+            else:
+                pending.append((ing, clean_name, grams))
+
+        totals = {key: 0.0 for key in RECIPE_NUTRIENTS}
+        if pending:
+            lookups = self.lookup.get_nutrition_for_foods(
+                [clean_name for _, clean_name, _ in pending], nutrients=USDA_NUTRIENT_NAMES, workers=self.workers)
+            for (ing, _, grams), result in zip(pending, lookups):
+                if not result.get('success') or not result.get('nutrition'):
+                    unresolved.append(ing)
+                    continue
+                for key, amount in self._scaled_nutrients(result['nutrition'], grams).items():
+                    totals[key] += amount
+                resolved.append({
+                    'ingredient': ing.get('Ingredient'),
+                    'grams': round(grams, 1),
+                    'matched_item': result['matched_item']['description']
+                })
+
+        per_serving = {key: amount / servings for key, amount in totals.items()}
+        return per_serving, resolved, unresolved
+
+    @staticmethod
+    def format_nutrition(per_serving):
+        return {
+            key: {'amount': round(per_serving.get(key, 0.0), 1), 'unit': out_unit}
+            for key, (_, out_unit) in RECIPE_NUTRIENTS.items()
+        }
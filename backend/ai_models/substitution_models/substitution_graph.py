@@ -0,0 +1,178 @@
+"""
+Precomputed substitution graph built from sub_normalized.csv and used by SubstitutionRecommender.
+
+Every CSV row links its ingredient and substitute in both directions. Each ingredient
+gets a ranked list of up to MAX_CANDIDATES substitutes:
+
+  - direct neighbours, scored by the number of rows linking the two divided by the
+    count of the ingredient's most frequent substitute;
+  - 2-hop candidates reached through one of its TWO_HOP_FANOUT best neighbours,
+    scored TWO_HOP_DECAY * score(a, b) * score(b, c) along the best path, so rare
+    ingredients still get suggestions from their neighbours' neighbours.
+
+Lists are sorted by score descending, then name, and stored as memory-mapped tables
+(see backend.utils.mmap_tables) under
+'<csv dir>/.substitution_graph_cache/<csv name>/<fingerprint>'. The recommender
+rebuilds the artifact automatically when the CSV or CACHE_VERSION changes.
+
+Build it ahead of time with:
+    python -m backend.ai_models.substitution_models.substitution_graph [csv_path]
+"""
+import os
+import sys
+import time
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from backend.utils import mmap_tables
+
+CACHE_VERSION = 1
+CACHE_DIR_NAME = '.substitution_graph_cache'
+
+MAX_CANDIDATES = 20
+TWO_HOP_FANOUT = 10
+TWO_HOP_DECAY = 0.5
+
+NUMERIC_TABLES = (
+    'offsets',
+    'candidates',
+    'scores',
+    'hops',
+)
+STRING_TABLES = (
+    'names',
+)
+
+
+_cache = mmap_tables.ArtifactCache(
+    'substitution graph', CACHE_VERSION, NUMERIC_TABLES, STRING_TABLES,
+    salt=f"substitution-graph-v{CACHE_VERSION}-{MAX_CANDIDATES}-{TWO_HOP_FANOUT}-{TWO_HOP_DECAY}",
+    source_paths=lambda csv_path: [csv_path],
+    default_root=lambda csv_path: mmap_tables.csv_cache_root(csv_path, CACHE_DIR_NAME),
+    manifest_extra=lambda csv_path: {'source_file': os.path.basename(csv_path)}
+)
+# source_fingerprint(csv_path), default_cache_root(csv_path),
+# load_tables(csv_path, cache_root=None, mmap=True), save_tables(csv_path, tables, cache_root=None)
+source_fingerprint = _cache.source_fingerprint
+default_cache_root = _cache.default_cache_root
+load_tables = _cache.load_tables
+save_tables = _cache.save_tables
+
+
+def _rank(edges):
+    return edges.sort_values(['ingredient', 'score', 'substitute'], ascending=[True, False, True])
+
+
+def build_tables(df_substitutes):
+    """Compiles a DataFrame with normalized_ingredient/normalized_substitute columns into graph tables."""
+    ingredients = df_substitutes['normalized_ingredient']
+    substitutes = df_substitutes['normalized_substitute']
+    edges = pd.DataFrame({
+        'ingredient': pd.concat([ingredients, substitutes], ignore_index=True),
+        'substitute': pd.concat([substitutes, ingredients], ignore_index=True)
+    }).dropna().astype(str)
+
+    direct = edges.groupby(['ingredient', 'substitute'], sort=False).size().reset_index(name='count')
+    direct['score'] = direct['count'] / direct.groupby('ingredient')['count'].transform('max')
+    direct = _rank(direct[['ingredient', 'substitute', 'score']])
+    direct['hops'] = 1
+
+    hubs = direct[direct['ingredient'] != direct['substitute']].groupby('ingredient', sort=False).head(TWO_HOP_FANOUT)
+    paths = hubs.merge(hubs, left_on='substitute', right_on='ingredient', suffixes=('', '_next'))
+    two_hop = pd.DataFrame({
+        'ingredient': paths['ingredient'],
+        'substitute': paths['substitute_next'],
+        'score': TWO_HOP_DECAY * paths['score'] * paths['score_next']
+    })
+    two_hop = two_hop[two_hop['ingredient'] != two_hop['substitute']]
+    two_hop = two_hop.groupby(['ingredient', 'substitute'], sort=False)['score'].max().reset_index()
+    is_direct = pd.MultiIndex.from_frame(two_hop[['ingredient', 'substitute']]).isin(
+        pd.MultiIndex.from_frame(direct[['ingredient', 'substitute']]))
+    two_hop = two_hop[~is_direct]
+    two_hop['hops'] = 2
+
+    ranked = _rank(pd.concat([direct, two_hop], ignore_index=True)).groupby('ingredient', sort=False).head(MAX_CANDIDATES)
+
+    names = sorted(set(ranked['ingredient']) | set(ranked['substitute']))
+    ingredient_ids = pd.Categorical(ranked['ingredient'], categories=names).codes
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ingredient_ids, minlength=len(names)), out=offsets[1:])
+    return {
+        'names': names,
+        'offsets': offsets,
+        'candidates': pd.Categorical(ranked['substitute'], categories=names).codes.astype(np.int32),
+        'scores': ranked['score'].to_numpy(dtype=np.float64),
+        'hops': ranked['hops'].to_numpy(dtype=np.uint8),
+    }
+
+
+class SubstitutionGraph:
+    """
+    Read-only view over graph tables: ranked(name) is a binary search over the sorted
+    names plus a slice of that ingredient's precomputed candidates.
+    """
+
+    def __init__(self, tables):
+        self.names = tables['names']
+        self.offsets = tables['offsets']
+        self.candidates = tables['candidates']
+        self.scores = tables['scores']
+        self.hops = tables['hops']
+
+    def __len__(self):
+        """Number of ingredients with at least one candidate."""
+        return int(np.count_nonzero(np.diff(self.offsets)))
+
+    def _index(self, name):
+        index = bisect_left(self.names, name)
+        if index < len(self.names) and self.names[index] == name:
+            return index
+        return None
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self._index(name) is not None
+
+    def ranked(self, name, top_n=5, include_hops=False):
+        """
+        Returns up to top_n (substitute, score) pairs for name, best first;
+        (substitute, score, hops) triples if include_hops.
+        """
+        index = self._index(name) if isinstance(name, str) else None
+        if index is None or top_n <= 0:
+            return []
+        start = int(self.offsets[index])
+        end = min(int(self.offsets[index + 1]), start + top_n)
+        names = self.names
+        columns = [[names[candidate] for candidate in self.candidates[start:end].tolist()],
+                   self.scores[start:end].tolist()]
+        if include_hops:
+            columns.append(self.hops[start:end].tolist())
+        return list(zip(*columns))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    csv_path = argv[0] if argv else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sub_normalized.csv')
+    if not os.path.exists(csv_path):
+        print(f"Substitutions CSV not found at {csv_path}.")
+        return 1
+
+    start = time.perf_counter()
+    tables = build_tables(pd.read_csv(csv_path))
+    artifact_dir = save_tables(csv_path, tables)
+    if artifact_dir is None:
+        print("Substitution graph was not written.")
+        return 1
+
+    size = sum(os.path.getsize(os.path.join(artifact_dir, f)) for f in os.listdir(artifact_dir))
+    two_hop = int(np.count_nonzero(tables['hops'] == 2))
+    print(f"Substitution graph for {len(SubstitutionGraph(tables))} ingredients "
+          f"({len(tables['candidates'])} candidates, {two_hop} via 2 hops) written to {artifact_dir} "
+          f"in {time.perf_counter() - start:.1f} s, {size / 1024 / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
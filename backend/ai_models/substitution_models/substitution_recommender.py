@@ -1,7 +1,8 @@
 import pandas as pd
-import spacy
 import os
+from backend.ai_models.substitution_models import substitution_graph
 from backend.utils.logging_utils import log_success, log_error, log_warning
+from backend.utils.spacy_registry import spacy_registry
 
 class SubstitutionRecommender:
     RETAIN_ADJECTIVES = {
@@ -9,33 +10,46 @@ class SubstitutionRecommender:
         'balsamic', 'sesame', 'coconut', 'dark', 'light', 'hot',
         'sweet', 'bitter', 'white', 'black', 'red', 'green', 'olive'
     }
+    EXPECTED_COLUMNS = ['normalized_ingredient', 'normalized_substitute']
+    # Normalization reads token.pos_ and token.lemma_ only
+    SPACY_COMPONENTS = ('tagger', 'lemmatizer')
 
-    def __init__(self, data_file_path=None, spacy_model_name="en_core_web_sm"):
+    def __init__(self, data_file_path=None, spacy_model_name="en_core_web_sm", normalize_cache=None,
+                 use_graph_cache=True, graph_cache_dir=None):
         """
         Initializes the SubstitutionRecommender.
         :param data_file_path: Path to the 'sub_normalized.csv' file.
                                If None, defaults to 'sub_normalized.csv' in the same directory as this script.
-        :param spacy_model_name: Name of the spacy model to load.
+        :param spacy_model_name: Name of the spacy model, shared through spacy_registry.
+        :param normalize_cache: Optional LRUCache of normalize_ingredient results keyed by the lowercased text.
+        :param use_graph_cache: Load the precomputed substitution graph artifact (building and saving it
+                                if it is missing or stale) instead of compiling the CSV in memory.
+        :param graph_cache_dir: Optional artifact location, see substitution_graph.default_cache_root.
         """
         if data_file_path is None:
             data_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sub_normalized.csv')
 
+        self.data_file_path = data_file_path
+        self.normalize_cache = normalize_cache
         self.nlp = None
-        self.df_substitutes = None
+        self._df_substitutes = None
+        self.substitute_graph = None
         self.model_loaded = False
 
         try:
-            self.nlp = spacy.load(spacy_model_name, disable=["parser", "ner"])
-            log_success(f"SpaCy model '{spacy_model_name}' loaded.", "SubstitutionRecommender")
+            self.nlp = spacy_registry.get(spacy_model_name, self.SPACY_COMPONENTS)
+            log_success(f"SpaCy model '{spacy_model_name}' ready with {self.nlp.enabled}.", "SubstitutionRecommender")
 
             if not os.path.exists(data_file_path):
                 raise FileNotFoundError(f"'sub_normalized.csv' not found at {data_file_path}. User needs to place it here.")
-            self.df_substitutes = pd.read_csv(data_file_path)
-            log_success(f"Substitutes data loaded from '{data_file_path}'.", "SubstitutionRecommender")
-            
-            expected_cols = ['normalized_ingredient', 'normalized_substitute']
-            if not all(col in self.df_substitutes.columns for col in expected_cols):
-                raise ValueError(f"CSV file must contain columns: {', '.join(expected_cols)}")
+
+            tables = substitution_graph.load_tables(data_file_path, graph_cache_dir) if use_graph_cache else None
+            if tables is None:
+                tables = substitution_graph.build_tables(self.df_substitutes)
+                if use_graph_cache:
+                    substitution_graph.save_tables(data_file_path, tables, graph_cache_dir)
+            self.substitute_graph = substitution_graph.SubstitutionGraph(tables)
+            log_success(f"Substitution graph loaded for {len(self.substitute_graph)} ingredients.", "SubstitutionRecommender")
 
             self.model_loaded = True
             log_success("Initialization successful.", "SubstitutionRecommender")
@@ -47,14 +61,21 @@ class SubstitutionRecommender:
         except Exception as e:
             log_error(f"initializing - {e}. Ensure '{spacy_model_name}' is downloaded (python -m spacy download {spacy_model_name}).", "SubstitutionRecommender")
 
+    @property
+    def df_substitutes(self):
+        """The raw substitutions CSV. Only read when the graph has to be built, or on first access."""
+        if self._df_substitutes is None and os.path.exists(self.data_file_path):
+            df_substitutes = pd.read_csv(self.data_file_path)
+            if not all(col in df_substitutes.columns for col in self.EXPECTED_COLUMNS):
+                raise ValueError(f"CSV file must contain columns: {', '.join(self.EXPECTED_COLUMNS)}")
+            log_success(f"Substitutes data loaded from '{self.data_file_path}'.", "SubstitutionRecommender")
+            self._df_substitutes = df_substitutes
+        return self._df_substitutes
+
     def is_ready(self):
         return self.model_loaded
 
-    def normalize_ingredient(self, ingredient_text):
-        if not self.is_ready():
-            raise RuntimeError("SubstitutionRecommender is not ready. Cannot normalize.")
-        
-        doc = self.nlp(ingredient_text.lower())
+    def _normalize_doc(self, doc, text):
         retained_lemmas = []
 
         for token in doc:
@@ -64,7 +85,50 @@ class SubstitutionRecommender:
                 retained_lemmas.append(token.lemma_)
         
         normalized = " ".join(retained_lemmas)
-        return normalized if normalized else ingredient_text.lower().strip()
+        return normalized if normalized else text.strip()
+
+    def normalize_ingredient(self, ingredient_text):
+        if not self.is_ready():
+            raise RuntimeError("SubstitutionRecommender is not ready. Cannot normalize.")
+
+        text = ingredient_text.lower()
+        if self.normalize_cache is not None:
+            normalized = self.normalize_cache.get(text)
+            if normalized is not None:
+                return normalized
+
+        normalized = self._normalize_doc(self.nlp(text), text)
+        if self.normalize_cache is not None:
+            self.normalize_cache.put(text, normalized)
+        return normalized
+
+    def normalize_many(self, ingredient_texts, batch_size=64, n_process=1):
+        """
+        Normalizes several ingredients, returning results in input order.
+        Texts missing from the cache are run through nlp.pipe in batches, each distinct text once.
+        :param n_process: Worker processes for nlp.pipe; only worth it for large uncached batches.
+        """
+        if not self.is_ready():
+            raise RuntimeError("SubstitutionRecommender is not ready. Cannot normalize.")
+
+        texts = [text.lower() for text in ingredient_texts]
+        normalized = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            cached = self.normalize_cache.get(text) if self.normalize_cache is not None else None
+            if cached is None:
+                missing.append(text)
+            else:
+                normalized[text] = cached
+
+        if missing:
+            docs = self.nlp.pipe(missing, batch_size=batch_size, n_process=n_process)
+            for text, doc in zip(missing, docs):
+                normalized[text] = self._normalize_doc(doc, text)
+                if self.normalize_cache is not None:
+                    self.normalize_cache.put(text, normalized[text])
+
+        return [normalized[text] for text in texts]
 
     def get_substitutes(self, input_ingredient, top_n=5):
         if not self.is_ready():
@@ -76,31 +140,31 @@ class SubstitutionRecommender:
             if not normalized_input:
                 return []
 
-            from_ingredient = self.df_substitutes[self.df_substitutes['normalized_ingredient'] == normalized_input]
-            subs_from_ingredient_col = from_ingredient['normalized_substitute'].tolist()
+            return [{'name': name, 'score': score}
+                    for name, score in self.substitute_graph.ranked(normalized_input, top_n)]
 
-            from_substitute_col = self.df_substitutes[self.df_substitutes['normalized_substitute'] == normalized_input]
-            subs_from_substitute_col = from_substitute_col['normalized_ingredient'].tolist()
-
-            all_subs_list = subs_from_ingredient_col + subs_from_substitute_col
-            
-            if not all_subs_list:
-                return []
+        except Exception as e:
+            log_error(f"Error during get_substitutes for '{input_ingredient}' - {e}", "SubstitutionRecommender")
+            return []
 
-            sub_counts = pd.Series(all_subs_list).value_counts().reset_index()
-            sub_counts.columns = ['name', 'score']
+    def get_substitutes_many(self, input_ingredients, top_n=5, batch_size=64, n_process=1):
+        """
+        Returns {ingredient: substitutes} for several ingredients, normalizing them in one batched call.
+        Each value has the same format as get_substitutes.
+        """
+        if not self.is_ready():
+            log_warning("Not ready. Cannot get substitutes.", "SubstitutionRecommender")
+            return {ingredient: [] for ingredient in input_ingredients}
 
-            if not sub_counts.empty:
-                 sub_counts['score'] = sub_counts['score'] / sub_counts['score'].max()
-            else:
-                return []
+        try:
+            ingredients = list(dict.fromkeys(input_ingredients))
+            normalized = self.normalize_many(ingredients, batch_size=batch_size, n_process=n_process)
+            return {
+                ingredient: [{'name': name, 'score': score}
+                             for name, score in self.substitute_graph.ranked(normalized_input, top_n)]
+                for ingredient, normalized_input in zip(ingredients, normalized)
+            }
 
-            sub_counts_sorted = sub_counts.sort_values(by=['score', 'name'], ascending=[False, True])
-            
-            top_results = sub_counts_sorted.head(top_n)
-            
-            return top_results.to_dict(orient='records')
-            
         except Exception as e:
-            log_error(f"Error during get_substitutes for '{input_ingredient}' - {e}", "SubstitutionRecommender")
-            return []
+            log_error(f"Error during get_substitutes_many for {len(input_ingredients)} ingredients - {e}", "SubstitutionRecommender")
+            return {ingredient: [] for ingredient in input_ingredients}
@@ -0,0 +1,122 @@
+"""
+Converts the food and ingredient classifiers to quantized TFLite files for CPU inference.
+
+    python -m backend.ai_models.tflite_conversion [food] [ingredient] [--quantization dynamic|int8]
+                                                  [--calibration-dir DIR] [--calibration-samples N]
+
+Each model is written next to its .keras file (food_model.tflite, ingredient_model.tflite)
+and used when CLASSIFIER_BACKEND=tflite.
+
+  dynamic  - int8 weights, float activations; needs no calibration data.
+  int8     - int8 weights and activations; activation ranges are calibrated on images from
+             --calibration-dir, cycled with random crops and flips up to --calibration-samples.
+             Inputs and outputs stay float32, so the classifiers feed both files the same way.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageOps
+
+QUANTIZATIONS = ('dynamic', 'int8')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def _food_classifier():
+    from backend.ai_models.food_classification.food_classifier import FoodClassifier
+    return FoodClassifier()
+
+
+def _ingredient_classifier():
+    from backend.ai_models.ingredient_classification.ingredient_classifier import FoodIngredientClassifier
+    return FoodIngredientClassifier()
+
+
+CLASSIFIERS = {
+    'food': _food_classifier,
+    'ingredient': _ingredient_classifier,
+}
+
+
+def calibration_images(paths, samples, seed=0):
+    """Yields samples RGB images, cycling over paths with a random 80-100% crop and horizontal flip each time."""
+    rng = np.random.default_rng(seed)
+    sources = [Image.open(path).convert('RGB') for path in paths]
+    for i in range(samples):
+        img = sources[i % len(sources)]
+        width, height = img.size
+        scale = rng.uniform(0.8, 1.0)
+        crop_w, crop_h = int(width * scale), int(height * scale)
+        left, top = int(rng.integers(0, width - crop_w + 1)), int(rng.integers(0, height - crop_h + 1))
+        img = img.crop((left, top, left + crop_w, top + crop_h))
+        yield ImageOps.mirror(img) if rng.random() < 0.5 else img
+
+
+def convert_classifier(classifier, quantization='dynamic', calibration_paths=(), calibration_samples=64):
+    """
+    Converts a classifier's loaded Keras model and returns the .tflite file contents.
+    int8 calibration images go through the classifier's own load_image/preprocess_image.
+    """
+    import tensorflow as tf
+
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"quantization must be one of {QUANTIZATIONS}")
+    converter = tf.lite.TFLiteConverter.from_keras_model(classifier.model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'int8':
+        if not calibration_paths:
+            raise ValueError("int8 quantization needs calibration images")
+
+        def representative_dataset():
+            for img in calibration_images(calibration_paths, calibration_samples):
+                # Encoded and decoded as an upload would be, then preprocessed for the model
+                buffer = io.BytesIO()
+                img.save(buffer, format='JPEG', quality=90)
+                yield [classifier.preprocess_image(classifier.load_image(buffer.getvalue()))]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    return converter.convert()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('models', nargs='*', help=f"Models to convert: {', '.join(CLASSIFIERS)} (default: all)")
+    parser.add_argument('--quantization', choices=QUANTIZATIONS, default='dynamic')
+    parser.add_argument('--calibration-dir', help='Directory of representative images (required for int8)')
+    parser.add_argument('--calibration-samples', type=int, default=64)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    unknown = [name for name in args.models if name not in CLASSIFIERS]
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(unknown)}")
+
+    calibration_paths = []
+    if args.calibration_dir:
+        calibration_paths = sorted(os.path.join(args.calibration_dir, name) for name in os.listdir(args.calibration_dir)
+                                   if name.lower().endswith(IMAGE_EXTENSIONS))
+    if args.quantization == 'int8' and not calibration_paths:
+        print("int8 quantization needs --calibration-dir with at least one image.")
+        return 1
+
+    status = 0
+    for name in args.models or list(CLASSIFIERS):
+        classifier = CLASSIFIERS[name]()
+        if not classifier.is_model_loaded():
+            print(f"{name}: Keras model not loaded, skipped.")
+            status = 1
+            continue
+
+        start = time.perf_counter()
+        tflite_model = convert_classifier(classifier, args.quantization, calibration_paths, args.calibration_samples)
+        with open(classifier.tflite_path, 'wb') as f:
+            f.write(tflite_model)
+        print(f"{name}: {args.quantization} TFLite model written to {classifier.tflite_path} "
+              f"({len(tflite_model) / 1024 / 1024:.1f} MB) in {time.perf_counter() - start:.1f} s")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,7 +14,10 @@ from backend.dao import UserDAO, IngredientDAO, RecipeDAO
 from backend.services import UserService, RecipeService
 from backend.utils.logging_utils import suppress_external_warnings, log_header, log_info
 from backend.utils.log_monitor import log_monitor
+from backend.utils.model_loader import model_loader
 from backend.utils.db_health_check import check_database_health
+from backend.utils.image_decode import InMemoryUploadRequest
+from backend.utils.inference_pool import in_inference_worker
 from backend.routes.user_routes import user_bp
 from backend.routes.recipe_routes import recipe_bp
 from backend.routes.meal_planner_routes import meal_planner_bp
@@ -27,7 +30,7 @@ from backend.routes.nlp_routes import nlp_bp
 from backend.routes.allergy_routes import allergy_bp
 from backend.routes.personalized_recipe_routes import personalized_recipe_bp
 from backend.routes.nutrition_routes import nutrition_bp
-from backend.routes.food_lookup_routes import food_lookup_bp
+from backend.routes.food_lookup_routes import food_lookup_bp, initialize_autocomplete_service
 from backend.routes.chatbot_routes import chatbot_bp, initialize_chatbot_service
 from backend.routes.pantry_routes import pantry_bp
 from backend.routes.contact_message_routes import contact_message_bp
@@ -55,6 +58,9 @@ log_info("Log monitoring initialized.", "Startup")
 
 app.config.from_object(Config)
 log_info("Configuration loaded from object.", "Startup")
+
+InMemoryUploadRequest.upload_spool_max_bytes = Config.UPLOAD_SPOOL_MAX_BYTES
+app.request_class = InMemoryUploadRequest
 app.extensions = {}
 
 # Check database connectivity before proceeding
@@ -136,10 +142,18 @@ app.register_blueprint(forum_bp)
 app.register_blueprint(notification_bp)
 app.register_blueprint(health_bp)
 
-with app.app_context():
-    log_header("Service Initialization")
-    initialize_chatbot_service()
-    log_header("Service Initialization Complete")
+# Inference workers re-import this module when spawned (python app.py) and only need their models
+if not in_inference_worker():
+    with app.app_context():
+        log_header("Service Initialization")
+        initialize_chatbot_service()
+        initialize_autocomplete_service()
+        if Config.MODEL_BACKGROUND_LOADING:
+            model_loader.start()
+            log_info("AI models are loading in the background; progress is reported at /api/health/models.", "Startup")
+        else:
+            model_loader.load_all()
+        log_header("Service Initialization Complete")
 
 def graceful_shutdown():
     """Perform cleanup tasks before shutting down the application."""
@@ -189,6 +203,15 @@ def init_db_command_wrapper():
     print("Database initialization complete.")
 
 
+@app.cli.command("rebuild-allergen-masks")
+def rebuild_allergen_masks_command():
+    '''Recomputes the allergen bitmasks of all ingredients and recipes.'''
+    with app.app_context():
+        ingredients, recipes = IngredientDAO().rebuild_allergen_masks()
+        db.session.commit()
+    print(f"Allergen masks updated for {ingredients} ingredients and {recipes} recipes.")
+
+
 @app.shell_context_processor
 def make_shell_context():
     return {
@@ -35,6 +35,62 @@ class Config:
         log_warning("GEMINI_API_KEY not found in environment variables.", "Config")
         
     PROJECT_NUMBER = os.environ.get('PROJECT_NUMBER')
+
+    # In-memory cache of USDA food matches used by NutritionService (TTL of 0 disables expiry)
+    NUTRITION_CACHE_SIZE = int(os.environ.get('NUTRITION_CACHE_SIZE', 2048))
+    NUTRITION_CACHE_TTL_SECONDS = int(os.environ.get('NUTRITION_CACHE_TTL_SECONDS', 0))
+    # Threads used by batch nutrition lookups for fuzzy scoring (-1 = all cores)
+    NUTRITION_MATCH_WORKERS = int(os.environ.get('NUTRITION_MATCH_WORKERS', 1))
+    NUTRITION_BATCH_MAX_ITEMS = int(os.environ.get('NUTRITION_BATCH_MAX_ITEMS', 100))
+
+    # Cache of spaCy ingredient normalizations used by SubstitutionService
+    SUBSTITUTION_NORMALIZE_CACHE_SIZE = int(os.environ.get('SUBSTITUTION_NORMALIZE_CACHE_SIZE', 4096))
+    # nlp.pipe settings for batch substitute lookups (processes > 1 forks spaCy workers per request)
+    SUBSTITUTION_NLP_BATCH_SIZE = int(os.environ.get('SUBSTITUTION_NLP_BATCH_SIZE', 64))
+    SUBSTITUTION_NLP_PROCESSES = int(os.environ.get('SUBSTITUTION_NLP_PROCESSES', 1))
+    SUBSTITUTION_BATCH_MAX_ITEMS = int(os.environ.get('SUBSTITUTION_BATCH_MAX_ITEMS', 100))
+
+    # Uploads up to this size stay in memory, so classifier images are decoded without temp files
+    UPLOAD_SPOOL_MAX_BYTES = int(os.environ.get('UPLOAD_SPOOL_MAX_BYTES', 16 * 1024 * 1024))
+
+    # Classifier runtime: 'keras' (TensorFlow) or 'tflite' (quantized files written by
+    # python -m backend.ai_models.tflite_conversion; falls back to Keras when missing)
+    CLASSIFIER_BACKEND = os.environ.get('CLASSIFIER_BACKEND', 'keras').lower()
+    # TFLite interpreter threads per model (0 = one per core)
+    TFLITE_NUM_THREADS = int(os.environ.get('TFLITE_NUM_THREADS', 0))
+    # Classifier inference runs as a traced tf.function, warmed up while the model loads
+    CLASSIFIER_COMPILE_INFERENCE = os.environ.get('CLASSIFIER_COMPILE_INFERENCE', 'True').lower() == 'true'
+    # TensorFlow thread pools per worker process (0 = TensorFlow default, one thread per core)
+    TF_INTRA_OP_THREADS = int(os.environ.get('TF_INTRA_OP_THREADS', 0))
+    TF_INTER_OP_THREADS = int(os.environ.get('TF_INTER_OP_THREADS', 0))
+
+    # Micro-batching of classifier requests: up to N images per forward pass, waiting at most T ms
+    # for a batch to fill (a batch size of 1 disables batching)
+    CLASSIFIER_BATCH_MAX_SIZE = int(os.environ.get('CLASSIFIER_BATCH_MAX_SIZE', 16))
+    CLASSIFIER_BATCH_MAX_WAIT_MS = float(os.environ.get('CLASSIFIER_BATCH_MAX_WAIT_MS', 5.0))
+
+    # Classifiers run in N spawned inference worker processes per API process (0 = in the API
+    # process itself); TensorFlow is then only imported by the workers. A worker that exits, takes
+    # longer than the startup timeout to load or stops replying for the hang timeout is restarted.
+    INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', 0))
+    INFERENCE_REQUEST_TIMEOUT_SECONDS = float(os.environ.get('INFERENCE_REQUEST_TIMEOUT_SECONDS', 30.0))
+    INFERENCE_WORKER_HANG_SECONDS = float(os.environ.get('INFERENCE_WORKER_HANG_SECONDS', 60.0))
+    INFERENCE_WORKER_STARTUP_TIMEOUT_SECONDS = float(os.environ.get('INFERENCE_WORKER_STARTUP_TIMEOUT_SECONDS', 300.0))
+
+    # Classification results cached by perceptual image hash and mode, shared with the chatbot
+    # (TTL of 0 disables expiry; entries evicted from memory spill to the directory when one is set)
+    CLASSIFICATION_CACHE_SIZE = int(os.environ.get('CLASSIFICATION_CACHE_SIZE', 512))
+    CLASSIFICATION_CACHE_TTL_SECONDS = int(os.environ.get('CLASSIFICATION_CACHE_TTL_SECONDS', 0))
+    CLASSIFICATION_CACHE_SPILL_DIR = os.environ.get('CLASSIFICATION_CACHE_SPILL_DIR', '')
+    CLASSIFICATION_CACHE_SPILL_MAX_ENTRIES = int(os.environ.get('CLASSIFICATION_CACHE_SPILL_MAX_ENTRIES', 10000))
+
+    # spaCy components never loaded into the shared pipelines (comma-separated; no consumer uses NER)
+    SPACY_EXCLUDE_COMPONENTS = os.environ.get('SPACY_EXCLUDE_COMPONENTS', 'ner')
+
+    # Load AI models in background threads at startup instead of blocking before serving
+    MODEL_BACKGROUND_LOADING = os.environ.get('MODEL_BACKGROUND_LOADING', 'True').lower() == 'true'
+    # How long a request waits for a model that is still loading before it gets a 503
+    MODEL_WAIT_TIMEOUT_SECONDS = float(os.environ.get('MODEL_WAIT_TIMEOUT_SECONDS', 2.0))
     
     @classmethod
     def get_db_connection_params(cls):
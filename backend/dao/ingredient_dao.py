@@ -1,6 +1,99 @@
-from backend.models import Ingredient, AllergyIntolerance
+from sqlalchemy import insert, update, case, event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from backend.models import Ingredient, AllergyIntolerance, Recipe, RecipeIngredient
+from backend.models.allergy_intolerance import allergen_mask
+from backend.models.ingredient import ingredient_allergies_association_table
 from backend.db import db
 
+
+def _match_names(rows, names, attribute):
+    """
+    Maps each of names to the row from an IN query with that name, or None.
+    MySQL compares names case-insensitively, so 'tomato' can come back as 'Tomato'.
+    """
+    exact = {getattr(row, attribute): row for row in rows}
+    folded = {name.lower(): row for name, row in exact.items()}
+    return {name: exact.get(name) or folded.get(name.lower()) for name in names}
+
+
+def _resolve_names(model, attribute, names):
+    """
+    Maps each of names to its row of model, inserting the missing ones in one statement.
+    Returns (rows by name, names that were inserted).
+    """
+    column = getattr(model, attribute)
+    rows = _match_names(model.query.filter(column.in_(names)).all(), names, attribute)
+    missing, seen = [], set()
+    for name in names:
+        if rows[name] is None and name.lower() not in seen:
+            seen.add(name.lower())
+            missing.append(name)
+    if missing:
+        db.session.execute(insert(model), [{attribute: name} for name in missing])
+        created = _match_names(model.query.filter(column.in_(missing)).all(), names, attribute)
+        rows = {name: row or created[name] for name, row in rows.items()}
+    return rows, missing
+
+
+def _add_allergen_bits(bits_by_ingredient):
+    """
+    ORs new allergen bits into the masks of the given Ingredient instances and of every recipe
+    that uses them, with one UPDATE per table.
+    """
+    added = {}
+    for ingredient_model, bits in bits_by_ingredient.items():
+        current = ingredient_model.AllergenMask or 0
+        if bits & ~current:
+            added[ingredient_model.IngredientID] = bits & ~current
+            set_committed_value(ingredient_model, 'AllergenMask', current | bits)
+    if not added:
+        return
+
+    ingredients = Ingredient.__table__
+    db.session.execute(update(ingredients).where(ingredients.c.IngredientID.in_(added)).values(
+        AllergenMask=ingredients.c.AllergenMask.op('|')(case(added, value=ingredients.c.IngredientID, else_=0))
+    ))
+
+    added_by_recipe = {}
+    for recipe_id, ingredient_id in db.session.query(RecipeIngredient.RecipeID, RecipeIngredient.IngredientID) \
+            .filter(RecipeIngredient.IngredientID.in_(added)):
+        added_by_recipe[recipe_id] = added_by_recipe.get(recipe_id, 0) | added[ingredient_id]
+    if added_by_recipe:
+        recipes = Recipe.__table__
+        db.session.execute(update(recipes).where(recipes.c.RecipeID.in_(added_by_recipe)).values(
+            AllergenMask=recipes.c.AllergenMask.op('|')(case(added_by_recipe, value=recipes.c.RecipeID, else_=0))
+        ))
+        for recipe in db.session.identity_map.values():
+            if isinstance(recipe, Recipe) and recipe.RecipeID in added_by_recipe:
+                set_committed_value(recipe, 'AllergenMask', (recipe.AllergenMask or 0) | added_by_recipe[recipe.RecipeID])
+
+
+_AUTOCOMPLETE_NAMES = 'autocomplete_ingredient_names'
+
+
+def _add_to_autocomplete_on_commit(names):
+    """Queues new ingredient names for the autocomplete index until the session's transaction commits."""
+    db.session.info.setdefault(_AUTOCOMPLETE_NAMES, []).extend(names)
+
+
+@event.listens_for(Session, 'after_commit')
+def _add_committed_names(session):
+    names = session.info.pop(_AUTOCOMPLETE_NAMES, None)
+    if names:
+        # Imported here: services import the DAO package.
+        from backend.services.main.autocomplete_service import AutocompleteService
+        for name in names:
+            AutocompleteService.get_instance().add_ingredient(name)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_rolled_back_names(session, previous_transaction):
+    # Ingredients created in a rolled-back transaction do not exist, so they are never suggested
+    if previous_transaction.parent is None:
+        session.info.pop(_AUTOCOMPLETE_NAMES, None)
+
+
 class IngredientDAO:
     def get_ingredient_by_name(self, name):
         return Ingredient.query.filter_by(Name=name).first()
@@ -11,6 +104,7 @@ class IngredientDAO:
     def create_ingredient(self, name):
         new_ingredient = Ingredient(Name=name)
         db.session.add(new_ingredient)
+        _add_to_autocomplete_on_commit([name])
         return new_ingredient
 
     def get_or_create_ingredient(self, name):
@@ -18,7 +112,20 @@ class IngredientDAO:
         if not ingredient:
             ingredient = self.create_ingredient(name)
         return ingredient
-        
+
+    def get_or_create_ingredients(self, names):
+        """
+        Bulk version of get_or_create_ingredient: looks all names up with one IN query
+        and inserts the missing ones in one statement.
+        Returns a dict mapping each name to its Ingredient.
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+        ingredients, created = _resolve_names(Ingredient, 'Name', names)
+        _add_to_autocomplete_on_commit(created)
+        return ingredients
+
     def get_allergies_for_ingredient(self, ingredient_id):
         """
         Retrieves all AllergyIntolerance objects associated with a given ingredient_id.
@@ -57,4 +164,78 @@ class IngredientDAO:
 
         if allergy_model and allergy_model not in ingredient_model.allergies.all():
             ingredient_model.allergies.append(allergy_model)
+            db.session.flush()
+            _add_allergen_bits({ingredient_model: allergen_mask([allergy_model.id])[0]})
         return ingredient_model
+
+    def add_allergies_to_ingredients(self, allergies_by_ingredient):
+        """
+        Bulk version of add_allergy_to_ingredient.
+        `allergies_by_ingredient` maps Ingredient instances to iterables of allergy names.
+        Resolves every AllergyIntolerance with one IN query (creating missing ones), then
+        inserts the associations that don't exist yet in one statement and updates the
+        AllergenMask of the ingredients and their recipes.
+        Returns the number of associations added.
+        """
+        pairs = set()
+        for ingredient_model, allergy_names in allergies_by_ingredient.items():
+            if not isinstance(ingredient_model, Ingredient):
+                raise ValueError("ingredient_model must be an instance of Ingredient")
+            pairs.update((ingredient_model, allergy_name) for allergy_name in allergy_names)
+        if not pairs:
+            return 0
+
+        allergy_names = sorted({allergy_name for _, allergy_name in pairs})
+        allergies, _ = _resolve_names(AllergyIntolerance, 'name', allergy_names)
+        # Ingredients created through the ORM need their IDs before the association rows can reference them.
+        db.session.flush()
+
+        table = ingredient_allergies_association_table
+        ingredient_ids = {ingredient_model.IngredientID for ingredient_model, _ in pairs}
+        allergy_ids = {allergy.id for allergy in allergies.values()}
+        existing = set(db.session.query(table.c.ingredient_id, table.c.allergy_intolerance_id).filter(
+            table.c.ingredient_id.in_(ingredient_ids),
+            table.c.allergy_intolerance_id.in_(allergy_ids)
+        ).all())
+
+        new_rows = sorted({(ingredient_model.IngredientID, allergies[allergy_name].id)
+                           for ingredient_model, allergy_name in pairs} - existing)
+        if new_rows:
+            db.session.execute(table.insert(), [
+                {'ingredient_id': ingredient_id, 'allergy_intolerance_id': allergy_id}
+                for ingredient_id, allergy_id in new_rows
+            ])
+
+        bits_by_ingredient = {}
+        for ingredient_model, allergy_name in pairs:
+            bits = allergen_mask([allergies[allergy_name].id])[0]
+            bits_by_ingredient[ingredient_model] = bits_by_ingredient.get(ingredient_model, 0) | bits
+        _add_allergen_bits(bits_by_ingredient)
+        return len(new_rows)
+
+    def rebuild_allergen_masks(self):
+        """
+        Recomputes Ingredient.AllergenMask from the allergy associations and Recipe.AllergenMask
+        from the ingredients, e.g. after adding the columns to an existing database.
+        Returns (ingredients updated, recipes updated).
+        """
+        table = ingredient_allergies_association_table
+        ingredient_masks = {}
+        for ingredient_id, allergy_id in db.session.query(table.c.ingredient_id, table.c.allergy_intolerance_id):
+            ingredient_masks[ingredient_id] = ingredient_masks.get(ingredient_id, 0) | allergen_mask([allergy_id])[0]
+
+        recipe_masks = {}
+        for recipe_id, ingredient_id in db.session.query(RecipeIngredient.RecipeID, RecipeIngredient.IngredientID):
+            recipe_masks[recipe_id] = recipe_masks.get(recipe_id, 0) | ingredient_masks.get(ingredient_id, 0)
+
+        counts = []
+        for model, id_attribute, masks in ((Ingredient, 'IngredientID', ingredient_masks),
+                                           (Recipe, 'RecipeID', recipe_masks)):
+            changed = 0
+            for row in model.query.all():
+                mask = masks.get(getattr(row, id_attribute), 0)
+                if row.AllergenMask != mask:
+                    row.AllergenMask = mask
+                    changed += 1
+            counts.append(changed)
+        return tuple(counts)
@@ -1,5 +1,6 @@
 from backend.models import Recipe, RecipeIngredient, Ingredient, User, RecipeRating, UserAllergy # Import necessary models using relative import
 from backend.models.ingredient import ingredient_allergies_association_table # Import for allergy filtering
+from backend.models.allergy_intolerance import allergen_mask
 from backend.db import db # Import db instance using relative import
 from sqlalchemy.orm import joinedload
 from sqlalchemy import func # Import func for aggregate functions
@@ -131,7 +132,8 @@ class RecipeDAO:
             Servings=servings,
             ImageURL=image_url,
             is_public=is_public,
-            NutritionInfoJSON=nutrition_info
+            NutritionInfoJSON=nutrition_info,
+            AllergenMask=0
         )
         db.session.add(new_recipe)
 
@@ -143,6 +145,7 @@ class RecipeDAO:
             recipe_ingredient.recipe = new_recipe 
             recipe_ingredient.ingredient = item_data['ingredient_model']
             db.session.add(recipe_ingredient)
+            new_recipe.AllergenMask |= item_data['ingredient_model'].AllergenMask or 0
 
         return new_recipe
 
@@ -153,6 +156,27 @@ class RecipeDAO:
             return recipe
         return None
         
+    def allergen_exclusion_filter(self, allergy_ids):
+        """
+        Returns a filter matching recipes that contain none of allergy_ids, or None if there are none.
+        Allergies with a mask bit are checked against Recipe.AllergenMask; any others fall back
+        to a subquery over the ingredient allergy associations.
+        """
+        mask, unmasked_ids = allergen_mask(allergy_ids)
+        conditions = []
+        if mask:
+            conditions.append(Recipe.AllergenMask.op('&')(mask) == 0)
+        if unmasked_ids:
+            table = ingredient_allergies_association_table
+            conditions.append(Recipe.RecipeID.notin_(
+                db.session.query(RecipeIngredient.RecipeID)
+                .join(table, table.c.ingredient_id == RecipeIngredient.IngredientID)
+                .filter(table.c.allergy_intolerance_id.in_(unmasked_ids))
+            ))
+        if not conditions:
+            return None
+        return db.and_(*conditions)
+
     def get_personalized_recipes_for_user(self, user_id, page=1, limit=12):
         """
         Retrieves paginated recipes personalized for a user by filtering out
@@ -169,20 +193,9 @@ class RecipeDAO:
         recipes_query = Recipe.query.filter(Recipe.is_public == True)
         recipes_query = recipes_query.options(db.joinedload(Recipe.author))
 
-        if user_allergy_ids:
-            allergic_ingredient_ids_query = db.session.query(ingredient_allergies_association_table.c.ingredient_id)\
-                .filter(ingredient_allergies_association_table.c.allergy_intolerance_id.in_(user_allergy_ids))\
-                .distinct()
-            allergic_ingredient_ids = [row[0] for row in allergic_ingredient_ids_query.all()]
-
-            if allergic_ingredient_ids:
-                recipes_to_exclude_ids_query = db.session.query(RecipeIngredient.RecipeID)\
-                    .filter(RecipeIngredient.IngredientID.in_(allergic_ingredient_ids))\
-                    .distinct()
-                recipes_to_exclude_ids = [row[0] for row in recipes_to_exclude_ids_query.all()]
-
-                if recipes_to_exclude_ids:
-                    recipes_query = recipes_query.filter(Recipe.RecipeID.notin_(recipes_to_exclude_ids))
+        allergen_filter = self.allergen_exclusion_filter(user_allergy_ids)
+        if allergen_filter is not None:
+            recipes_query = recipes_query.filter(allergen_filter)
         
         paginated_recipes = recipes_query.order_by(Recipe.CreatedAt.desc()).paginate(
             page=page, per_page=limit, error_out=False
@@ -1,5 +1,22 @@
 from ..db import db
 
+# Ingredients.AllergenMask and Recipes.AllergenMask are signed BIGINTs: bit (id - 1) stands
+# for the allergy with that id. Allergies with larger ids have no bit and are matched
+# through IngredientAllergiesIntolerances instead.
+ALLERGEN_MASK_BITS = 63
+
+
+def allergen_mask(allergy_ids):
+    """Returns (mask, unmasked_ids) for allergy_ids; unmasked_ids are the ids without a mask bit."""
+    mask = 0
+    unmasked_ids = []
+    for allergy_id in allergy_ids:
+        if 1 <= allergy_id <= ALLERGEN_MASK_BITS:
+            mask |= 1 << (allergy_id - 1)
+        else:
+            unmasked_ids.append(allergy_id)
+    return mask, unmasked_ids
+
 class AllergyIntolerance(db.Model):
     __tablename__ = 'AllergyIntolerances'
 
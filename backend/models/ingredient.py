@@ -15,6 +15,8 @@ class Ingredient(db.Model):
     IngredientID = db.Column(db.Integer, primary_key=True, autoincrement=True)
     Name = db.Column(db.String(255), nullable=False, unique=True)
     CreatedAt = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bits of its allergies (see allergy_intolerance.allergen_mask); kept in sync by IngredientDAO
+    AllergenMask = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
     
     allergies = db.relationship(
         "AllergyIntolerance",
@@ -18,9 +18,13 @@ class Recipe(db.Model):
     NutritionInfoJSON = db.Column(db.JSON, nullable=True)
     CreatedAt = db.Column(db.DateTime, default=datetime.utcnow)
     UpdatedAt = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Union of its ingredients' AllergenMask values; kept in sync by RecipeDAO and IngredientDAO
+    AllergenMask = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
 
     recipe_ingredients = db.relationship('RecipeIngredient', back_populates='recipe', cascade="all, delete-orphan")
 
+    __table_args__ = (db.Index('ix_recipes_public_created', 'is_public', 'CreatedAt'),)
+
     def __repr__(self):
         return f'<Recipe {self.RecipeID} {self.Title}>'
 
@@ -1,37 +1,46 @@
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.exceptions import BadRequest
-import os
 
 try:
     from backend.services.main.chatbot_service import ChatbotService
 except ImportError:
     from services.chatbot_service import ChatbotService
+from backend.config import Config
+from backend.utils.model_loader import model_loader, ModelNotReadyError
 
 
 chatbot_bp = Blueprint('chatbot_bp', __name__, url_prefix='/api/chatbot')
 
-def initialize_chatbot_service():
-    instance_tmp_folder = os.path.join(current_app.instance_path, 'chatbot_temp_uploads')
-    if not os.path.exists(instance_tmp_folder):
-        try:
-            os.makedirs(instance_tmp_folder)
-            current_app.logger.info(f"Created instance temporary upload folder: {instance_tmp_folder}")
-        except OSError as e:
-            current_app.logger.error(f"Failed to create instance temporary upload folder {instance_tmp_folder}: {e}")
+CHATBOT_MODEL = 'chatbot'
 
-    if 'chatbot_service' not in current_app.extensions:
-        current_app.extensions['chatbot_service'] = ChatbotService(static_tmp_folder=instance_tmp_folder)
-        current_app.logger.info(f"ChatbotService initialized and stored in app.extensions. Temp folder: {instance_tmp_folder}")
+def initialize_chatbot_service():
+    # Built by the model loader, so spaCy and the classifier load without blocking startup
+    model_loader.register(
+        CHATBOT_MODEL,
+        ChatbotService,
+        is_available=lambda service: service.is_chatbot_ready()
+    )
+    current_app.logger.info("ChatbotService registered with the model loader.")
+
+
+def _get_chatbot_service():
+    """Returns the ChatbotService, or None if it was never initialized or is still loading."""
+    if not model_loader.is_registered(CHATBOT_MODEL):
+        current_app.logger.error("Chatbot service not initialized.")
+        return None
+    try:
+        return model_loader.get(CHATBOT_MODEL, timeout=Config.MODEL_WAIT_TIMEOUT_SECONDS)
+    except ModelNotReadyError as e:
+        current_app.logger.warning(f"Chatbot service not available: {e}")
+        return None
 
 
 @chatbot_bp.route('/query', methods=['POST'])
 def handle_chatbot_query():
-    if 'chatbot_service' not in current_app.extensions:
-        current_app.logger.error("Chatbot service not initialized.")
+    service = _get_chatbot_service()
+    if service is None:
         return jsonify({"error": "Chatbot service is not available. Please try again later."}), 503
 
-    service = current_app.extensions['chatbot_service']
-
     if not service.is_chatbot_ready():
         current_app.logger.warn("Chatbot query received, but FoodChatbot core is not ready.")
         return jsonify({"error": "Chatbot is currently initializing or encountered an issue. Please try again shortly."}), 503
@@ -63,12 +72,10 @@ def handle_chatbot_query():
 
 @chatbot_bp.route('/food_nutrition_direct', methods=['POST'])
 def handle_direct_food_nutrition_query():
-    if 'chatbot_service' not in current_app.extensions:
-        current_app.logger.error("Chatbot service not initialized for direct nutrition query.")
+    service = _get_chatbot_service()
+    if service is None:
         return jsonify({"error": "Chatbot service is not available. Please try again later."}), 503
 
-    service = current_app.extensions['chatbot_service']
-
     if not service.is_chatbot_ready():
         current_app.logger.warn("Direct nutrition query received, but FoodChatbot core is not ready.")
         return jsonify({"error": "Chatbot is currently initializing or encountered an issue. Please try again shortly."}), 503
@@ -1,9 +1,17 @@
-from flask import Blueprint, request, jsonify
-from backend.services.main.food_lookup_service import FoodLookupService
+from flask import Blueprint, request, jsonify, current_app
+from backend.services.main.food_lookup_service import FoodLookupService, QUERY_DEFAULT_LIMIT
+from backend.services.main.autocomplete_service import AutocompleteService, AUTOCOMPLETE_MODEL
+from backend.utils.model_loader import model_loader
 
 food_lookup_bp = Blueprint('food_lookup_bp', __name__, url_prefix='/api')
 
 food_lookup_service = FoodLookupService.get_instance()
+autocomplete_service = AutocompleteService.get_instance()
+
+def initialize_autocomplete_service():
+    # Built by the model loader once the food tables are loaded; the factory needs the app for its DB query
+    app = current_app._get_current_object()
+    model_loader.register(AUTOCOMPLETE_MODEL, lambda: AutocompleteService.build_index(app))
 
 @food_lookup_bp.route('/food-lookup', methods=['GET'])
 def lookup_food_route():
@@ -23,6 +31,8 @@ def lookup_food_route():
                 return jsonify(result), 404
             elif "cannot be empty" in error_message.lower():
                 return jsonify(result), 400
+            elif "not available yet" in error_message.lower():
+                return jsonify(result), 503
             else:
                 return jsonify(result), 500 
         
@@ -37,3 +47,46 @@ def lookup_food_route():
     except Exception as e:
         print(f"Unexpected error in lookup_food_route for '{food_name}': {e}")
         return jsonify({"error": "An unexpected server error occurred."}), 500
+
+@food_lookup_bp.route('/food-lookup/query', methods=['GET'])
+def query_foods_route():
+    """
+    Example: /api/food-lookup/query?filter=Dietary Fiber>5&filter=Sugars<2&sort=-Protein&limit=20
+    """
+    filters = request.args.getlist('filter')
+    sort = request.args.getlist('sort')
+    limit = request.args.get('limit', QUERY_DEFAULT_LIMIT, type=int)
+
+    if not filters and not sort:
+        return jsonify({"error": "At least one 'filter' or 'sort' query parameter is required."}), 400
+
+    try:
+        result = food_lookup_service.query_foods(filters, sort, limit)
+
+        if result.get("error"):
+            error_message = result.get("error")
+            if error_message.startswith("Invalid query"):
+                return jsonify(result), 400
+            elif "not available yet" in error_message.lower():
+                return jsonify(result), 503
+            else:
+                return jsonify(result), 500
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        print(f"Unexpected error in query_foods_route: {e}")
+        return jsonify({"error": "An unexpected server error occurred."}), 500
+
+@food_lookup_bp.route('/autocomplete', methods=['GET'])
+def autocomplete_route():
+    """
+    Example: /api/autocomplete?q=chick&limit=8
+    """
+    prefix = request.args.get('q', type=str)
+    limit = request.args.get('limit', 10, type=int)
+
+    data, error, status_code = autocomplete_service.complete(prefix, limit)
+    if error:
+        return jsonify(error), status_code
+    return jsonify(data), status_code
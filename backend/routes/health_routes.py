@@ -4,6 +4,7 @@ Health check routes for monitoring application and database status.
 from flask import Blueprint, jsonify
 from backend.utils.db_health_check import DatabaseHealthCheck
 from backend.utils.logging_utils import log_info, log_error
+from backend.utils.model_loader import model_loader, ModelLoader
 import time
 
 health_bp = Blueprint('health', __name__, url_prefix='/api/health')
@@ -45,6 +46,29 @@ def database_health():
             'timestamp': time.time()
         }), 500
 
+# (status, message) reported for each ModelLoader.overall_state()
+MODEL_HEALTH = {
+    ModelLoader.READY: ('ok', 'All models loaded'),
+    ModelLoader.DEGRADED: ('degraded', 'All models loaded; some are running on fallbacks'),
+    ModelLoader.LOADING: ('loading', 'Some models are still loading'),
+    ModelLoader.FAILED: ('failed', 'Some models failed to load'),
+}
+
+@health_bp.route('/models', methods=['GET'])
+def models_health():
+    """
+    Report the loading state of each AI model. Returns 503 while any model is still loading or
+    if any failed; degraded models (classifiers without weights) still serve fallbacks, so 200.
+    """
+    state = model_loader.overall_state()
+    status, message = MODEL_HEALTH[state]
+    return jsonify({
+        'status': status,
+        'message': message,
+        'models': model_loader.status(),
+        'timestamp': time.time()
+    }), 503 if state in (ModelLoader.LOADING, ModelLoader.FAILED) else 200
+
 @health_bp.route('/full', methods=['GET'])
 def full_health():
     """Complete health check including Flask and database."""
@@ -52,6 +76,9 @@ def full_health():
         # Check database
         health_checker = DatabaseHealthCheck(max_retries=1, retry_delay=0)
         db_connected = health_checker.check_database_connectivity()
+        models_state = model_loader.overall_state()
+        models_status, models_message = MODEL_HEALTH[models_state]
+        models_ok = models_state == ModelLoader.READY
         
         health_status = {
             'flask': {
@@ -62,14 +89,20 @@ def full_health():
                 'status': 'ok' if db_connected else 'error',
                 'message': 'Database connection successful' if db_connected else 'Database connection failed'
             },
+            'models': {
+                'status': models_status,
+                'message': models_message,
+                'details': model_loader.status()
+            },
             'overall': {
-                'status': 'ok' if db_connected else 'degraded',
-                'message': 'All systems operational' if db_connected else 'Database connectivity issues'
+                'status': 'ok' if db_connected and models_ok else 'degraded',
+                'message': 'All systems operational' if db_connected and models_ok else
+                           ('Database connectivity issues' if not db_connected else models_message)
             },
             'timestamp': time.time()
         }
         
-        status_code = 200 if db_connected else 503
+        status_code = 200 if db_connected and models_state != ModelLoader.FAILED else 503
         return jsonify(health_status), status_code
         
     except Exception as e:
@@ -32,3 +32,31 @@ def get_nutrition_data_route(ingredient_name: str):
     except Exception as e:
         print(f"Unexpected error in get_nutrition_data_route for '{ingredient_name}': {e}")
         return jsonify({"error": "An unexpected server error occurred."}), 500
+
+
+@nutrition_bp.route('/nutrition/batch', methods=['POST'])
+def get_nutrition_batch_route():
+    """
+    Fetches nutritional information for several ingredients at once.
+    Body: {"names": ["apple", "rice", ...], "nutrients": ["Energy", ...] (optional)}
+    Each entry of "results" reports its own success or error.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "Request body must be JSON"}), 400
+
+    try:
+        results, error, status = nutrition_service.get_nutrition_batch(data.get('names'), nutrients=data.get('nutrients'))
+        if error:
+            return jsonify(error), status
+
+        succeeded = sum(1 for item in results if item.get('success'))
+        return jsonify({
+            "results": results,
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded
+        }), status
+
+    except Exception as e:
+        print(f"Unexpected error in get_nutrition_batch_route: {e}")
+        return jsonify({"error": "An unexpected server error occurred."}), 500
@@ -20,3 +20,21 @@ def suggest_substitutes_route():
         return jsonify(error), status
     
     return jsonify(substitutes), status
+
+@substitute_bp.route('/substitute/batch', methods=['POST'])
+def suggest_substitutes_batch_route():
+    """
+    Suggests substitutes for several ingredients at once, e.g. every ingredient of a recipe.
+    Body: {"ingredientNames": ["butter", "milk", ...]}
+    Returns {ingredient_name: [{"name": ..., "score": ...}, ...]}.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "Request body must be JSON"}), 400
+
+    substitutes, error, status = substitution_service.get_substitutes_batch(data.get('ingredientNames'))
+
+    if error:
+        return jsonify(error), status
+
+    return jsonify(substitutes), status
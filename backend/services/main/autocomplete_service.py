@@ -0,0 +1,104 @@
+import threading
+from sqlalchemy import func
+from backend.config import Config
+from backend.db import db
+from backend.models import Ingredient, RecipeIngredient
+from backend.services.main.food_lookup_service import FOOD_DATABASE_MODEL
+from backend.services.main.nutrition_service import NUTRITION_LOOKUP_MODEL
+from backend.utils.logging_utils import log_info, log_warning
+from backend.utils.model_loader import model_loader, ModelNotReadyError
+from backend.utils.prefix_trie import PrefixTrie
+
+AUTOCOMPLETE_MODEL = 'autocomplete_index'
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+
+class AutocompleteService:
+    """
+    Prefix autocomplete over FOOD-DATA names, USDA description heads and the Ingredients table.
+    Each term's weight is how often it occurs: once per FOOD-DATA name, once per USDA
+    description starting with it (e.g. 'Cheese, cheddar' counts towards 'Cheese') and once
+    per recipe using an ingredient, plus one for the ingredient itself.
+    """
+    _instance = None
+
+    def __init__(self):
+        self._pending = []
+        self._pending_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def build_index(app):
+        """Builds the trie. Runs in a model loader thread, so the ingredient query gets its own app context."""
+        index = PrefixTrie(max_k=AUTOCOMPLETE_MAX_LIMIT)
+
+        for name in model_loader.get(FOOD_DATABASE_MODEL).names:
+            index.add(name)
+
+        lookup = None
+        if model_loader.is_registered(NUTRITION_LOOKUP_MODEL):
+            try:
+                lookup = model_loader.get(NUTRITION_LOOKUP_MODEL)
+            except ModelNotReadyError as e:
+                log_warning(f"USDA descriptions not added to autocomplete: {e}", "AutocompleteService")
+        if lookup is not None:
+            for description in lookup.food_descriptions:
+                index.add(description.split(',', 1)[0])
+
+        with app.app_context():
+            rows = db.session.query(Ingredient.Name, func.count(RecipeIngredient.RecipeIngredientID)) \
+                .outerjoin(RecipeIngredient, RecipeIngredient.IngredientID == Ingredient.IngredientID) \
+                .group_by(Ingredient.IngredientID, Ingredient.Name).all()
+        for name, recipe_count in rows:
+            index.add(name, 1 + recipe_count)
+
+        log_info(f"Autocomplete index built with {len(index)} terms", "AutocompleteService")
+        return index
+
+    def _get_index(self):
+        index = model_loader.get(AUTOCOMPLETE_MODEL, timeout=Config.MODEL_WAIT_TIMEOUT_SECONDS)
+        if self._pending:
+            with self._pending_lock:
+                pending, self._pending = self._pending, []
+            for name in pending:
+                if name not in index:
+                    index.add(name)
+        return index
+
+    def add_ingredient(self, name):
+        """
+        Adds a newly created ingredient. Names created before the index is ready are kept
+        and added on first use, in case the build's ingredient query ran before them.
+        """
+        if not name or not model_loader.is_registered(AUTOCOMPLETE_MODEL):
+            return
+        if model_loader.is_ready(AUTOCOMPLETE_MODEL):
+            model_loader.get(AUTOCOMPLETE_MODEL, timeout=0).add(name)
+        else:
+            with self._pending_lock:
+                self._pending.append(name)
+
+    def complete(self, prefix, limit=10):
+        """
+        Returns the heaviest completions of prefix.
+        Output format: (data, error_dict, status_code)
+        """
+        if not prefix or not prefix.strip():
+            return None, {"error": "Query parameter 'q' is required."}, 400
+        if not 1 <= limit <= AUTOCOMPLETE_MAX_LIMIT:
+            return None, {"error": f"limit must be between 1 and {AUTOCOMPLETE_MAX_LIMIT}."}, 400
+
+        if not model_loader.is_registered(AUTOCOMPLETE_MODEL):
+            return None, {"error": "Autocomplete service is not initialized."}, 503
+        try:
+            index = self._get_index()
+        except ModelNotReadyError as e:
+            return None, {"error": f"Autocomplete index is not available yet: {e}"}, 503
+
+        suggestions = [{"name": name, "weight": weight} for name, weight in index.complete(prefix, limit)]
+        return {"query": prefix, "suggestions": suggestions}, None, 200
@@ -1,30 +1,28 @@
 import os
-import tempfile
-import uuid
-from werkzeug.utils import secure_filename
 
-from backend.ai_models.chatbot.food_chatbot import FoodChatbot
-from backend.ai_models.food_classification.food_classifier import FoodClassifier
+from backend.services.main.classification_service import FOOD_CLASSIFIER_MODEL, classification_cache
 from backend.services.main.food_lookup_service import FoodLookupService
 from backend.services.main.substitution_service import SubstitutionService
 from backend.utils.logging_utils import log_info, log_success, log_warning, log_error
+from backend.utils.model_loader import model_loader
 
 
 class ChatbotService:
-    def __init__(self, static_tmp_folder='instance/chatbot_temp_uploads'):
+    def __init__(self):
         """
         Initializes the ChatbotService.
         It instantiates FoodChatbot and its dependencies.
-
-        Args:
-            static_tmp_folder (str): Path to the temporary folder for uploaded images.
         """
+        # FoodChatbot imports TensorFlow and spaCy; the service is built by the model loader thread.
+        from backend.ai_models.chatbot.food_chatbot import FoodChatbot
+
         log_info("Initializing dependencies...", "ChatbotService")
         try:
-            food_classifier = FoodClassifier()
-            log_success("FoodClassifier instantiated.", "ChatbotService")
+            # Shares the classifier instance loaded for ClassificationService, and with it its micro-batcher
+            food_classifier = model_loader.get(FOOD_CLASSIFIER_MODEL)
+            log_success("FoodClassifier instance obtained.", "ChatbotService")
         except Exception as e:
-            log_error(f"Failed to instantiate FoodClassifier: {e}", "ChatbotService")
+            log_error(f"Failed to obtain FoodClassifier: {e}", "ChatbotService")
             food_classifier = None
 
         try:
@@ -47,16 +45,10 @@ class ChatbotService:
             food_classifier_instance=food_classifier,
             food_lookup_service_instance=food_lookup_service,
             substitution_service_instance=substitution_service,
-            config_path=config_path
+            config_path=config_path,
+            classification_cache=classification_cache
         )
 
-        self.temp_image_folder = os.path.abspath(static_tmp_folder)
-        if not os.path.exists(self.temp_image_folder):
-            os.makedirs(self.temp_image_folder, exist_ok=True)
-            log_info(f"Created temp image folder: {self.temp_image_folder}", "ChatbotService")
-        else:
-            log_info(f"Using existing temp image folder: {self.temp_image_folder}", "ChatbotService")
-
         if self.chatbot_instance.is_ready():
             log_success("FoodChatbot instance is ready and configured.", "ChatbotService")
         else:
@@ -80,33 +72,13 @@ class ChatbotService:
         if not self.chatbot_instance.is_ready():
             return {"error": "Chatbot is not fully operational at the moment. Please try again later."}
 
-        image_path = None
-        temp_file_to_delete = None
-
+        image = None
         if image_file_storage and image_file_storage.filename:
-            try:
-                filename = secure_filename(image_file_storage.filename)
-                unique_filename = str(uuid.uuid4()) + "_" + filename
-                image_path = os.path.join(self.temp_image_folder, unique_filename)
-
-                image_file_storage.save(image_path)
-                temp_file_to_delete = image_path
-                log_info(f"Image saved temporarily to {image_path}", "ChatbotService")
-            except Exception as e:
-                log_error(f"Error saving temporary image: {e}", "ChatbotService")
-                return {"error": "Could not process the uploaded image. Please try again."}
+            # Classified straight from the upload stream; nothing is written to disk
+            image = image_file_storage.stream
+            log_info(f"Received image '{image_file_storage.filename}' with chatbot query", "ChatbotService")
 
-        try:
-            response = self.chatbot_instance.process_query(text_query, image_path=image_path)
-        finally:
-            if temp_file_to_delete and os.path.exists(temp_file_to_delete):
-                try:
-                    os.remove(temp_file_to_delete)
-                    log_info(f"Temporary image {temp_file_to_delete} deleted.", "ChatbotService")
-                except Exception as e:
-                    log_error(f"Error deleting temporary image {temp_file_to_delete}: {e}", "ChatbotService")
-
-        return response
+        return self.chatbot_instance.process_query(text_query, image=image)
 
     def get_nutrition_for_food_direct(self, food_name_str: str) -> dict:
         """
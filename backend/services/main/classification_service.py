@@ -1,26 +1,156 @@
-import os
-import tempfile
-from werkzeug.utils import secure_filename
-from backend.ai_models.ingredient_classification.ingredient_classifier import FoodIngredientClassifier
-from backend.ai_models.food_classification.food_classifier import FoodClassifier
 import json
+import threading
+from backend.config import Config
 from backend.dao import ClassificationResultDAO
 from backend.db import db
 from backend.services.main.nutrition_service import NutritionService
-from backend.utils.logging_utils import log_info, log_warning, log_error
+from backend.utils.image_result_cache import ImageResultCache
+from backend.utils.inference_pool import InferencePool, RemoteClassifier
+from backend.utils.log_monitor import log_monitor
+from backend.utils.logging_utils import log_info, log_warning, log_error, disable_keras_interactive_logging
+from backend.utils.model_loader import model_loader, ModelNotReadyError
+from backend.utils.tf_runtime import configure_threads
+
+# Nutrients shown on the classifier result card; the full USDA record has well over a hundred.
+CLASSIFICATION_NUTRIENTS = (
+    'Energy',
+    'Protein',
+    'Total lipid (fat)',
+    'Carbohydrate, by difference',
+    'Fiber, total dietary',
+    'Sugars, Total',
+    'Total Sugars',
+    'Fatty acids, total saturated',
+    'Cholesterol',
+    'Sodium, Na',
+    'Potassium, K',
+    'Calcium, Ca',
+    'Iron, Fe',
+    'Vitamin C, total ascorbic acid',
+    'Water',
+)
+
+FOOD_CLASSIFIER_MODEL = 'food_classifier'
+INGREDIENT_CLASSIFIER_MODEL = 'ingredient_classifier'
+
+# Keyed by mode and perceptual image hash; FoodChatbot shares it through ChatbotService
+classification_cache = ImageResultCache(
+    maxsize=Config.CLASSIFICATION_CACHE_SIZE,
+    ttl=Config.CLASSIFICATION_CACHE_TTL_SECONDS or None,
+    spill_dir=Config.CLASSIFICATION_CACHE_SPILL_DIR or None,
+    spill_max_entries=Config.CLASSIFICATION_CACHE_SPILL_MAX_ENTRIES
+)
+log_monitor.register_metrics_provider('caches', 'image_classifications', classification_cache.stats)
+
+
+def _prepare_inference(classifier, name):
+    """
+    Compiles and warms up a loaded classifier, then batches its concurrent predictions. The instance
+    is shared through the model loader, so ClassificationService and ChatbotService requests land in
+    the same batches.
+    """
+    if not classifier.is_model_loaded():
+        return
+    if Config.CLASSIFIER_COMPILE_INFERENCE:
+        try:
+            classifier.compile_inference(warmup=True)
+        except Exception as e:
+            log_warning(f"Compiled inference unavailable for {name}, using eager model calls - {e}", "ClassificationService")
+    if Config.CLASSIFIER_BATCH_MAX_SIZE > 1:
+        batcher = classifier.enable_batching(Config.CLASSIFIER_BATCH_MAX_SIZE, Config.CLASSIFIER_BATCH_MAX_WAIT_MS)
+        log_monitor.register_metrics_provider('models', f"{name}_batching", batcher.stats)
+
+
+# The classifier modules import TensorFlow, so they are imported by the loader thread rather than at app import.
+def _load_food_classifier():
+    from backend.ai_models.food_classification.food_classifier import FoodClassifier
+    disable_keras_interactive_logging()
+    configure_threads(Config.TF_INTRA_OP_THREADS, Config.TF_INTER_OP_THREADS)
+    classifier = FoodClassifier(backend=Config.CLASSIFIER_BACKEND, tflite_threads=Config.TFLITE_NUM_THREADS or None)
+    if not classifier.is_model_loaded():
+        log_warning("Food classifier model failed to load. Predictions for 'food' mode will be based on fallback dummy logic.", "ClassificationService")
+    _prepare_inference(classifier, FOOD_CLASSIFIER_MODEL)
+    return classifier
+
+
+def _load_ingredient_classifier():
+    from backend.ai_models.ingredient_classification.ingredient_classifier import FoodIngredientClassifier
+    disable_keras_interactive_logging()
+    configure_threads(Config.TF_INTRA_OP_THREADS, Config.TF_INTER_OP_THREADS)
+    classifier = FoodIngredientClassifier(backend=Config.CLASSIFIER_BACKEND, tflite_threads=Config.TFLITE_NUM_THREADS or None)
+    if not classifier.is_model_loaded():
+        log_warning("Ingredient classifier model failed to load. Predictions for 'ingredient' mode will be based on fallback dummy logic.", "ClassificationService")
+    _prepare_inference(classifier, INGREDIENT_CLASSIFIER_MODEL)
+    return classifier
+
+
+_inference_pool = None
+_inference_pool_lock = threading.Lock()
+
+
+def get_inference_pool():
+    """
+    Starts the inference worker pool on first use. Each worker runs the in-process loaders above,
+    so it compiles, warms up and batches its classifiers as the API process would. Never called
+    at import time: the spawned workers import this module too.
+    """
+    global _inference_pool
+    with _inference_pool_lock:
+        if _inference_pool is None:
+            _inference_pool = InferencePool(
+                {FOOD_CLASSIFIER_MODEL: _load_food_classifier, INGREDIENT_CLASSIFIER_MODEL: _load_ingredient_classifier},
+                workers=Config.INFERENCE_WORKERS,
+                threads_per_worker=max(Config.CLASSIFIER_BATCH_MAX_SIZE, 1),
+                hang_timeout=Config.INFERENCE_WORKER_HANG_SECONDS,
+                startup_timeout=Config.INFERENCE_WORKER_STARTUP_TIMEOUT_SECONDS
+            ).start()
+            log_monitor.register_metrics_provider('models', 'inference_workers', _inference_pool.stats)
+        return _inference_pool
+
+
+def _load_remote_classifier(name):
+    pool = get_inference_pool()
+    if not pool.wait_ready(Config.INFERENCE_WORKER_STARTUP_TIMEOUT_SECONDS):
+        log_warning(f"No inference worker loaded {name} within {Config.INFERENCE_WORKER_STARTUP_TIMEOUT_SECONDS:.0f}s.", "ClassificationService")
+    return RemoteClassifier(pool, name, timeout=Config.INFERENCE_REQUEST_TIMEOUT_SECONDS)
+
+
+if Config.INFERENCE_WORKERS > 0:
+    model_loader.register(FOOD_CLASSIFIER_MODEL, lambda: _load_remote_classifier(FOOD_CLASSIFIER_MODEL), is_available=lambda c: c.is_model_loaded())
+    model_loader.register(INGREDIENT_CLASSIFIER_MODEL, lambda: _load_remote_classifier(INGREDIENT_CLASSIFIER_MODEL), is_available=lambda c: c.is_model_loaded())
+else:
+    model_loader.register(FOOD_CLASSIFIER_MODEL, _load_food_classifier, is_available=lambda c: c.is_model_loaded())
+    model_loader.register(INGREDIENT_CLASSIFIER_MODEL, _load_ingredient_classifier, is_available=lambda c: c.is_model_loaded())
 
 class ClassificationService:
     def __init__(self):
         self.classification_result_dao = ClassificationResultDAO()
         self.nutrition_service = NutritionService.get_instance()
 
-        self.ingredient_classifier = FoodIngredientClassifier()
-        if not self.ingredient_classifier.is_model_loaded():
-            log_warning("Ingredient classifier model failed to load. Predictions for 'ingredient' mode will be based on fallback dummy logic.", "ClassificationService")
+    @property
+    def food_classifier(self):
+        return model_loader.get(FOOD_CLASSIFIER_MODEL, timeout=Config.MODEL_WAIT_TIMEOUT_SECONDS)
 
-        self.food_classifier = FoodClassifier()
-        if not self.food_classifier.is_model_loaded():
-            log_warning("Food classifier model failed to load. Predictions for 'food' mode will be based on fallback dummy logic.", "ClassificationService")
+    @property
+    def ingredient_classifier(self):
+        return model_loader.get(INGREDIENT_CLASSIFIER_MODEL, timeout=Config.MODEL_WAIT_TIMEOUT_SECONDS)
+
+    def _predict_cached(self, classifier, predict, classification_mode, image_stream):
+        """
+        Decodes the upload once, then serves its predictions from classification_cache or runs predict
+        on the decoded image. Returns (predictions, cache_key, cached_entry); a failed decode gives
+        empty predictions, as a failed prediction does.
+        """
+        try:
+            image = classifier.load_image(image_stream)
+        except Exception as e:
+            log_error(f"Could not decode uploaded image for {classification_mode} classification - {e}", "ClassificationService")
+            return [], None, None
+        cache_key = classification_cache.key(classification_mode, image)
+        cached = classification_cache.get(cache_key)
+        if cached is not None:
+            return cached['predictions'], cache_key, cached
+        return predict(image), cache_key, None
 
     def classify_item(self, image_file_storage, user_id, classification_mode, food_name=None):
         """
@@ -32,16 +162,22 @@ class ClassificationService:
         classifier_to_use = None
         prediction_method_name = None
 
-        if classification_mode == 'food':
-            if self.food_classifier and self.food_classifier.is_model_loaded():
-                classifier_to_use = self.food_classifier
-                prediction_method_name = 'predict_food'
-        elif classification_mode == 'ingredient':
-            if self.ingredient_classifier and self.ingredient_classifier.is_model_loaded():
-                classifier_to_use = self.ingredient_classifier
-                prediction_method_name = 'predict_ingredient'
-        else:
-            return None, {"error": f"Invalid classification mode: {classification_mode}"}, 400
+        try:
+            if classification_mode == 'food':
+                food_classifier = self.food_classifier
+                if food_classifier and food_classifier.is_model_loaded():
+                    classifier_to_use = food_classifier
+                    prediction_method_name = 'predict_food'
+            elif classification_mode == 'ingredient':
+                ingredient_classifier = self.ingredient_classifier
+                if ingredient_classifier and ingredient_classifier.is_model_loaded():
+                    classifier_to_use = ingredient_classifier
+                    prediction_method_name = 'predict_ingredient'
+            else:
+                return None, {"error": f"Invalid classification mode: {classification_mode}"}, 400
+        except ModelNotReadyError as e:
+            log_warning(f"{classification_mode.capitalize()} classifier not available - {e}", "ClassificationService")
+            return None, {"error": str(e)}, 503
 
 
         if not classifier_to_use:
@@ -50,7 +186,7 @@ class ClassificationService:
             name_for_nutrition_lookup = predicted_food_name_from_model
             predictions = []
 
-            nutrition_result = self.nutrition_service.get_nutrition(name_for_nutrition_lookup)
+            nutrition_result = self.nutrition_service.get_nutrition(name_for_nutrition_lookup, nutrients=CLASSIFICATION_NUTRIENTS)
             
             return {
                 "classification": {
@@ -68,7 +204,7 @@ class ClassificationService:
             if food_name:
                 log_info(f"No image provided, using food name '{food_name}' for nutrition lookup (mode: {classification_mode}).", "ClassificationService")
                 name_for_nutrition_lookup = food_name
-                nutrition_result = self.nutrition_service.get_nutrition(name_for_nutrition_lookup)
+                nutrition_result = self.nutrition_service.get_nutrition(name_for_nutrition_lookup, nutrients=CLASSIFICATION_NUTRIENTS)
                 nutrition_info_json_string = json.dumps(nutrition_result)
                 try:
                     self.classification_result_dao.create_classification_result(
@@ -96,23 +232,15 @@ class ClassificationService:
             else:
                 return None, {"error": "Image file or food name is required for classification"}, 400
 
-        temp_dir = tempfile.gettempdir()
-        temp_image_path = None
         try:
-            filename = secure_filename(image_file_storage.filename if image_file_storage.filename else "temp_image.tmp")
-            temp_image_path = os.path.join(temp_dir, filename)
-            image_file_storage.save(temp_image_path)
-            log_info(f"Image saved temporarily to {temp_image_path} for {classification_mode} classification.", "ClassificationService")
-
-            predictions = []
+            log_info(f"Classifying uploaded image '{image_file_storage.filename}' ({classification_mode}).", "ClassificationService")
+            # Decoded straight from the upload stream; nothing is written to disk
+            predictions, cache_key, cached = self._predict_cached(
+                classifier_to_use, getattr(classifier_to_use, prediction_method_name), classification_mode, image_file_storage.stream
+            )
             predicted_food_name_from_model = None
             raw_score = None
 
-            if prediction_method_name == 'predict_food':
-                predictions = classifier_to_use.predict_food(temp_image_path)
-            elif prediction_method_name == 'predict_ingredient':
-                predictions = classifier_to_use.predict_ingredient(temp_image_path)
-
             if predictions:
                 predicted_food_name_from_model = predictions[0]['name']
                 raw_score = predictions[0]['confidence']
@@ -124,8 +252,17 @@ class ClassificationService:
                 log_warning(f"Model prediction failed or empty for {classification_mode}, using provided food_name '{food_name}' as fallback.", "ClassificationService")
             else:
                 name_for_nutrition_lookup = f"Unknown Food ({classification_mode} classification failed)"
-            
-            nutrition_result = self.nutrition_service.get_nutrition(name_for_nutrition_lookup)
+
+            if cached is not None and cached.get('nutrition') is not None:
+                nutrition_result = cached['nutrition']
+            else:
+                nutrition_result = self.nutrition_service.get_nutrition(name_for_nutrition_lookup, nutrients=CLASSIFICATION_NUTRIENTS)
+                # Empty predictions mean the model call failed, and failed lookups may be transient; neither is cached
+                if predictions and cache_key:
+                    classification_cache.put(cache_key, {
+                        'predictions': predictions,
+                        'nutrition': nutrition_result if nutrition_result.get('success') else None
+                    })
             nutrition_info_json_string = json.dumps(nutrition_result)
 
             uploaded_image_url = None
@@ -171,10 +308,3 @@ class ClassificationService:
                 },
                 "nutrition": nutrition_result_on_error
             }, None, 500
-        finally:
-            if temp_image_path and os.path.exists(temp_image_path):
-                try:
-                    os.remove(temp_image_path)
-                    log_info(f"Temporary image {temp_image_path} removed.", "ClassificationService")
-                except Exception as e_remove:
-                    log_error(f"Error removing temporary image {temp_image_path} - {e_remove}", "ClassificationService")
@@ -1,11 +1,22 @@
-import json
+import re
 from backend.ai_models.food_data.nutrition_database import NutritionDatabase
+from backend.config import Config
+from backend.utils.model_loader import model_loader, ModelNotReadyError
+
+FOOD_DATABASE_MODEL = 'food_database'
+QUERY_DEFAULT_LIMIT = 20
+QUERY_MAX_LIMIT = 100
+FILTER_PATTERN = re.compile(r'^\s*(.+?)\s*(<=|>=|==|<|>)\s*(\d*\.?\d+)\s*$')
+
+model_loader.register(FOOD_DATABASE_MODEL, NutritionDatabase)
 
 class FoodLookupService:
     _instance = None
 
-    def __init__(self):
-        self.db = NutritionDatabase()
+    @property
+    def db(self):
+        """The NutritionDatabase. Raises ModelNotReadyError while it is still loading."""
+        return model_loader.get(FOOD_DATABASE_MODEL, timeout=Config.MODEL_WAIT_TIMEOUT_SECONDS)
 
     @classmethod
     def get_instance(cls):
@@ -22,26 +33,58 @@ class FoodLookupService:
             is_exact_match: If True, uses get_food_by_exact_name. Otherwise, uses get_food_info.
 
         Returns:
-            A dictionary containing the food data or an error message.
+            A dictionary containing the food data or an error message. Food payloads are
+            shared with later lookups and must not be modified.
         '''
         if not food_query_or_exact_name:
             return {"error": "Food name cannot be empty."}
 
         try:
             if is_exact_match:
-                json_string_data = self.db.get_food_by_exact_name(food_query_or_exact_name)
-            else:
-                json_string_data = self.db.get_food_info(food_query_or_exact_name)
-            
-            if isinstance(json_string_data, str):
-                return json.loads(json_string_data)
-            elif isinstance(json_string_data, dict):
-                return json_string_data
-            else:
-                return {"error": "Unexpected data format from database."}
-
-        except json.JSONDecodeError:
-            return {"error": "Failed to decode food data."}
+                return self.db.get_food_by_exact_name(food_query_or_exact_name)
+            return self.db.get_food_info(food_query_or_exact_name)
+
+        except ModelNotReadyError as e:
+            return {"error": f"Food database is not available yet: {e}"}
         except Exception as e:
             print(f"Error in FoodLookupService: {e}")
             return {"error": "An unexpected error occurred while fetching food data."}
+
+    def query_foods(self, filters=None, sort=None, limit=QUERY_DEFAULT_LIMIT) -> dict:
+        '''
+        Filters, sorts and ranks foods by nutrient values.
+
+        Args:
+            filters: Expressions like 'Dietary Fiber>5' or 'sugars <= 2' (values in the nutrient's unit).
+            sort: Nutrient names, primary key first; prefix with '-' for descending, e.g. '-Protein'.
+            limit: Maximum number of foods to return (1 to QUERY_MAX_LIMIT).
+
+        Returns:
+            {'total', 'results': [{'food', 'data'}]} or a dictionary with an error message.
+        '''
+        parsed_filters = []
+        for expression in filters or []:
+            match = FILTER_PATTERN.match(expression)
+            if not match:
+                return {"error": f"Invalid query: cannot parse filter '{expression}'. Use e.g. 'Protein>10'."}
+            column, operator, value = match.groups()
+            parsed_filters.append((column, operator, float(value)))
+
+        sort_by = []
+        for key in sort or []:
+            key = key.strip()
+            descending = key.startswith('-')
+            sort_by.append((key.lstrip('-+'), descending))
+
+        if limit is None or not 1 <= limit <= QUERY_MAX_LIMIT:
+            return {"error": f"Invalid query: limit must be between 1 and {QUERY_MAX_LIMIT}."}
+
+        try:
+            return self.db.query_foods(parsed_filters, sort_by, limit)
+        except ValueError as e:
+            return {"error": f"Invalid query: {e}."}
+        except ModelNotReadyError as e:
+            return {"error": f"Food database is not available yet: {e}"}
+        except Exception as e:
+            print(f"Error in FoodLookupService.query_foods: {e}")
+            return {"error": "An unexpected error occurred while querying food data."}
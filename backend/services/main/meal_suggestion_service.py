@@ -232,23 +232,13 @@ class MealSuggestionService:
             
             user_allergy_ids = [ua.AllergyID for ua in user_allergies]
             
-            filtered_recipes = []
-            for recipe in recipes:
-                # Get all ingredients for this recipe
-                recipe_ingredients = self.recipe_dao.get_ingredients_for_recipe(recipe.RecipeID)
-                
-                # Check if any ingredient has an allergy that matches user's allergies
-                has_allergen = False
-                for ingredient in recipe_ingredients:
-                    ingredient_allergies = self.ingredient_dao.get_allergies_for_ingredient(ingredient.IngredientID)
-                    if ingredient_allergies:
-                        ingredient_allergy_ids = [allergy.id for allergy in ingredient_allergies]
-                        if any(allergy_id in user_allergy_ids for allergy_id in ingredient_allergy_ids):
-                            has_allergen = True
-                            break
-                
-                if not has_allergen:
-                    filtered_recipes.append(recipe)
+            # One query over the precomputed allergen masks instead of one per recipe ingredient
+            allergen_filter = self.recipe_dao.allergen_exclusion_filter(user_allergy_ids)
+            safe_recipe_ids = {row[0] for row in db.session.query(Recipe.RecipeID).filter(
+                Recipe.RecipeID.in_([recipe.RecipeID for recipe in recipes]),
+                allergen_filter
+            )}
+            filtered_recipes = [recipe for recipe in recipes if recipe.RecipeID in safe_recipe_ids]
             
             return filtered_recipes
             
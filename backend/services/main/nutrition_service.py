@@ -1,19 +1,40 @@
 import os
 from backend.ai_models.nutrition_lookup.nutrition_lookup import OfflineNutritionLookup
+from backend.ai_models.nutrition_lookup.recipe_nutrition import RecipeNutritionCalculator, RECIPE_NUTRIENTS
+from backend.config import Config
+from backend.utils.log_monitor import log_monitor
+from backend.utils.lru_cache import LRUCache
+from backend.utils.model_loader import model_loader, ModelNotReadyError
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 AI_MODELS_DIR = os.path.join(SCRIPT_DIR, '..', '..', 'ai_models', 'nutrition_lookup')
 DATA_FOLDER_PATH = os.path.join(AI_MODELS_DIR, 'Data')
+NUTRITION_LOOKUP_MODEL = 'nutrition_lookup'
 
 class NutritionService:
     _instance = None
 
     def __init__(self):
+        # Keyed by the cleaned food name, so 'Pizza' and ' pizza' and the plural/singular
+        # retry inside get_nutrition_for_food all share entries.
+        self.match_cache = LRUCache(
+            maxsize=Config.NUTRITION_CACHE_SIZE,
+            ttl=Config.NUTRITION_CACHE_TTL_SECONDS or None
+        )
+        log_monitor.register_metrics_provider('caches', 'nutrition_matches', self.match_cache.stats)
+
+        model_loader.register(NUTRITION_LOOKUP_MODEL, self._load_lookup, is_available=lambda lookup: lookup is not None)
+
+    def _load_lookup(self):
         if not os.path.exists(DATA_FOLDER_PATH):
             print(f"Warning: Data directory not found at {DATA_FOLDER_PATH}. Nutrition lookup may fail.")
-            self.lookup = None
-        else:
-            self.lookup = OfflineNutritionLookup(data_folder=DATA_FOLDER_PATH)
+            return None
+        return OfflineNutritionLookup(data_folder=DATA_FOLDER_PATH, match_cache=self.match_cache)
+
+    @property
+    def lookup(self):
+        """The OfflineNutritionLookup, or None if the data is missing. Raises ModelNotReadyError while loading."""
+        return model_loader.get(NUTRITION_LOOKUP_MODEL, timeout=Config.MODEL_WAIT_TIMEOUT_SECONDS)
 
     @classmethod
     def get_instance(cls):
@@ -21,15 +42,116 @@ class NutritionService:
             cls._instance = cls()
         return cls._instance
 
-    def get_nutrition(self, food_name: str):
-        if self.lookup is None:
+    def get_nutrition(self, food_name: str, nutrients=None):
+        try:
+            lookup = self.lookup
+        except ModelNotReadyError as e:
+            return {'success': False, 'error': f"Nutrition lookup module not initialized: {e}"}
+        if lookup is None:
             return {'success': False, 'error': 'Nutrition lookup module not initialized due to missing data directory.'}
 
         if not food_name or not isinstance(food_name, str):
             return {'success': False, 'error': 'Invalid food name provided.'}
 
         try:
-            return self.lookup.get_nutrition_for_food(food_name)
+            return lookup.get_nutrition_for_food(food_name, nutrients=nutrients)
         except Exception as e:
             print(f"Error during nutrition lookup for '{food_name}': {e}")
             return {'success': False, 'error': f"An error occurred while fetching nutrition data for '{food_name}'."}
+
+    def get_nutrition_batch(self, food_names, nutrients=None):
+        """
+        Looks up several food names in one pass.
+        Returns (results, error, status); results holds one entry per name, each with
+        its own 'success' flag, so a bad or unknown name does not fail the batch.
+        """
+        try:
+            lookup = self.lookup
+        except ModelNotReadyError as e:
+            return None, {'error': str(e)}, 503
+        if lookup is None:
+            return None, {'error': 'Nutrition lookup module not initialized due to missing data directory.'}, 503
+
+        if not isinstance(food_names, list) or not food_names:
+            return None, {'error': "'names' must be a non-empty list of food names."}, 400
+        if len(food_names) > Config.NUTRITION_BATCH_MAX_ITEMS:
+            return None, {'error': f"At most {Config.NUTRITION_BATCH_MAX_ITEMS} names can be looked up per request."}, 400
+        if nutrients is not None and (not isinstance(nutrients, list) or not all(isinstance(n, str) for n in nutrients)):
+            return None, {'error': "'nutrients' must be a list of nutrient names."}, 400
+
+        valid_names = [name for name in food_names if isinstance(name, str) and name.strip()]
+        try:
+            found = lookup.get_nutrition_for_foods(valid_names, nutrients=nutrients, workers=Config.NUTRITION_MATCH_WORKERS)
+        except Exception as e:
+            print(f"Error during batch nutrition lookup for {len(valid_names)} names: {e}")
+            return None, {'error': 'An error occurred while fetching nutrition data.'}, 500
+
+        found_iter = iter(found)
+        results = []
+        for name in food_names:
+            if isinstance(name, str) and name.strip():
+                results.append(next(found_iter))
+            else:
+                results.append({'query': name, 'success': False, 'error': 'Invalid food name provided.'})
+        return results, None, 200
+
+    def get_recipe_nutrition(self, recipe_data: dict, fallback=None):
+        """
+        Per-serving nutrition for a recipe in the GeminiNlpParser format, computed locally from
+        the USDA tables. 'fallback' is a callable with the signature of
+        GeminiNlpParser.extract_recipe_nutrition; it is only called with the ingredients the local
+        engine could not convert or match (or the whole recipe if the lookup is unavailable),
+        and its per-serving values are added to the local totals.
+        """
+        try:
+            lookup = self.lookup
+        except ModelNotReadyError as e:
+            print(f"Local recipe nutrition unavailable: {e}")
+            lookup = None
+        if lookup is None:
+            if fallback:
+                return fallback(recipe_data)
+            return {'success': False, 'error': 'Nutrition lookup module not initialized due to missing data directory.'}
+
+        try:
+            calculator = RecipeNutritionCalculator(lookup, workers=Config.NUTRITION_MATCH_WORKERS)
+            per_serving, resolved, unresolved = calculator.calculate(recipe_data)
+        except Exception as e:
+            print(f"Error during local recipe nutrition calculation: {e}")
+            if fallback:
+                return fallback(recipe_data)
+            return {'success': False, 'error': 'An error occurred while calculating recipe nutrition.'}
+
+        source = 'local'
+        if unresolved and fallback:
+            partial = fallback({**recipe_data, 'Ingredients': unresolved})
+            if partial.get('success') and isinstance(partial.get('nutrition'), dict):
+                for key, entry in partial['nutrition'].items():
+                    expected_unit = RECIPE_NUTRIENTS.get(key, (None, None))[1]
+                    if not isinstance(entry, dict) or str(entry.get('unit', '')).lower() != expected_unit:
+                        continue
+                    try:
+                        per_serving[key] += float(entry.get('amount') or 0)
+                    except (TypeError, ValueError):
+                        continue
+                resolved.extend({'ingredient': ing.get('Ingredient'), 'grams': None, 'matched_item': None} for ing in unresolved)
+                unresolved = []
+                source = 'local+gemini' if any(r['matched_item'] for r in resolved) else 'gemini'
+            elif not resolved:
+                return partial
+
+        if not resolved:
+            return {'success': False, 'error': 'Unable to calculate nutritional information for this recipe: no ingredients could be matched.'}
+
+        notes = 'Nutritional values are estimates based on USDA data for the listed ingredient quantities.'
+        unresolved_names = [ing.get('Ingredient') for ing in unresolved]
+        if unresolved_names:
+            notes += f" Not included: {', '.join(str(name) for name in unresolved_names)}."
+        return {
+            'success': True,
+            'nutrition': RecipeNutritionCalculator.format_nutrition(per_serving),
+            'per_serving': True,
+            'notes': notes,
+            'source': source,
+            'unresolved_ingredients': unresolved_names
+        }
@@ -3,6 +3,7 @@ from backend.dao.ingredient_dao import IngredientDAO
 from backend.ai_models.gemini_nlp.gemini_nlp_parser import GeminiNlpParser
 from backend.ai_models.allergy_analyzer.allergy_analyzer import AllergyAnalyzer
 from backend.services.main.tags_service import TagsService
+from backend.services.main.nutrition_service import NutritionService
 from backend.db import db # For transaction management (db.session)
 from backend.models.ingredient import Ingredient # For type checking if needed
 from backend.models.recipe import Recipe # For type checking if needed
@@ -15,6 +16,7 @@ class RecipePipelineService:
         self.allergy_analyzer = AllergyAnalyzer() # Uses sample CSV
         self.gemini_nlp = GeminiNlpParser()
         self.tags_service = TagsService()
+        self.nutrition_service = NutritionService.get_instance()
         
 
     def process_recipe_submission(self, submission_data, user_id):
@@ -73,47 +75,49 @@ class RecipePipelineService:
             if not all(k in recipe_json for k in ["Title", "Instructions", "Ingredients"]):
                 return None, {"error": "Missing required fields in recipe data (Title, Instructions, Ingredients)."}, 400
 
-            # Extract nutritional information using Gemini NLP
-            nutrition_info = self.gemini_nlp.extract_recipe_nutrition(recipe_json)
-
-            enriched_ingredients_for_dao = []
-            processed_ingredient_ids_for_current_recipe = [] 
+            # Calculate nutritional information locally; Gemini only covers unmatched ingredients
+            nutrition_info = self.nutrition_service.get_recipe_nutrition(
+                recipe_json, fallback=self.gemini_nlp.extract_recipe_nutrition
+            )
 
+            named_ingredients = []
             for ing_data in recipe_json["Ingredients"]:
-                ingredient_name = ing_data.get("Ingredient")
-                if not ingredient_name:
+                if not ing_data.get("Ingredient"):
                     print(f"Warning: Ingredient data missing 'Ingredient' name: {ing_data}")
                     continue
+                named_ingredients.append(ing_data)
+            ingredient_names = [ing_data["Ingredient"] for ing_data in named_ingredients]
 
-                ingredient_model = self.ingredient_dao.get_or_create_ingredient(ingredient_name)
-                db.session.flush() 
+            # Resolve every ingredient and its allergies in a few bulk queries instead of several per ingredient
+            ingredient_models = self.ingredient_dao.get_or_create_ingredients(ingredient_names)
+            allergies_by_name = self.allergy_analyzer.analyze_many(ingredient_names)
 
-                tracking_key = ingredient_model.IngredientID if hasattr(ingredient_model, 'IngredientID') and ingredient_model.IngredientID is not None else ingredient_model.Name
-
-                if tracking_key in processed_ingredient_ids_for_current_recipe:
-                    print(f"Skipping duplicate ingredient: {ingredient_name} (tracking key: {tracking_key})")
-                else:
-                    processed_ingredient_ids_for_current_recipe.append(tracking_key)
-                
-                    allergy_names = self.allergy_analyzer.get_allergies(ingredient_name)
-                    for allergy_name in allergy_names:
-                        self.ingredient_dao.add_allergy_to_ingredient(ingredient_model, allergy_name)
+            enriched_ingredients_for_dao = []
+            allergies_by_ingredient = {}
 
+            for ing_data in named_ingredients:
+                ingredient_name = ing_data["Ingredient"]
+                ingredient_model = ingredient_models[ingredient_name]
+                if ingredient_model in allergies_by_ingredient:
+                    print(f"Skipping duplicate ingredient: {ingredient_name} (tracking key: {ingredient_model.IngredientID})")
+                    continue
+                allergies_by_ingredient[ingredient_model] = allergies_by_name[ingredient_name]
 
+                quantity_val = ing_data.get("Quantity")
+                unit_val = ing_data.get("Unit")
 
-                    quantity_val = ing_data.get("Quantity")
-                    unit_val = ing_data.get("Unit")
+                if quantity_val is None:
+                    quantity_val = "1" 
+                if unit_val is None:
+                    unit_val = "Unit" 
 
-                    if quantity_val is None:
-                        quantity_val = "1" 
-                    if unit_val is None:
-                        unit_val = "Unit" 
+                enriched_ingredients_for_dao.append({
+                    'ingredient_model': ingredient_model,
+                    'quantity': quantity_val, 
+                    'unit': unit_val
+                })
 
-                    enriched_ingredients_for_dao.append({
-                        'ingredient_model': ingredient_model,
-                        'quantity': quantity_val, 
-                        'unit': unit_val
-                    })
+            self.ingredient_dao.add_allergies_to_ingredients(allergies_by_ingredient)
 
             if not enriched_ingredients_for_dao:
                  return None, {"error": "No valid ingredients processed."}, 400
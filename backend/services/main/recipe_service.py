@@ -2,6 +2,7 @@ from backend.dao import RecipeDAO, IngredientDAO, RecipeRatingDAO
 from backend.db import db
 from backend.ai_models.allergy_analyzer.allergy_analyzer import AllergyAnalyzer
 from backend.ai_models.gemini_nlp.gemini_nlp_parser import GeminiNlpParser
+from backend.services.main.nutrition_service import NutritionService
 
 class RecipeService:
     def __init__(self):
@@ -10,6 +11,7 @@ class RecipeService:
         self.recipe_rating_dao = RecipeRatingDAO()
         self.allergy_analyzer = AllergyAnalyzer()
         self.gemini_nlp = GeminiNlpParser()
+        self.nutrition_service = NutritionService.get_instance()
 
     def get_public_recipes_summary(self, page=1, limit=12, search_term=None):
         """Fetches a paginated list of public recipes with summary information."""
@@ -113,13 +115,15 @@ class RecipeService:
             
             is_public = data.get('is_public', False)
 
-            # Extract nutritional information using Gemini NLP
+            # Calculate nutritional information locally; Gemini only covers unmatched ingredients
             recipe_for_nutrition = {
                 "Title": data['title'],
                 "Ingredients": [{"Ingredient": ing['name'], "Quantity": ing['quantity'], "Unit": ing['unit']} for ing in data['ingredients']],
                 "Servings": data.get('servings', 1)
             }
-            nutrition_info = self.gemini_nlp.extract_recipe_nutrition(recipe_for_nutrition)
+            nutrition_info = self.nutrition_service.get_recipe_nutrition(
+                recipe_for_nutrition, fallback=self.gemini_nlp.extract_recipe_nutrition
+            )
 
             new_recipe = self.recipe_dao.create_recipe(
                 user_id=user_id,
@@ -155,9 +159,6 @@ class RecipeService:
             if "error" in parsed_recipe:
                 return None, {"error": f"Failed to parse recipe text: {parsed_recipe['error']}"}, 400
 
-            # Extract nutritional information
-            nutrition_info = self.gemini_nlp.extract_recipe_nutrition(parsed_recipe)
-
             # Convert parsed recipe to the format expected by create_recipe
             recipe_data = {
                 'title': parsed_recipe.get('Title', 'Untitled Recipe'),
@@ -1,17 +1,43 @@
-from backend.ai_models.substitution_models import SubstitutionRecommender
 import json
+from backend.config import Config
+from backend.utils.log_monitor import log_monitor
 from backend.utils.logging_utils import log_warning, log_error
+from backend.utils.lru_cache import LRUCache
+from backend.utils.model_loader import model_loader, ModelNotReadyError
+
+SUBSTITUTION_MODEL = 'substitution_recommender'
+
+# Keyed by the lowercased ingredient text; shared by every request through the recommender
+normalize_cache = LRUCache(maxsize=Config.SUBSTITUTION_NORMALIZE_CACHE_SIZE)
+log_monitor.register_metrics_provider('caches', 'substitution_normalization', normalize_cache.stats)
+
+
+def _load_recommender():
+    # Imported here so spaCy is only pulled in by the loader thread, not at app import
+    from backend.ai_models.substitution_models import SubstitutionRecommender
+    recommender = SubstitutionRecommender(normalize_cache=normalize_cache)
+    if not recommender.is_ready():
+        log_warning("Substitution Recommender failed to initialize. Substitute suggestions may be unavailable or limited.", "SubstitutionService")
+    return recommender
+
+
+model_loader.register(SUBSTITUTION_MODEL, _load_recommender, is_available=lambda recommender: recommender.is_ready())
 
 class SubstitutionService:
-    def __init__(self):
-        self.recommender = SubstitutionRecommender()
-        if not self.recommender.is_ready():
-            log_warning("Substitution Recommender failed to initialize. Substitute suggestions may be unavailable or limited.", "SubstitutionService")
+    @property
+    def recommender(self):
+        """The SubstitutionRecommender. Raises ModelNotReadyError while it is still loading."""
+        return model_loader.get(SUBSTITUTION_MODEL, timeout=Config.MODEL_WAIT_TIMEOUT_SECONDS)
 
     def get_substitutes(self, ingredient_name):
         """Returns a list of substitutes for a given ingredient name using SubstitutionRecommender."""
-        
-        if not self.recommender or not self.recommender.is_ready():
+        try:
+            recommender = self.recommender
+        except ModelNotReadyError as e:
+            log_warning(f"Recommender not available for '{ingredient_name}': {e}", "SubstitutionService")
+            return None, {"error": str(e)}, 503
+
+        if not recommender or not recommender.is_ready():
             log_warning(f"Recommender not ready for '{ingredient_name}', returning basic fallback.", "SubstitutionService")
             fallback_subs_recommender_format = [
                 {"name": f"Default Sub 1 for {ingredient_name}", "score": 0.0 },
@@ -20,7 +46,7 @@ class SubstitutionService:
             return fallback_subs_recommender_format, None, 200
 
         try:
-            substitutes_list = self.recommender.get_substitutes(ingredient_name, top_n=3)
+            substitutes_list = recommender.get_substitutes(ingredient_name, top_n=3)
             
             if substitutes_list is None:
                 log_error(f"Recommender returned None for '{ingredient_name}'.", "SubstitutionService")
@@ -33,3 +59,35 @@ class SubstitutionService:
             import traceback
             traceback.print_exc()
             return None, {"error": f"An unexpected error occurred while getting substitutes."}, 500
+
+    def get_substitutes_batch(self, ingredient_names):
+        """
+        Returns substitutes for several ingredients (e.g. a whole recipe), normalized in one batched spaCy call.
+        Output format: ({ingredient_name: [substitutes]}, error_dict, status_code)
+        """
+        if not isinstance(ingredient_names, list) or not ingredient_names:
+            return None, {"error": "'ingredientNames' must be a non-empty list of ingredient names."}, 400
+        if len(ingredient_names) > Config.SUBSTITUTION_BATCH_MAX_ITEMS:
+            return None, {"error": f"At most {Config.SUBSTITUTION_BATCH_MAX_ITEMS} ingredients can be looked up per request."}, 400
+        if not all(isinstance(name, str) and name.strip() for name in ingredient_names):
+            return None, {"error": "Ingredient names must be non-empty strings."}, 400
+
+        try:
+            recommender = self.recommender
+        except ModelNotReadyError as e:
+            log_warning(f"Recommender not available for {len(ingredient_names)} ingredients: {e}", "SubstitutionService")
+            return None, {"error": str(e)}, 503
+
+        if not recommender or not recommender.is_ready():
+            return None, {"error": "Substitution recommender is not available."}, 503
+
+        try:
+            substitutes = recommender.get_substitutes_many(
+                ingredient_names, top_n=3,
+                batch_size=Config.SUBSTITUTION_NLP_BATCH_SIZE, n_process=Config.SUBSTITUTION_NLP_PROCESSES
+            )
+            return substitutes, None, 200
+
+        except Exception as e:
+            log_error(f"Error getting substitutes for {len(ingredient_names)} ingredients - {e}", "SubstitutionService")
+            return None, {"error": "An unexpected error occurred while getting substitutes."}, 500
@@ -0,0 +1,47 @@
+import io
+import os
+from tempfile import SpooledTemporaryFile
+
+from flask import Request
+from PIL import Image
+
+
+def decode_image(source, target_size):
+    """
+    Decodes an uploaded image straight from memory into an RGB PIL image of target_size.
+
+    :param source: Image bytes or a binary file-like object (e.g. FileStorage.stream), read from
+                   its current position.
+    :param target_size: (height, width), as passed to keras load_img.
+
+    JPEGs are decoded in draft mode, which lets libjpeg scale by 1/2, 1/4 or 1/8 while
+    decoding, so a 12 MP photo is never expanded to full resolution just to be shrunk to
+    224x224. The draft keeps the image at least target_size, and the final resize uses
+    nearest-neighbour sampling like load_img.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    height, width = target_size
+    with Image.open(source) as img:
+        img.draft('RGB', (width, height))
+        img = img.convert('RGB')
+    if img.size != (width, height):
+        img = img.resize((width, height), Image.NEAREST)
+    return img
+
+
+def is_image_path(source):
+    """True for file system paths, which are still loaded with keras load_img."""
+    return isinstance(source, (str, os.PathLike))
+
+
+class InMemoryUploadRequest(Request):
+    """
+    Request class that keeps uploaded files in memory up to upload_spool_max_bytes instead of
+    Werkzeug's 500 KB, so image uploads can be decoded from FileStorage.stream without ever
+    being written to a temporary file. Larger uploads still spill to disk.
+    """
+    upload_spool_max_bytes = 16 * 1024 * 1024
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=self.upload_spool_max_bytes, mode='rb+')
@@ -0,0 +1,178 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from backend.utils.logging_utils import log_warning
+from backend.utils.lru_cache import LRUCache
+
+
+def perceptual_hash(img, hash_size=8):
+    """
+    Difference hash (dHash) of a PIL image as a hex string of hash_size * hash_size bits.
+
+    The image is area-averaged down to a (hash_size + 1) x hash_size grayscale thumbnail and
+    each bit records whether a cell is brighter than its right-hand neighbour. Repeat uploads
+    of one photo, and most re-compressions of it, map to one hash where a byte hash of the file
+    would not. It only records the direction of brightness changes, so flat or low-texture
+    images of any colour share a hash; see colour_signature.
+    """
+    thumbnail = img.convert('L').resize((hash_size + 1, hash_size), Image.BOX)
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    return np.packbits(pixels[:, 1:] > pixels[:, :-1]).tobytes().hex()
+
+
+def colour_signature(img, levels=16):
+    """Mean red, green and blue of a PIL image, each quantized to one of levels buckets, as a hex string."""
+    means = np.asarray(img.convert('RGB'), dtype=np.float32).reshape(-1, 3).mean(axis=0)
+    return ''.join(f"{int(mean * levels / 256):x}" for mean in means)
+
+
+class ImageResultCache:
+    """
+    Size-bounded cache of classification results, keyed by classification mode and the
+    perceptual hash and colour signature of the decoded image. Entries are JSON-serializable
+    dicts (top-k predictions, plus the resolved nutrition once ClassificationService has
+    looked it up).
+
+    With a spill_dir, entries evicted from memory are written there as JSON files and moved
+    back into memory when requested again, so the working set can outgrow memory without
+    repeating forward passes. At most spill_max_entries files are kept; the oldest are pruned.
+    """
+
+    def __init__(self, maxsize=512, ttl=None, spill_dir=None, spill_max_entries=10000):
+        """
+        :param maxsize: Entries kept in memory.
+        :param ttl: Optional time-to-live in seconds, applied to memory and disk entries alike.
+        :param spill_dir: Optional directory for entries evicted from memory (created if missing).
+        :param spill_max_entries: Maximum number of files kept in spill_dir.
+        """
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        self.spill_max_entries = spill_max_entries
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl, on_evict=self._spill if spill_dir else None)
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.spills = 0
+        self._disk_entries = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._disk_entries = len(self._spill_files())
+
+    def key(self, mode, img):
+        """
+        Cache key for a decoded PIL image classified in the given mode: its perceptual hash plus
+        its colour signature, so two images only share an entry when both their brightness
+        structure and their average colour match. Images differing in neither (e.g. two plain
+        plates of similar colour) can still collide; a copy whose hash has a near-tie between
+        two cells, or whose mean colour sits on a bucket edge, misses and costs one forward pass.
+        """
+        return f"{mode}:{perceptual_hash(img)}{colour_signature(img)}"
+
+    def get(self, key):
+        entry = self.memory.get(key)
+        if entry is not None or not self.spill_dir:
+            return entry
+
+        path = self._spill_path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.remove(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log_warning(f"Unreadable spilled classification entry '{path}' - {e}", "ImageResultCache")
+            return None
+        with self._lock:
+            self._disk_entries -= 1
+        if self.ttl is not None and entry.get('cached_at', 0) + self.ttl <= time.time():
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self.memory.put(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        entry.setdefault('cached_at', time.time())
+        self.memory.put(key, entry)
+
+    def clear(self):
+        self.memory.clear()
+        if self.spill_dir:
+            for path in self._spill_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        with self._lock:
+            self._disk_entries = 0
+
+    def stats(self):
+        memory_stats = self.memory.stats()
+        with self._lock:
+            disk_hits = self.disk_hits
+            stats = {
+                **memory_stats,
+                'memory_hit_ratio': memory_stats['hit_ratio'],
+                'disk_hits': disk_hits,
+                'spills': self.spills,
+                'disk_entries': self._disk_entries,
+                'spill_dir': self.spill_dir,
+            }
+        # A disk hit is first counted as a memory miss, so the overall ratio adds them back in
+        lookups = memory_stats['hits'] + memory_stats['misses']
+        stats['hit_ratio'] = round((memory_stats['hits'] + disk_hits) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, key.replace(':', '-') + '.json')
+
+    def _spill_files(self):
+        return [os.path.join(self.spill_dir, name) for name in os.listdir(self.spill_dir) if name.endswith('.json')]
+
+    def _spill(self, key, entry):
+        path = self._spill_path(key)
+        existed = os.path.exists(path)
+        try:
+            # Written to a temporary file and renamed, so a concurrent get never reads a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.spill_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            log_warning(f"Could not spill classification entry '{key}' - {e}", "ImageResultCache")
+            return
+
+        with self._lock:
+            self.spills += 1
+            if not existed:
+                self._disk_entries += 1
+            prune = self._disk_entries > self.spill_max_entries
+        if prune:
+            self._prune()
+
+    def _prune(self):
+        """Removes the oldest spilled entries, down to 90% of spill_max_entries."""
+        def mtime(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0
+
+        files = sorted(self._spill_files(), key=mtime)
+        excess = len(files) - int(self.spill_max_entries * 0.9)
+        removed = 0
+        for path in files[:max(excess, 0)]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_entries = len(files) - removed
@@ -0,0 +1,416 @@
+import atexit
+import collections
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from backend.utils.image_decode import decode_image
+from backend.utils.logging_utils import log_info, log_success, log_warning, log_error
+
+
+WORKER_PROCESS_PREFIX = 'inference-worker'
+
+
+def in_inference_worker():
+    """
+    True inside an InferencePool worker, including while spawn re-imports the parent's __main__
+    module there, so a script that starts the pool at import time (app.py) can skip doing so.
+    """
+    return multiprocessing.current_process().name.startswith(WORKER_PROCESS_PREFIX)
+
+
+class InferenceWorkerError(RuntimeError):
+    """Raised for a request whose inference worker crashed, hung or shut down before answering."""
+
+
+def _worker_main(index, factories, requests, results, threads):
+    """
+    Entry point of a spawned inference worker. The model factories run here, so TensorFlow is
+    only ever imported in worker processes. Requests are handed to a thread pool, so concurrent
+    ones still meet in the classifier's micro-batcher; pings are answered by the receiving loop.
+    """
+    try:
+        models = {name: factory() for name, factory in factories.items()}
+    except Exception as e:
+        results.put(('failed', f"{type(e).__name__}: {e}"))
+        return
+    results.put(('ready', {
+        name: {
+            'loaded': bool(model.is_model_loaded()),
+            'image_size': tuple(getattr(model, 'image_size', None) or getattr(model, 'img_size', None) or (224, 224)),
+        } for name, model in models.items()
+    }))
+
+    def run(request_id, name, method, pixels, kwargs):
+        try:
+            output = getattr(models[name], method)(Image.fromarray(pixels), **kwargs)
+            results.put(('result', request_id, True, output))
+        except Exception as e:
+            results.put(('result', request_id, False, f"{type(e).__name__}: {e}"))
+
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix=f"inference-{index}")
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        if message[0] == 'ping':
+            batching = {name: model.batcher.stats() for name, model in models.items() if getattr(model, 'batcher', None)}
+            results.put(('pong', batching))
+        else:
+            executor.submit(run, *message[1:])
+    executor.shutdown(wait=True)
+
+
+class _Worker:
+    """Parent-side state of one worker slot. The process and its queues are replaced on restart."""
+
+    def __init__(self, index):
+        self.index = index
+        self.process = None
+        self.requests = None
+        self.results = None
+        self.pending = {}
+        self.ready = False
+        self.started_at = None
+        self.last_reply = None
+        self.last_result = None
+        self.ping_sent_at = None
+        self.next_start = 0.0
+        self.backoff = 0.0
+        self.restarts = 0
+        self.completed = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.recent = collections.deque()
+        self.batching = {}
+
+
+class InferencePool:
+    """
+    Runs model inference in N spawned worker processes, each loading every model once, so
+    TensorFlow never shares the GIL or cores with the Flask request threads.
+
+    Requests go to the worker with the fewest outstanding requests over a per-worker
+    multiprocessing queue; a collector thread per worker resolves the callers' Futures.
+    A monitor thread health-checks the workers every health_interval seconds. A worker that
+    exited, took longer than startup_timeout to load, or went hang_timeout seconds without
+    answering a ping or returning any of its outstanding requests is killed and restarted (with
+    backoff if it keeps dying before it is ready); the requests it held fail with
+    InferenceWorkerError.
+    """
+
+    THROUGHPUT_WINDOW_SECONDS = 60.0
+
+    def __init__(self, factories, workers=2, threads_per_worker=16, hang_timeout=60.0, startup_timeout=300.0,
+                 health_interval=5.0, name='inference'):
+        """
+        :param factories: {model name: module-level function returning the loaded model}. Functions are
+                          pickled by reference, so they must be importable in the spawned workers.
+        :param workers: Number of worker processes.
+        :param threads_per_worker: Requests a worker runs concurrently.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer")
+        self.factories = dict(factories)
+        self.threads_per_worker = threads_per_worker
+        self.hang_timeout = hang_timeout
+        self.startup_timeout = startup_timeout
+        self.health_interval = health_interval
+        self.name = name
+        self.models = {}
+        self._context = multiprocessing.get_context('spawn')
+        self._workers = [_Worker(i) for i in range(workers)]
+        self._lock = threading.Lock()
+        self._any_ready = threading.Event()
+        self._stopped = threading.Event()
+        self._ids = itertools.count()
+        self._monitor = None
+
+    def start(self):
+        for worker in self._workers:
+            self._spawn(worker)
+        self._monitor = threading.Thread(target=self._monitor_loop, name=f"{self.name}-monitor", daemon=True)
+        self._monitor.start()
+        atexit.register(self.close)
+        log_info(f"Started {len(self._workers)} inference workers for {', '.join(self.factories)}", "InferencePool")
+        return self
+
+    def wait_ready(self, timeout=None):
+        """Waits until at least one worker has loaded its models; returns False on timeout."""
+        return self._any_ready.wait(timeout)
+
+    def submit(self, model, method, pixels, **kwargs):
+        """
+        Queues getattr(model, method)(image, **kwargs) for a worker, where image is the uint8 RGB
+        array pixels as a PIL image, and returns a Future for the (picklable) result.
+        """
+        future = Future()
+        with self._lock:
+            if self._stopped.is_set():
+                raise InferenceWorkerError("Inference pool is shut down")
+            running = [w for w in self._workers if w.process is not None]
+            candidates = [w for w in running if w.ready] or running
+            if not candidates:
+                future.set_exception(InferenceWorkerError("No inference worker is running"))
+                return future
+            worker = min(candidates, key=lambda w: len(w.pending))
+            request_id = next(self._ids)
+            worker.pending[request_id] = (future, time.monotonic())
+            worker.requests.put(('predict', request_id, model, method, pixels, kwargs))
+        return future
+
+    def close(self):
+        """
+        Asks every worker to finish its outstanding requests and exit, waiting up to 5 seconds
+        each while the collectors keep resolving results; requests still unanswered then fail.
+        """
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        with self._lock:
+            processes = [worker.process for worker in self._workers]
+            for worker in self._workers:
+                if worker.process is not None:
+                    worker.requests.put(None)
+        for process in processes:
+            if process is not None:
+                process.join(5)
+        failed = []
+        for worker in self._workers:
+            with self._lock:
+                process, pending = self._detach(worker)
+            self._terminate(process)
+            failed.extend(pending)
+        self._fail(failed, "Inference pool is shut down")
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            workers = []
+            for worker in self._workers:
+                while worker.recent and worker.recent[0] < now - self.THROUGHPUT_WINDOW_SECONDS:
+                    worker.recent.popleft()
+                uptime = now - worker.started_at if worker.process is not None else 0.0
+                window = min(self.THROUGHPUT_WINDOW_SECONDS, uptime) or 1.0
+                workers.append({
+                    'pid': worker.process.pid if worker.process is not None else None,
+                    'alive': worker.process is not None and worker.process.is_alive(),
+                    'ready': worker.ready,
+                    'restarts': worker.restarts,
+                    'queue_depth': len(worker.pending),
+                    'completed': worker.completed,
+                    'errors': worker.errors,
+                    'throughput_per_s': round(len(worker.recent) / window, 3),
+                    'avg_latency_ms': round(worker.latency_total / worker.completed * 1000, 2) if worker.completed else None,
+                    'uptime_s': round(uptime, 1),
+                    'last_reply_age_s': round(now - worker.last_reply, 1) if worker.last_reply is not None else None,
+                    'batching': worker.batching,
+                })
+        return {
+            'workers': len(workers),
+            'ready_workers': sum(1 for w in workers if w['ready']),
+            'queue_depth': sum(w['queue_depth'] for w in workers),
+            'completed': sum(w['completed'] for w in workers),
+            'restarts': sum(w['restarts'] for w in workers),
+            'per_worker': workers,
+        }
+
+    def _spawn(self, worker):
+        """Starts a process for an empty worker slot. Called without the lock held, as start() can block."""
+        requests = self._context.Queue()
+        results = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main, name=f"{WORKER_PROCESS_PREFIX}-{self.name}-{worker.index}", daemon=True,
+            args=(worker.index, self.factories, requests, results, self.threads_per_worker)
+        )
+        process.start()
+        with self._lock:
+            attached = not self._stopped.is_set() and worker.process is None
+            if attached:
+                worker.requests = requests
+                worker.results = results
+                worker.process = process
+                worker.ready = False
+                worker.started_at = worker.last_reply = worker.last_result = time.monotonic()
+                worker.ping_sent_at = None
+        if not attached:
+            self._terminate(process)
+            return
+        threading.Thread(target=self._collect, args=(worker, process, results),
+                         name=f"{self.name}-collector-{worker.index}", daemon=True).start()
+
+    @staticmethod
+    def _detach(worker):
+        """Takes the worker's process and outstanding futures out of its slot; called with the lock held."""
+        process = worker.process
+        worker.process = None
+        worker.ready = False
+        failed = [future for future, _ in worker.pending.values()]
+        worker.pending = {}
+        return process, failed
+
+    @staticmethod
+    def _terminate(process):
+        """Kills a detached process if it is still running; called without the lock held."""
+        if process is not None and process.is_alive():
+            process.kill()
+            process.join(5)
+
+    @staticmethod
+    def _fail(futures, message):
+        for future in futures:
+            if not future.done():
+                future.set_exception(InferenceWorkerError(message))
+
+    def _collect(self, worker, process, results):
+        while True:
+            try:
+                message = results.get(timeout=1.0)
+            except queue.Empty:
+                if worker.process is not process or not process.is_alive():
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+
+            resolved = None
+            with self._lock:
+                if worker.process is not process:
+                    return
+                now = time.monotonic()
+                worker.last_reply = now
+                kind = message[0]
+                if kind != 'pong':
+                    worker.last_result = now
+                if kind == 'ready':
+                    worker.ready = True
+                    worker.backoff = 0.0
+                    self.models.update(message[1])
+                elif kind == 'pong':
+                    worker.ping_sent_at = None
+                    worker.batching = message[1]
+                elif kind == 'result':
+                    _, request_id, ok, payload = message
+                    entry = worker.pending.pop(request_id, None)
+                    if entry is not None:
+                        future, sent_at = entry
+                        worker.completed += 1
+                        worker.errors += 0 if ok else 1
+                        worker.latency_total += now - sent_at
+                        worker.recent.append(now)
+                        resolved = (future, ok, payload)
+
+            if kind == 'ready':
+                self._any_ready.set()
+                log_success(f"Inference worker {worker.index} (pid {process.pid}) ready in "
+                            f"{time.monotonic() - worker.started_at:.1f}s", "InferencePool")
+            elif kind == 'failed':
+                log_error(f"Inference worker {worker.index} failed to load its models: {message[1]}", "InferencePool")
+            elif resolved is not None and not resolved[0].done():
+                future, ok, payload = resolved
+                if ok:
+                    future.set_result(payload)
+                else:
+                    future.set_exception(InferenceWorkerError(payload))
+
+    def _check(self, worker, now):
+        """
+        Health-checks one worker with the lock held. If it has to be restarted, detaches it and
+        returns (process to kill, futures to fail, reason); otherwise (None, [], None).
+        """
+        if worker.process is None:
+            return None, [], None
+
+        if not worker.process.is_alive():
+            reason = f"exited with code {worker.process.exitcode}"
+        elif not worker.ready:
+            reason = f"did not load its models within {self.startup_timeout:.0f}s" \
+                if now - worker.started_at > self.startup_timeout else None
+        else:
+            # Pings are answered by the worker's receiving loop, so a model call stuck in one of its
+            # threads only shows as requests outstanding without any result coming back
+            oldest_request = min((sent_at for _, sent_at in worker.pending.values()), default=None)
+            if worker.ping_sent_at is not None and now - worker.ping_sent_at > self.hang_timeout:
+                reason = f"did not answer a ping for {self.hang_timeout:.0f}s"
+            elif oldest_request is not None and now - max(oldest_request, worker.last_result) > self.hang_timeout:
+                reason = f"returned no result for {self.hang_timeout:.0f}s"
+            else:
+                reason = None
+                if worker.ping_sent_at is None:
+                    worker.ping_sent_at = now
+                    worker.requests.put(('ping',))
+        if reason is None:
+            return None, [], None
+
+        # A worker that dies before it is ready (e.g. a bad model file) is restarted with backoff
+        worker.backoff = min(max(worker.backoff * 2, 1.0), 60.0) if not worker.ready else 0.0
+        worker.next_start = now + worker.backoff
+        worker.restarts += 1
+        pid = worker.process.pid
+        process, failed = self._detach(worker)
+        return process, failed, f"Inference worker {worker.index} (pid {pid}) {reason}"
+
+    def _monitor_loop(self):
+        while not self._stopped.wait(self.health_interval):
+            for worker in self._workers:
+                with self._lock:
+                    if self._stopped.is_set():
+                        return
+                    process, failed, reason = self._check(worker, time.monotonic())
+                    respawn = worker.process is None and time.monotonic() >= worker.next_start
+                # Killing, joining and starting processes can take seconds, so submit() and the
+                # collectors are not kept waiting on the lock meanwhile
+                self._terminate(process)
+                if reason:
+                    log_warning(f"{reason}; restarting it ({len(failed)} requests failed)", "InferencePool")
+                    self._fail(failed, reason)
+                if respawn:
+                    self._spawn(worker)
+
+
+class RemoteClassifier:
+    """
+    API-process stand-in for a classifier loaded in an InferencePool's workers, with the methods
+    ClassificationService and FoodChatbot use. Images are decoded and resized here, then sent to
+    a worker as uint8 pixels; no TensorFlow is imported on this side.
+    """
+
+    def __init__(self, pool, name, timeout=30.0):
+        self.pool = pool
+        self.name = name
+        self.timeout = timeout
+
+    def is_model_loaded(self):
+        return self.pool.models.get(self.name, {}).get('loaded', False)
+
+    @property
+    def image_size(self):
+        return self.pool.models.get(self.name, {}).get('image_size', (224, 224))
+
+    def load_image(self, image_source):
+        """Decodes image_source (path, bytes or binary file-like object) into an RGB PIL image of image_size."""
+        if isinstance(image_source, (str, os.PathLike)):
+            with open(image_source, 'rb') as f:
+                return decode_image(f, self.image_size)
+        return decode_image(image_source, self.image_size)
+
+    def _predict(self, method, image_source, top_k):
+        image = image_source if isinstance(image_source, Image.Image) else self.load_image(image_source)
+        try:
+            return self.pool.submit(self.name, method, np.asarray(image, dtype=np.uint8), top_k=top_k).result(self.timeout)
+        except Exception as e:
+            log_error(f"Remote {method} on '{self.name}' failed - {e}", "InferencePool")
+            return []
+
+    def predict_food(self, img_source, top_k=3):
+        return self._predict('predict_food', img_source, top_k)
+
+    def predict_ingredient(self, img_source, top_k=3):
+        return self._predict('predict_ingredient', img_source, top_k)
@@ -7,7 +7,7 @@ import psutil
 import os
 from datetime import datetime
 from flask import Flask
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any
 
 class LogMonitor:
     """Real-time log monitoring with system metrics."""
@@ -18,6 +18,7 @@ class LogMonitor:
         self.system_metrics = {}
         self.flask_logs = []
         self.max_logs = 500  # Keep last 500 logs
+        self.metrics_providers = {}
         self._setup_logging()
         self._start_system_monitor()
     
@@ -79,8 +80,18 @@ class LogMonitor:
         return self.flask_logs[-limit:] if self.flask_logs else []
     
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics."""
-        return self.system_metrics
+        """Get current system metrics, including sections from registered providers."""
+        metrics = dict(self.system_metrics)
+        for (section, name), provider in list(self.metrics_providers.items()):
+            try:
+                metrics.setdefault(section, {})[name] = provider()
+            except Exception as e:
+                print(f"Error collecting '{section}.{name}' metrics: {e}")
+        return metrics
+
+    def register_metrics_provider(self, section: str, name: str, provider: Callable[[], Dict[str, Any]]):
+        """Register a callable whose result is reported under metrics[section][name] (e.g. cache stats)."""
+        self.metrics_providers[(section, name)] = provider
     
     def add_client(self, client_id: str):
         """Add SSE client."""
@@ -78,16 +78,17 @@ def suppress_external_warnings():
     # Turn off oneDNN custom operations messages
     os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
     
-    # Suppress TensorFlow Python logs
-    import tensorflow as tf
-    tf.get_logger().setLevel('WARNING')  # Changed from ERROR to WARNING to keep error messages
+    # Suppress TensorFlow Python logs. tf.get_logger() is this logger; configuring it by name
+    # avoids importing TensorFlow here, which would block startup before models load in the background.
+    logging.getLogger('tensorflow').setLevel('WARNING')  # Changed from ERROR to WARNING to keep error messages
     
     # Suppress other warnings
     import warnings
     warnings.filterwarnings('ignore', category=DeprecationWarning)
     warnings.filterwarnings('ignore', category=FutureWarning)
-    
-    # Suppress Keras warnings specifically if needed
+
+def disable_keras_interactive_logging():
+    """Suppresses Keras progress bars; call where TensorFlow is already being imported (model loading)."""
     try:
         from tf_keras.src.utils import io_utils
         io_utils.disable_interactive_logging()
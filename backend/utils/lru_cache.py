@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache with an optional per-entry TTL and hit/miss counters."""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic, on_evict=None):
+        """
+        :param maxsize: Maximum number of entries; the least recently used entry is evicted beyond this.
+        :param ttl: Optional time-to-live in seconds. Expired entries are treated as misses.
+        :param clock: Monotonic time source, injectable for tests.
+        :param on_evict: Optional callable(key, value), called outside the lock for each entry
+                         evicted for size (not for expired or cleared entries).
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        evicted = []
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False))
+                self.evictions += 1
+        if self._on_evict is not None:
+            for evicted_key, (evicted_value, _) in evicted:
+                self._on_evict(evicted_key, evicted_value)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from backend.utils.logging_utils import log_error
+
+
+class MicroBatcher:
+    """
+    Groups concurrent inference requests into batched model calls.
+
+    Callers submit arrays with a leading batch dimension (usually a single preprocessed
+    image) and get a Future. A worker thread takes the first waiting request, collects
+    more until it has max_batch_size rows or max_wait_ms has passed, runs predict_batch
+    once on the concatenated rows and hands each caller its slice of the output.
+    If predict_batch raises, every request in that batch gets the exception.
+    """
+
+    def __init__(self, predict_batch: Callable[[np.ndarray], np.ndarray], max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0, name: str = 'model'):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be a positive integer")
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+        self.errors = 0
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name=f"batcher-{self.name}", daemon=True)
+                    self._worker.start()
+
+    def submit(self, inputs: np.ndarray) -> Future:
+        """Queues inputs (shape (n, ...)) and returns a Future for the n output rows."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((inputs, future))
+        return future
+
+    def predict(self, inputs: np.ndarray, timeout: Optional[float] = None) -> np.ndarray:
+        """Submits inputs and waits for their output rows."""
+        return self.submit(inputs).result(timeout)
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        rows = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(request)
+            rows += len(request[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = [(inputs, future) for inputs, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not pending:
+                continue
+            rows = sum(len(inputs) for inputs, _ in pending)
+            try:
+                batch = pending[0][0] if len(pending) == 1 else np.concatenate([inputs for inputs, _ in pending])
+                outputs = self.predict_batch(batch)
+                start = 0
+                for inputs, future in pending:
+                    future.set_result(outputs[start:start + len(inputs)])
+                    start += len(inputs)
+            except Exception as e:
+                self.errors += 1
+                log_error(f"Batch of {rows} for '{self.name}' failed: {e}", "MicroBatcher")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
+            self.requests += len(pending)
+            self.batches += 1
+            self.rows += rows
+            self.largest_batch = max(self.largest_batch, rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': round(self.rows / self.batches, 2) if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'queued': self._queue.qsize(),
+            'errors': self.errors,
+        }
@@ -0,0 +1,217 @@
+"""
+Read-only tables stored as .npy files and memory-mapped by every worker process.
+
+A worker that parses a CSV into Python objects (DataFrames, dicts, lists of str)
+holds a private copy of the data. Arrays opened with mmap_mode='r' are backed by
+the OS page cache instead, so all gunicorn workers on a host share one physical
+copy, whether they were forked from a preloaded master or started separately.
+Strings are kept in a StringTable: one UTF-8 byte blob plus an offsets array,
+decoded an entry at a time when accessed.
+
+An artifact is a directory named after a fingerprint of its source files (name,
+size and mtime) and a versioned salt. It is staged in a temporary directory and
+renamed into place, so concurrent workers never observe a partial artifact.
+ArtifactCache binds that layout to one kind of source (e.g. a CSV file or a
+folder of CSVs) for the modules that cache their parsed tables.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class StringTable(Sequence):
+    """
+    Immutable sequence of strings backed by a uint8 blob and int64 offsets;
+    entry i is blob[offsets[i]:offsets[i + 1]]. Works with bisect when sorted.
+    """
+
+    __slots__ = ('blob', 'offsets', '_buffer')
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+        self._buffer = memoryview(blob)
+
+    @classmethod
+    def from_strings(cls, values):
+        encoded = [str(value).encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('StringTable index out of range')
+        return str(self._buffer[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def __iter__(self):
+        data = self._buffer.tobytes()
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end].decode('utf-8')
+
+
+def source_fingerprint(paths, salt):
+    """Returns a hex digest identifying the current source files, or None if any is missing."""
+    digest = hashlib.sha256(salt.encode('utf-8'))
+    for path in paths:
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        digest.update(f"|{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def load_artifact(cache_root, fingerprint, version, numeric_tables, string_tables, mmap=True, label='table cache'):
+    """
+    Loads the artifact published for fingerprint.
+    Returns a dict of numpy arrays and StringTables, or None if no valid artifact exists.
+    """
+    artifact_dir = os.path.join(cache_root, fingerprint)
+    manifest_path = os.path.join(artifact_dir, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != version or manifest.get('fingerprint') != fingerprint:
+            return None
+
+        mmap_mode = 'r' if mmap else None
+        tables = {}
+        for name in numeric_tables:
+            tables[name] = np.load(os.path.join(artifact_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in string_tables:
+            blob = np.load(os.path.join(artifact_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+            offsets = np.load(os.path.join(artifact_dir, f"{name}.offsets.npy"), mmap_mode=mmap_mode)
+            if len(offsets) != manifest['string_counts'][name] + 1 or offsets[-1] != len(blob):
+                raise ValueError(f"String table '{name}' is corrupt")
+            tables[name] = StringTable(blob, offsets)
+        return tables
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: Ignoring unreadable {label} at {artifact_dir}: {e}")
+        return None
+
+
+def save_artifact(cache_root, fingerprint, version, tables, numeric_tables, string_tables,
+                  manifest_extra=None, label='table cache'):
+    """
+    Writes tables as the artifact for fingerprint and removes stale artifacts in cache_root.
+    String tables may be given as StringTables or as lists of str.
+    Returns the artifact directory, or None if it could not be written.
+    """
+    artifact_dir = os.path.join(cache_root, fingerprint)
+    try:
+        os.makedirs(cache_root, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=f".{fingerprint}-", dir=cache_root)
+
+        string_counts = {}
+        for name in numeric_tables:
+            np.save(os.path.join(staging_dir, f"{name}.npy"), np.ascontiguousarray(tables[name]))
+        for name in string_tables:
+            table = tables[name]
+            if not isinstance(table, StringTable):
+                table = StringTable.from_strings(table)
+            np.save(os.path.join(staging_dir, f"{name}.npy"), np.ascontiguousarray(table.blob))
+            np.save(os.path.join(staging_dir, f"{name}.offsets.npy"), np.ascontiguousarray(table.offsets))
+            string_counts[name] = len(table)
+
+        with open(os.path.join(staging_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': version,
+                'fingerprint': fingerprint,
+                **(manifest_extra or {}),
+                'string_counts': string_counts
+            }, f, indent=2)
+
+        try:
+            os.rename(staging_dir, artifact_dir)
+        except OSError:
+            # Another worker published the same artifact first.
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        for entry in os.listdir(cache_root):
+            # Dot-prefixed entries are other workers' in-progress staging directories.
+            if entry != fingerprint and not entry.startswith('.'):
+                shutil.rmtree(os.path.join(cache_root, entry), ignore_errors=True)
+        return artifact_dir
+    except OSError as e:
+        print(f"Warning: Could not write {label} to {cache_root}: {e}")
+        return None
+
+
+def csv_cache_root(csv_path, cache_dir_name):
+    """'<csv dir>/<cache_dir_name>/<csv name>', the cache root for tables built from one CSV."""
+    csv_name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), cache_dir_name, csv_name)
+
+
+class ArtifactCache:
+    """
+    Loads and saves the artifacts of one kind of table set. Every method takes the source
+    the tables are built from, which source_paths maps to the files to fingerprint and
+    default_root to the cache directory used when no cache_root is given.
+    """
+
+    def __init__(self, label, version, numeric_tables, string_tables, salt, source_paths, default_root,
+                 manifest_extra=None):
+        """
+        :param label: Name used in warnings, e.g. 'nutrition cache'.
+        :param version: Layout version stored in each manifest; part of salt as well.
+        :param salt: Fingerprint salt; changing it invalidates existing artifacts.
+        :param source_paths: source -> list of file paths the tables are built from.
+        :param default_root: source -> default cache root directory.
+        :param manifest_extra: Optional source -> dict of extra manifest fields.
+        """
+        self.label = label
+        self.version = version
+        self.numeric_tables = tuple(numeric_tables)
+        self.string_tables = tuple(string_tables)
+        self.salt = salt
+        self.source_paths = source_paths
+        self.default_root = default_root
+        self.manifest_extra = manifest_extra
+
+    def source_fingerprint(self, source):
+        """Returns a hex digest identifying the current source files, or None if any is missing."""
+        return source_fingerprint(self.source_paths(source), self.salt)
+
+    def default_cache_root(self, source):
+        return self.default_root(source)
+
+    def load_tables(self, source, cache_root=None, mmap=True):
+        """
+        Loads the cached tables for the current source files.
+        Returns a dict of numpy arrays and StringTables, or None if no valid artifact exists.
+        """
+        fingerprint = self.source_fingerprint(source)
+        if fingerprint is None:
+            return None
+        return load_artifact(cache_root or self.default_root(source), fingerprint, self.version,
+                             self.numeric_tables, self.string_tables, mmap=mmap, label=self.label)
+
+    def save_tables(self, source, tables, cache_root=None):
+        """
+        Writes tables as a new artifact for the current source files and removes stale ones.
+        Returns the artifact directory, or None if the cache could not be written.
+        """
+        fingerprint = self.source_fingerprint(source)
+        if fingerprint is None:
+            return None
+        return save_artifact(cache_root or self.default_root(source), fingerprint, self.version, tables,
+                             self.numeric_tables, self.string_tables,
+                             manifest_extra=self.manifest_extra(source) if self.manifest_extra else None,
+                             label=self.label)
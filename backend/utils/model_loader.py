@@ -0,0 +1,163 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from backend.utils.logging_utils import log_info, log_success, log_warning, log_error
+
+
+class ModelNotReadyError(RuntimeError):
+    """Raised when a model is requested before it finished loading, or after it failed to load."""
+
+    def __init__(self, name: str, state: str, error: Optional[str] = None):
+        self.name = name
+        self.state = state
+        self.error = error
+        if state == ModelLoader.FAILED:
+            message = f"Model '{name}' failed to load: {error}"
+        else:
+            message = f"Model '{name}' is still loading. Please try again shortly."
+        super().__init__(message)
+
+
+class _ModelEntry:
+    def __init__(self, name: str, factory: Callable[[], Any], is_available: Optional[Callable[[Any], bool]]):
+        self.name = name
+        self.factory = factory
+        self.is_available = is_available
+        self.state = ModelLoader.PENDING
+        self.value = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+
+class ModelLoader:
+    """
+    Loads heavy models (TensorFlow classifiers, spaCy pipelines, nutrition tables) in background
+    threads so the app can serve requests while they warm up. Each registered model moves through
+    pending -> loading -> ready | degraded | failed; 'degraded' means the factory returned an object
+    that reports itself unusable (e.g. a classifier whose .keras file is missing), which callers
+    already handle with their own fallbacks.
+    """
+
+    PENDING = 'pending'
+    LOADING = 'loading'
+    READY = 'ready'
+    DEGRADED = 'degraded'
+    FAILED = 'failed'
+
+    def __init__(self):
+        self._models: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any], is_available: Optional[Callable[[Any], bool]] = None):
+        """Registers a model factory. Registering an existing name is a no-op, so modules can share models."""
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = _ModelEntry(name, factory, is_available)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._models
+
+    def _claim(self, entry: _ModelEntry) -> bool:
+        with self._lock:
+            if entry.state != self.PENDING:
+                return False
+            entry.state = self.LOADING
+            entry.started_at = time.time()
+            return True
+
+    def _load(self, entry: _ModelEntry):
+        log_info(f"Loading model '{entry.name}'...", "ModelLoader")
+        try:
+            value = entry.factory()
+            available = entry.is_available(value) if entry.is_available else True
+            entry.value = value
+            entry.state = self.READY if available else self.DEGRADED
+        except Exception as e:
+            entry.error = str(e)
+            entry.state = self.FAILED
+        entry.finished_at = time.time()
+        entry.done.set()
+
+        elapsed = entry.finished_at - entry.started_at
+        if entry.state == self.READY:
+            log_success(f"Model '{entry.name}' ready in {elapsed:.2f}s", "ModelLoader")
+        elif entry.state == self.DEGRADED:
+            log_warning(f"Model '{entry.name}' loaded in {elapsed:.2f}s but reports itself unavailable", "ModelLoader")
+        else:
+            log_error(f"Model '{entry.name}' failed to load after {elapsed:.2f}s: {entry.error}", "ModelLoader")
+
+    def start(self, *names: str):
+        """Starts background loading of the named models (all registered models if none are named)."""
+        entries = [self._models[name] for name in names] if names else list(self._models.values())
+        for entry in entries:
+            if self._claim(entry):
+                threading.Thread(target=self._load, args=(entry,), name=f"model-loader-{entry.name}", daemon=True).start()
+
+    def load_all(self):
+        """Loads every registered model in the calling thread (the blocking startup behaviour)."""
+        for entry in list(self._models.values()):
+            if self._claim(entry):
+                self._load(entry)
+
+    def get(self, name: str, timeout: Optional[float] = None):
+        """
+        Returns the loaded model, waiting up to 'timeout' seconds (forever if None) for it to finish.
+        A model that was never started is started in the background and waited for like any other,
+        or, with no timeout, loaded in the calling thread, so scripts and tests that do not run the
+        app startup still work.
+        Raises ModelNotReadyError if the model is still loading at the deadline or failed to load.
+        """
+        entry = self._models.get(name)
+        if entry is None:
+            raise KeyError(f"Model '{name}' is not registered")
+
+        if timeout is None and self._claim(entry):
+            self._load(entry)
+        else:
+            self.start(name)
+        if not entry.done.wait(timeout):
+            raise ModelNotReadyError(name, entry.state)
+
+        if entry.state == self.FAILED:
+            raise ModelNotReadyError(name, entry.state, entry.error)
+        return entry.value
+
+    def is_ready(self, name: str) -> bool:
+        entry = self._models.get(name)
+        return entry is not None and entry.state in (self.READY, self.DEGRADED)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        status = {}
+        for name, entry in list(self._models.items()):
+            if entry.finished_at is not None:
+                load_seconds = round(entry.finished_at - entry.started_at, 3)
+            elif entry.started_at is not None:
+                load_seconds = round(time.time() - entry.started_at, 3)
+            else:
+                load_seconds = None
+            status[name] = {'state': entry.state, 'load_seconds': load_seconds}
+            if entry.error:
+                status[name]['error'] = entry.error
+        return status
+
+    def all_loaded(self) -> bool:
+        """True once every model has finished loading, whether it ended ready, degraded or failed."""
+        return all(entry.done.is_set() for entry in list(self._models.values()))
+
+    def overall_state(self) -> str:
+        """
+        Summarises all models: FAILED if any failed, else LOADING while any is pending or loading,
+        else DEGRADED if any is degraded, else READY.
+        """
+        states = {entry.state for entry in list(self._models.values())}
+        for state in (self.FAILED, self.PENDING, self.LOADING, self.DEGRADED):
+            if state in states:
+                return self.LOADING if state == self.PENDING else state
+        return self.READY
+
+
+# Global model loader instance
+model_loader = ModelLoader()
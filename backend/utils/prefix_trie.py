@@ -0,0 +1,108 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ('label', 'children', 'top')
+
+    def __init__(self, label: str, children: Optional[Dict[str, '_Node']] = None, top: Optional[List[str]] = None):
+        self.label = label
+        self.children = children if children is not None else {}
+        self.top = top if top is not None else []
+
+
+class PrefixTrie:
+    """
+    Thread-safe, frequency-weighted prefix trie for autocomplete.
+
+    Edges are path-compressed (radix trie), so single-child chains cost one node.
+    Every node keeps the keys of its max_k heaviest completions, which makes a
+    query a walk down the prefix plus a slice. Weights only ever grow, so the
+    per-node lists stay exact as terms are added incrementally.
+    Keys are lowercased with whitespace collapsed; the first spelling seen is the
+    one returned.
+    """
+
+    def __init__(self, max_k: int = 10):
+        self.max_k = max_k
+        self._root = _Node('')
+        self._weights: Dict[str, float] = {}
+        self._display: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(term: str) -> str:
+        return ' '.join(str(term).lower().split())
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def __contains__(self, term) -> bool:
+        return self.normalize(term) in self._weights
+
+    def _rank(self, key: str):
+        return -self._weights[key], key
+
+    def _promote(self, node: _Node, key: str):
+        top = node.top
+        if key in top:
+            top.remove(key)
+        top.append(key)
+        top.sort(key=self._rank)
+        del top[self.max_k:]
+
+    def add(self, term: str, weight: float = 1):
+        """Adds term, or increases its weight if it is already present."""
+        key = self.normalize(term)
+        if not key:
+            return
+        with self._lock:
+            self._weights[key] = self._weights.get(key, 0) + weight
+            self._display.setdefault(key, ' '.join(str(term).split()))
+
+            node = self._root
+            self._promote(node, key)
+            rest = key
+            while rest:
+                child = node.children.get(rest[0])
+                if child is None:
+                    node.children[rest[0]] = _Node(rest, top=[key])
+                    return
+
+                label = child.label
+                common = 1
+                limit = min(len(label), len(rest))
+                while common < limit and label[common] == rest[common]:
+                    common += 1
+                if common < len(label):
+                    # Split the edge so the shared part becomes its own node.
+                    child.label = label[common:]
+                    child = _Node(label[:common], {label[common]: child}, list(child.top))
+                    node.children[rest[0]] = child
+
+                self._promote(child, key)
+                node = child
+                rest = rest[common:]
+
+    def complete(self, prefix: str, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Returns up to k (display term, weight) pairs starting with prefix, heaviest first."""
+        k = self.max_k if k is None else min(k, self.max_k)
+        rest = self.normalize(prefix)
+        if rest and prefix[-1].isspace():
+            # 'beef ' only completes to multi-word terms such as 'beef stew'.
+            rest += ' '
+        with self._lock:
+            node = self._root
+            while rest:
+                child = node.children.get(rest[0])
+                if child is None:
+                    return []
+                label = child.label
+                if rest.startswith(label):
+                    rest = rest[len(label):]
+                elif label.startswith(rest):
+                    rest = ''
+                else:
+                    return []
+                node = child
+            return [(self._display[key], self._weights[key]) for key in node.top[:k]]
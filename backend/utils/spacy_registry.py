@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+import psutil
+
+from backend.config import Config
+from backend.utils.log_monitor import log_monitor
+from backend.utils.logging_utils import log_success, log_warning
+
+# Components that only run to feed another one: attribute_ruler maps tagger output to
+# token.pos_, which the rule lemmatizer reads. Shared embedding layers (tok2vec,
+# transformer) are found at runtime through their listening_components.
+PIPE_REQUIREMENTS = {
+    'attribute_ruler': ('tagger', 'morphologizer'),
+    'lemmatizer': ('attribute_ruler', 'tagger', 'morphologizer'),
+}
+
+
+class SpacyPipeline:
+    """
+    A shared spaCy Language that only runs the components one caller needs (every
+    component if none are named).
+    Calls pass the other components as 'disable', so several views can use the same
+    Language from different threads without touching its configuration.
+    """
+
+    def __init__(self, nlp, components: Tuple[str, ...]):
+        self.nlp = nlp
+        self.components = components
+        self.enabled = self._resolve(components)
+        self.disabled = [name for name in nlp.pipe_names if name not in self.enabled]
+
+    def _resolve(self, components):
+        pipe_names = list(self.nlp.pipe_names)
+        if not components:
+            return pipe_names
+        needed = set()
+        pending = list(components)
+        while pending:
+            name = pending.pop()
+            if name in needed or name not in pipe_names:
+                continue
+            needed.add(name)
+            pending.extend(PIPE_REQUIREMENTS.get(name, ()))
+            for upstream in pipe_names:
+                if name in getattr(self.nlp.get_pipe(upstream), 'listening_components', ()):
+                    pending.append(upstream)
+        return [name for name in pipe_names if name in needed]
+
+    def __call__(self, text: str):
+        return self.nlp(text, disable=self.disabled)
+
+    def pipe(self, texts: Iterable[str], batch_size: int = 64, n_process: int = 1):
+        return self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=self.disabled)
+
+
+class _LoadedModel:
+    def __init__(self, nlp, load_seconds: float, rss_bytes: int):
+        self.nlp = nlp
+        self.load_seconds = load_seconds
+        self.rss_bytes = rss_bytes
+        self.views: Dict[Tuple[str, ...], SpacyPipeline] = {}
+
+
+class SpacyRegistry:
+    """
+    Process-wide spaCy pipelines. Each model is loaded once, without the components in
+    'exclude' that no consumer uses, and handed out as SpacyPipeline views keyed by the
+    components a caller needs; only those (and what they depend on) run on its texts.
+    Load time and the process RSS growth during each load are reported by stats().
+    """
+
+    def __init__(self, exclude: Iterable[str] = ('ner',)):
+        self.exclude = list(exclude)
+        self._models: Dict[str, _LoadedModel] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, model_name: str) -> _LoadedModel:
+        import spacy
+
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+        nlp = spacy.load(model_name, exclude=self.exclude)
+        loaded = _LoadedModel(nlp, time.perf_counter() - start, max(0, process.memory_info().rss - rss_before))
+        log_success(f"spaCy pipeline '{model_name}' loaded in {loaded.load_seconds:.2f}s "
+                    f"(+{loaded.rss_bytes / 1024 / 1024:.1f} MB RSS) with {list(nlp.pipe_names)}", "SpacyRegistry")
+        return loaded
+
+    def get(self, model_name: str, components: Iterable[str] = ()) -> SpacyPipeline:
+        """
+        Returns the shared pipeline for model_name restricted to components, loading the
+        model on first use. Errors from spacy.load (e.g. OSError for a model that is not
+        installed) propagate and nothing is cached, so a later call can retry.
+        """
+        key = tuple(sorted(components))
+        with self._lock:
+            loaded = self._models.get(model_name)
+            if loaded is None:
+                loaded = self._models[model_name] = self._load(model_name)
+            view = loaded.views.get(key)
+            if view is None:
+                view = loaded.views[key] = SpacyPipeline(loaded.nlp, key)
+                missing = [name for name in key if name not in view.enabled]
+                if missing:
+                    log_warning(f"spaCy pipeline '{model_name}' has no {missing} component(s)", "SpacyRegistry")
+        return view
+
+    def clear(self):
+        """Drops every loaded pipeline (for tests, or to pick up a newly installed model)."""
+        with self._lock:
+            self._models.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for model_name, loaded in list(self._models.items()):
+            views: Dict[str, List[str]] = {'+'.join(key) or 'all': view.enabled
+                                           for key, view in list(loaded.views.items())}
+            stats[model_name] = {
+                'components': list(loaded.nlp.pipe_names),
+                'excluded': list(self.exclude),
+                'load_seconds': round(loaded.load_seconds, 3),
+                'rss_mb': round(loaded.rss_bytes / 1024 / 1024, 1),
+                'views': views,
+            }
+        return stats
+
+
+# Global spaCy registry instance
+spacy_registry = SpacyRegistry(exclude=[name.strip() for name in Config.SPACY_EXCLUDE_COMPONENTS.split(',') if name.strip()])
+log_monitor.register_metrics_provider('models', 'spacy_pipelines', spacy_registry.stats)
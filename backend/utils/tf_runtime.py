@@ -0,0 +1,57 @@
+import threading
+import time
+
+from backend.utils.logging_utils import log_info, log_warning
+
+_threads_lock = threading.Lock()
+_threads_configured = False
+
+
+def configure_threads(intra_op_threads=0, inter_op_threads=0):
+    """
+    Sizes TensorFlow's thread pools once per process (0 keeps TensorFlow's default of one
+    thread per core). With several workers on one host, defaults oversubscribe the cores,
+    so each worker should get roughly cores / workers intra-op threads.
+    Only takes effect before TensorFlow runs its first op; later calls log a warning.
+    """
+    global _threads_configured
+    import tensorflow as tf
+
+    with _threads_lock:
+        if _threads_configured:
+            return
+        _threads_configured = True
+        try:
+            if intra_op_threads:
+                tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+            if inter_op_threads:
+                tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+        except RuntimeError as e:
+            log_warning(f"TensorFlow thread settings not applied, runtime already initialized: {e}", "TFRuntime")
+            return
+    log_info(f"TensorFlow threads: intra-op {tf.config.threading.get_intra_op_parallelism_threads() or 'default'}, "
+             f"inter-op {tf.config.threading.get_inter_op_parallelism_threads() or 'default'}", "TFRuntime")
+
+
+def compile_inference(model, input_shape, warmup=True, name='model'):
+    """
+    Wraps model inference in a tf.function with a fixed (None, *input_shape) float32 signature,
+    so every batch size reuses one traced graph instead of going through Keras' per-call
+    predict() machinery. With warmup, the graph is traced and run once on a zero image here,
+    during model loading, rather than on the first request.
+    Returns a function mapping a float32 array of shape (n, *input_shape) to an (n, classes) array.
+    """
+    import numpy as np
+    import tensorflow as tf
+
+    signature = [tf.TensorSpec(shape=(None,) + tuple(input_shape), dtype=tf.float32)]
+    infer = tf.function(lambda images: model(images, training=False), input_signature=signature)
+
+    def predict(images):
+        return infer(np.asarray(images, dtype=np.float32)).numpy()
+
+    if warmup:
+        start = time.perf_counter()
+        predict(np.zeros((1,) + tuple(input_shape), dtype=np.float32))
+        log_info(f"Inference for '{name}' traced and warmed up in {time.perf_counter() - start:.2f}s", "TFRuntime")
+    return predict
@@ -0,0 +1,76 @@
+import os
+import threading
+import warnings
+
+import numpy as np
+
+
+def _interpreter_class():
+    """LiteRT's interpreter when ai_edge_litert is installed, otherwise TensorFlow's tf.lite.Interpreter."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+def _batch_bucket(batch_size):
+    """Smallest power of two holding batch_size rows."""
+    return 1 << (batch_size - 1).bit_length()
+
+
+class TFLiteModel:
+    """
+    A converted .tflite classifier behind the same batch-in, probabilities-out call as the
+    compiled Keras model.
+
+    Growing an interpreter's input after its tensors were allocated corrupts the heap with the
+    XNNPACK delegate, so each interpreter is sized once: batches are zero-padded to the next
+    power of two and every bucket (1, 2, 4, ... rows) gets its own interpreter on first use.
+    Micro-batches of up to 16 images need at most five.
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        """
+        :param model_path: Path to the .tflite file written by backend.ai_models.tflite_conversion.
+        :param num_threads: Interpreter threads (None = one per core).
+        """
+        self.model_path = model_path
+        self.num_threads = num_threads or os.cpu_count()
+        interpreter = self._new_interpreter()
+        self._input = interpreter.get_input_details()[0]
+        self._output = interpreter.get_output_details()[0]
+        self.input_shape = tuple(int(d) for d in self._input['shape'][1:])
+        interpreter.allocate_tensors()
+        self._interpreters = {int(self._input['shape'][0]): interpreter}
+        self._lock = threading.Lock()
+
+    def _new_interpreter(self):
+        with warnings.catch_warnings():
+            # tf.lite.Interpreter warns that it moves to ai_edge_litert; either runs the same file
+            warnings.simplefilter('ignore', UserWarning)
+            return _interpreter_class()(model_path=self.model_path, num_threads=self.num_threads)
+
+    def _interpreter(self, batch_size):
+        interpreter = self._interpreters.get(batch_size)
+        if interpreter is None:
+            interpreter = self._new_interpreter()
+            interpreter.resize_tensor_input(self._input['index'], [batch_size, *self.input_shape])
+            interpreter.allocate_tensors()
+            self._interpreters[batch_size] = interpreter
+        return interpreter
+
+    def predict(self, images):
+        """Maps a float32 array of shape (n, *input_shape) to an (n, classes) array."""
+        images = np.asarray(images, dtype=np.float32)
+        rows = images.shape[0]
+        bucket = _batch_bucket(rows)
+        if bucket != rows:
+            images = np.concatenate([images, np.zeros((bucket - rows, *self.input_shape), dtype=np.float32)])
+        with self._lock:
+            interpreter = self._interpreter(bucket)
+            interpreter.set_tensor(self._input['index'], images)
+            interpreter.invoke()
+            # get_tensor copies, so the result survives the next invoke
+            return interpreter.get_tensor(self._output['index'])[:rows]
@@ -23,43 +23,42 @@ const IngredientSubstitutePage = () => {
   const [isLoading, setIsLoading] = useState(false);
   const auth = useAuth();
 
-  const fetchNutritionForSubstitute = async (substituteName, index) => {
-    try {
-      const response = await authenticatedFetch(`/api/nutrition/${encodeURIComponent(substituteName)}`, { method: 'GET' }, auth);
-      const nutritionData = await response.json();
+  const applyNutritionResult = (currentItem, nutritionData) => {
+    if (nutritionData.success) {
+      if (nutritionData.nutrition && Object.keys(nutritionData.nutrition).length > 0) {
+        return { ...currentItem, nutrition: nutritionData.nutrition, isLoadingNutrition: false, nutritionError: null };
+      }
+      const message = (nutritionData.warning && typeof nutritionData.warning === 'string' && nutritionData.warning.trim() !== '')
+        ? nutritionData.warning
+        : 'Detailed nutritional data not available or incomplete.';
+      return { ...currentItem, nutrition: null, isLoadingNutrition: false, nutritionError: message };
+    }
+    return { ...currentItem, nutrition: null, isLoadingNutrition: false, nutritionError: nutritionData.error || 'Failed to retrieve nutritional details.' };
+  };
 
-      setResults(prevResults => {
-        const newResults = [...prevResults];
-        if (!newResults[index]) return prevResults;
-        const currentItem = newResults[index];
+  const fetchNutritionForSubstitutes = async (substituteNames) => {
+    try {
+      const response = await authenticatedFetch('/api/nutrition/batch', {
+        method: 'POST',
+        body: JSON.stringify({ names: substituteNames }),
+      }, auth);
+      const batchData = await response.json();
 
-        if (response.ok) {
-          if (nutritionData.success) {
-            if (nutritionData.nutrition && Object.keys(nutritionData.nutrition).length > 0) {
-              newResults[index] = { ...currentItem, nutrition: nutritionData.nutrition, isLoadingNutrition: false, nutritionError: null };
-            } else {
-              const message = (nutritionData.warning && typeof nutritionData.warning === 'string' && nutritionData.warning.trim() !== '')
-                ? nutritionData.warning
-                : 'Detailed nutritional data not available or incomplete.';
-              newResults[index] = { ...currentItem, nutrition: null, isLoadingNutrition: false, nutritionError: message };
-            }
-          } else {
-            newResults[index] = { ...currentItem, nutrition: null, isLoadingNutrition: false, nutritionError: nutritionData.error || 'Failed to retrieve nutritional details.' };
-          }
-        } else {
-          newResults[index] = { ...currentItem, nutrition: null, isLoadingNutrition: false, nutritionError: nutritionData.error || `Failed to fetch nutritional data (status: ${response.status}).` };
+      setResults(prevResults => prevResults.map((currentItem, index) => {
+        if (!response.ok) {
+          return { ...currentItem, nutrition: null, isLoadingNutrition: false, nutritionError: batchData.error || `Failed to fetch nutritional data (status: ${response.status}).` };
         }
-        return newResults;
-      });
-    } catch (err) {
-      console.error(`Network error fetching nutrition for ${substituteName}:`, err);
-      setResults(prevResults => {
-        const newResults = [...prevResults];
-        if (newResults[index]) {
-          newResults[index] = { ...newResults[index], nutrition: null, isLoadingNutrition: false, nutritionError: 'Network error occurred while fetching nutritional data.' };
+        const nutritionData = batchData.results && batchData.results[index];
+        if (!nutritionData) {
+          return { ...currentItem, nutrition: null, isLoadingNutrition: false, nutritionError: 'Failed to retrieve nutritional details.' };
         }
-        return newResults;
-      });
+        return applyNutritionResult(currentItem, nutritionData);
+      }));
+    } catch (err) {
+      console.error('Network error fetching nutrition for substitutes:', err);
+      setResults(prevResults => prevResults.map(currentItem => (
+        { ...currentItem, nutrition: null, isLoadingNutrition: false, nutritionError: 'Network error occurred while fetching nutritional data.' }
+      )));
     }
   };
 
@@ -97,9 +96,7 @@ const IngredientSubstitutePage = () => {
           }));
           setResults(newSubstitutes);
           setError(null);
-          newSubstitutes.forEach((sub, index) => {
-            fetchNutritionForSubstitute(sub.name, index);
-          });
+          fetchNutritionForSubstitutes(newSubstitutes.map(sub => sub.name));
         }
       } else {
         setError(data.message || 'Failed to fetch substitutes.');
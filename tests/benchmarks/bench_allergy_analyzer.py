@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Aho-Corasick allergen matching vs the previous per-row scan in AllergyAnalyzer.
+
+The scan is the previous get_allergies: iterrows() over allergies_processed.csv,
+testing `food in ingredient_name` for every row. Both run over the names in
+FOOD-DATA.csv (typical ingredient strings) and must return the same allergens.
+
+Usage:
+    python tests/benchmarks/bench_allergy_analyzer.py [--ingredients N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pandas as pd
+
+from backend.ai_models.allergy_analyzer.allergy_analyzer import AllergyAnalyzer
+
+FOOD_DATA_CSV = os.path.join(PROJECT_ROOT, 'backend', 'ai_models', 'food_data', 'Data', 'FOOD-DATA.csv')
+
+
+def scan_allergies(analyzer, ingredient_name):
+    ingredient_name_lower = ingredient_name.lower()
+    allergy_columns = [col for col in analyzer.df.columns if col != 'food']
+    allergies = []
+    for index, row in analyzer.df.iterrows():
+        if row['food'] in ingredient_name_lower:
+            allergies.extend(col.replace('_', ' ') for col in allergy_columns if row[col] == 1)
+    return list(set(allergies))
+
+
+def time_calls(fn, names):
+    timings = []
+    for name in names:
+        start = time.perf_counter()
+        fn(name)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--ingredients', type=int, default=500)
+    args = parser.parse_args()
+
+    analyzer = AllergyAnalyzer()
+    names = pd.read_csv(FOOD_DATA_CSV)['food'].str.strip().tolist()[:args.ingredients]
+    for name in names:
+        if set(analyzer.get_allergies(name)) != set(scan_allergies(analyzer, name)):
+            raise SystemExit(f"Mismatch for '{name}'")
+
+    scan = time_calls(lambda name: scan_allergies(analyzer, name), names)
+    matcher = time_calls(analyzer.get_allergies, names)
+    print(f"{len(analyzer.df)} allergy foods, {len(analyzer._goto)} automaton states, {len(names)} ingredients")
+    print(f"{'method':>14} {'p50 ms':>9} {'mean ms':>9} {'20-ingredient recipe ms':>24}")
+    for label, timings in (('row scan', scan), ('aho-corasick', matcher)):
+        print(f"{label:>14} {statistics.median(timings):>9.4f} {statistics.mean(timings):>9.4f} "
+              f"{statistics.mean(timings) * 20:>24.3f}")
+    print(f"speedup: {statistics.mean(scan) / statistics.mean(matcher):.0f}x")
+
+
+if __name__ == '__main__':
+    main()
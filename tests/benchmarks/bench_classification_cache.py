@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: food classification of repeated uploads with and without the perceptual-hash result cache.
+
+Replays --requests uploads drawn from --distinct source photos, where a --repeat fraction
+are re-uploads of an earlier photo: half the same file again, half re-encoded at another
+JPEG quality as a phone or browser would. Each upload is classified:
+
+  uncached  - decode + FoodClassifier.predict_food, what every request paid before
+  cached    - decode + dHash + ImageResultCache lookup, predict_food only on a miss
+
+with a memory cache of --distinct entries, then again with a quarter of that plus a spill
+directory, so most hits are served from disk. Reports per-request p50/p99 latency, the
+hit ratio and whether cached predictions matched a fresh forward pass.
+
+Uses backend/ai_models/food_classification/food_model.keras when present, otherwise the
+untrained MobileNetV2 stand-in from bench_classifier_batching.
+
+Usage:
+    python tests/benchmarks/bench_classification_cache.py [--requests N] [--distinct N] [--repeat F]
+"""
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image
+
+from bench_classifier_batching import CLASSIFIER_DIR, IMAGE_PATH, build_standin  # noqa: E402
+from backend.ai_models.food_classification.food_classifier import FoodClassifier  # noqa: E402
+from backend.utils.image_result_cache import ImageResultCache  # noqa: E402
+
+
+def build_uploads(requests, distinct, repeat, seed=11):
+    """Distinct photos are crops of tests/pizza.jpg; re-uploads resend or re-encode an earlier one."""
+    rng = np.random.default_rng(seed)
+    source = Image.open(IMAGE_PATH).convert('RGB')
+
+    def encode(photo):
+        buffer = io.BytesIO()
+        photo.save(buffer, format='JPEG', quality=int(rng.integers(60, 95)))
+        return buffer.getvalue()
+
+    photos, files = [], []
+    for _ in range(distinct):
+        left, top = int(rng.integers(0, 600)), int(rng.integers(0, 400))
+        photos.append(source.crop((left, top, left + 900, top + 600)))
+        files.append(encode(photos[-1]))
+
+    uploads, uploaded = [], 0
+    for _ in range(requests):
+        if uploaded and rng.random() < repeat:
+            index = int(rng.integers(0, min(uploaded, distinct)))
+            uploads.append(files[index] if rng.random() < 0.5 else encode(photos[index]))
+        else:
+            uploads.append(files[uploaded % distinct])
+            uploaded += 1
+    return uploads
+
+
+def replay(classifier, uploads, cache=None):
+    timings, results = [], []
+    for data in uploads:
+        start = time.perf_counter()
+        image = classifier.load_image(data)
+        if cache is None:
+            predictions = classifier.predict_food(image)
+        else:
+            key = cache.key('food', image)
+            entry = cache.get(key)
+            if entry is not None:
+                predictions = entry['predictions']
+            else:
+                predictions = classifier.predict_food(image)
+                cache.put(key, {'predictions': predictions})
+        timings.append((time.perf_counter() - start) * 1000)
+        results.append(predictions[0]['name'] if predictions else None)
+    return timings, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--distinct', type=int, default=40)
+    parser.add_argument('--repeat', type=float, default=0.7)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_classification_cache_')
+    try:
+        model_dir = CLASSIFIER_DIR
+        if not os.path.exists(os.path.join(CLASSIFIER_DIR, 'food_model.keras')):
+            print("food_model.keras not found; using an untrained MobileNetV2 stand-in.")
+            model_dir = os.path.join(work_dir, 'model')
+            os.makedirs(model_dir)
+            build_standin(model_dir)
+        classifier = FoodClassifier(model_base_path=model_dir)
+        classifier.compile_inference(warmup=True)
+
+        uploads = build_uploads(args.requests, args.distinct, args.repeat)
+        print(f"{len(uploads)} uploads of {args.distinct} photos, {args.repeat:.0%} re-uploads")
+
+        baseline_timings, baseline = replay(classifier, uploads)
+        runs = [('uncached', baseline_timings, None)]
+        memory_cache = ImageResultCache(maxsize=args.distinct)
+        runs.append(('memory', *replay(classifier, uploads, memory_cache)[:1], memory_cache))
+        spill_cache = ImageResultCache(maxsize=max(args.distinct // 4, 1), spill_dir=os.path.join(work_dir, 'spill'))
+        runs.append(('spill', *replay(classifier, uploads, spill_cache)[:1], spill_cache))
+
+        _, cached_results = replay(classifier, uploads, ImageResultCache(maxsize=args.distinct))
+        agreement = np.mean([a == b for a, b in zip(baseline, cached_results)])
+
+        print(f"{'mode':>9} {'p50 ms':>8} {'p99 ms':>8} {'total s':>8} {'hit ratio':>10} {'disk hits':>10}")
+        for name, timings, cache in runs:
+            stats = cache.stats() if cache else {'hit_ratio': 0.0, 'disk_hits': 0}
+            print(f"{name:>9} {np.percentile(timings, 50):>8.1f} {np.percentile(timings, 99):>8.1f} "
+                  f"{sum(timings) / 1000:>8.2f} {stats['hit_ratio']:>10.2%} {stats['disk_hits']:>10}")
+        print(f"Top-1 agreement of cached with uncached predictions: {agreement:.1%}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
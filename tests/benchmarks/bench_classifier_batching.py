@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: classifier throughput with and without micro-batching under concurrent clients.
+
+Each client thread calls FoodClassifier.predict_food on tests/pizza.jpg in a loop, as
+concurrent /api/classify or chatbot image requests would. With batching off every call
+is its own batch-of-one forward pass; with batching on, calls are grouped by the
+MicroBatcher (--batch-size images, --wait-ms) into one model call.
+
+Uses backend/ai_models/food_classification/food_model.keras when present, otherwise an
+untrained MobileNetV2 with the same input size and class count, which costs the
+same per forward pass.
+
+Usage:
+    python tests/benchmarks/bench_classifier_batching.py [--clients 1,4,16] [--seconds S] [--batch-size N] [--wait-ms T]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.ai_models.food_classification.food_classifier import FoodClassifier  # noqa: E402
+
+CLASSIFIER_DIR = os.path.join(PROJECT_ROOT, 'backend', 'ai_models', 'food_classification')
+IMAGE_PATH = os.path.join(PROJECT_ROOT, 'tests', 'pizza.jpg')
+
+
+def build_standin(model_dir):
+    import json
+    import tensorflow as tf
+
+    with open(os.path.join(CLASSIFIER_DIR, 'class_names.json')) as f:
+        num_classes = len(json.load(f))
+    model = tf.keras.applications.MobileNetV2(weights=None, input_shape=(224, 224, 3), classes=num_classes)
+    model.save(os.path.join(model_dir, 'food_model.keras'))
+    shutil.copy(os.path.join(CLASSIFIER_DIR, 'class_names.json'), model_dir)
+
+
+def run_clients(classifier, clients, seconds):
+    counts = [0] * clients
+    deadline = time.perf_counter() + seconds
+
+    def client(index):
+        while time.perf_counter() < deadline:
+            if not classifier.predict_food(IMAGE_PATH):
+                raise SystemExit("Prediction failed")
+            counts[index] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--clients', default='1,4,16')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_batching_')
+    try:
+        model_dir = CLASSIFIER_DIR
+        if not os.path.exists(os.path.join(CLASSIFIER_DIR, 'food_model.keras')):
+            print("food_model.keras not found; using an untrained MobileNetV2 stand-in.")
+            model_dir = work_dir
+            build_standin(model_dir)
+        classifier = FoodClassifier(model_base_path=model_dir)
+        if not classifier.is_model_loaded():
+            raise SystemExit("Classifier failed to load")
+        classifier.predict_food(IMAGE_PATH)
+
+        print(f"{'clients':>8} {'unbatched img/s':>16} {'batched img/s':>14} {'mean batch':>11} {'speedup':>8}")
+        for clients in [int(c) for c in args.clients.split(',')]:
+            classifier.batcher = None
+            unbatched = run_clients(classifier, clients, args.seconds)
+            batcher = classifier.enable_batching(args.batch_size, args.wait_ms)
+            batched = run_clients(classifier, clients, args.seconds)
+            print(f"{clients:>8} {unbatched:>16.1f} {batched:>14.1f} {batcher.stats()['mean_batch_size']:>11.2f} "
+                  f"{batched / unbatched:>7.2f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-image classifier latency, Keras predict() vs eager call vs compiled tf.function.
+
+Each mode loads the food model in a fresh spawned process, times the first request
+after load (what the first user after a boot waits for) and then --requests more
+single-image requests:
+
+  predict   - model.predict(batch), the original FoodClassifier path
+  eager     - model(batch, training=False), used since classifier batching
+  compiled  - FoodClassifier.compile_inference(): tf.function with a fixed input
+              signature, traced and warmed up at load time (warm-up time reported)
+
+Uses backend/ai_models/food_classification/food_model.keras when present, otherwise the
+untrained MobileNetV2 stand-in from bench_classifier_batching. --intra/--inter set the
+TensorFlow thread pools as TF_INTRA_OP_THREADS / TF_INTER_OP_THREADS would.
+
+Usage:
+    python tests/benchmarks/bench_classifier_latency.py [--requests N] [--intra N] [--inter N]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from bench_classifier_batching import CLASSIFIER_DIR, IMAGE_PATH, build_standin  # noqa: E402
+
+
+def worker(mode, model_dir, requests, intra, inter, results):
+    from backend.utils.tf_runtime import configure_threads
+    configure_threads(intra, inter)
+    from backend.ai_models.food_classification.food_classifier import FoodClassifier
+
+    classifier = FoodClassifier(model_base_path=model_dir)
+    image = classifier.preprocess_image(IMAGE_PATH)
+    warmup_seconds = 0.0
+    if mode == 'predict':
+        run = lambda: classifier.model.predict(image, verbose=0)  # noqa: E731
+    elif mode == 'eager':
+        run = lambda: classifier.model(image, training=False).numpy()  # noqa: E731
+    else:
+        start = time.perf_counter()
+        classifier.compile_inference(warmup=True)
+        warmup_seconds = time.perf_counter() - start
+        run = lambda: classifier.predict_batch(image)  # noqa: E731
+
+    timings = []
+    for _ in range(requests + 1):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    results.put((mode, warmup_seconds, timings[0], timings[1:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--intra', type=int, default=0)
+    parser.add_argument('--inter', type=int, default=0)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_latency_')
+    try:
+        model_dir = CLASSIFIER_DIR
+        if not os.path.exists(os.path.join(CLASSIFIER_DIR, 'food_model.keras')):
+            print("food_model.keras not found; using an untrained MobileNetV2 stand-in.")
+            model_dir = work_dir
+            build_standin(model_dir)
+
+        context = multiprocessing.get_context('spawn')
+        print(f"{'mode':>9} {'warm-up s':>10} {'first ms':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for mode in ('predict', 'eager', 'compiled'):
+            results = context.Queue()
+            process = context.Process(target=worker, args=(mode, model_dir, args.requests, args.intra, args.inter, results))
+            process.start()
+            mode, warmup_seconds, first, timings = results.get()
+            process.join()
+            print(f"{mode:>9} {warmup_seconds:>10.2f} {first:>9.1f} {np.percentile(timings, 50):>8.1f} "
+                  f"{np.percentile(timings, 99):>8.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FoodLookupService.lookup_food throughput with and without the JSON round trip.
+
+"json round trip" reproduces the previous path: NutritionDatabase formatted every
+result into a fresh dict, json.dumps'd it with indent=2, and lookup_food json.loads'd
+it straight back. "direct" is the current service call, which returns the database's
+dicts (food payloads are built once and reused). Both use FOOD-DATA.csv without the
+on-disk cache; the HTTP layer's single jsonify is not included in either.
+
+Usage:
+    python tests/benchmarks/bench_food_lookup.py [--seconds N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from unittest import mock
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.ai_models.food_data.nutrition_database import NutritionDatabase, DEFAULT_CSV_PATH
+from backend.services.main.food_lookup_service import FoodLookupService
+
+# (query, is_exact_match) pairs covering single matches, exact names, disambiguation and misses.
+LOOKUPS = [('apple', False), ('banana', False), ('cheddar cheese', True), ('brown rice', False),
+           ('chicken', False), ('eggs', False), ('salmon', False), ('pizza', False), ('xyz', False)]
+
+
+def legacy_lookup(db, query, is_exact_match):
+    def format_food(food_name):
+        formatted_data = {k: {"value": v, "unit": db.unit_map.get(k, "")}
+                          for k, v in db.food_data[food_name].items() if v is not None}
+        return json.dumps({"food": food_name, "data": formatted_data}, indent=2)
+
+    if is_exact_match:
+        if query in db.food_data:
+            text = format_food(query)
+        else:
+            text = json.dumps({"error": "Exact food name not found"}, indent=2)
+    else:
+        matches = db.find_matches(query)
+        if len(matches) == 1:
+            text = format_food(matches[0])
+        elif matches:
+            text = json.dumps({"matches": matches, "message": "Multiple matches found. Please select one."}, indent=2)
+        else:
+            text = json.dumps({"error": "Food not found"}, indent=2)
+    return json.loads(text)
+
+
+def throughput(fn, seconds):
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for query, is_exact in LOOKUPS:
+            fn(query, is_exact)
+        calls += len(LOOKUPS)
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    db = NutritionDatabase(csv_path=DEFAULT_CSV_PATH, use_cache=False)
+    service = FoodLookupService()
+    with mock.patch.object(FoodLookupService, 'db', new_callable=mock.PropertyMock, return_value=db):
+        for query, is_exact in LOOKUPS:
+            if service.lookup_food(query, is_exact) != legacy_lookup(db, query, is_exact):
+                raise SystemExit(f"Result mismatch for '{query}'")
+
+        before = throughput(lambda query, is_exact: legacy_lookup(db, query, is_exact), args.seconds)
+        after = throughput(service.lookup_food, args.seconds)
+
+    print(f"{'path':>16} {'lookups/s':>10} {'us/lookup':>10}")
+    for label, rate in (('json round trip', before), ('direct', after)):
+        print(f"{label:>16} {rate:>10.0f} {1e6 / rate:>10.1f}")
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
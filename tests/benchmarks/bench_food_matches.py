@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trigram-indexed vs linear-scan substring search in NutritionDatabase.find_matches.
+
+The scan is the previous implementation: every food name is lowercased and tested
+with `term in name` for the query and its singular/plural form. Both run over
+FOOD-DATA.csv (loaded without the on-disk cache) and their results are checked
+to be identical before timing.
+
+Usage:
+    python tests/benchmarks/bench_food_matches.py [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.ai_models.food_data.nutrition_database import NutritionDatabase, DEFAULT_CSV_PATH
+
+# Partial names that miss the exact-name lookup, so find_matches falls through to substring search.
+QUERIES = ['chick', 'chees', 'bread', 'juice', 'rice', 'berr', 'fried', 'oil', 'ch', 'tomato sau', 'xyz']
+
+
+def scan_matches(names, query):
+    normalized = query.strip().lower()
+    candidates = [normalized, normalized[:-1] if normalized.endswith('s') else normalized + 's']
+    return [name for name in names if any(term in name.lower() for term in candidates)]
+
+
+def time_calls(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            fn(query)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    db = NutritionDatabase(csv_path=DEFAULT_CSV_PATH, use_cache=False)
+    names = list(db.food_data)
+    for query in QUERIES:
+        if db.find_matches(query) != scan_matches(names, query):
+            raise SystemExit(f"Mismatch for '{query}'")
+
+    scan = time_calls(lambda query: scan_matches(names, query), args.repeat)
+    indexed = time_calls(db.find_matches, args.repeat)
+    print(f"{len(names)} foods, {len(db.trigrams)} trigrams, {len(QUERIES)} queries x {args.repeat}")
+    print(f"{'method':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    for label, timings in (('scan', scan), ('trigram', indexed)):
+        p99 = statistics.quantiles(timings, n=100)[98]
+        print(f"{label:>8} {statistics.median(timings):>8.3f} {p99:>8.3f} {statistics.mean(timings):>8.3f}")
+    print(f"speedup: {statistics.mean(scan) / statistics.mean(indexed):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: classifier image intake, temp file round trip vs in-memory decode.
+
+  temp file  - the previous path: FileStorage.save() to the temp directory,
+               keras load_img() from disk at 224x224, then os.remove().
+  in memory  - decode_image() straight from the upload stream, with JPEG draft
+               decoding for large images.
+
+Both produce the (224, 224, 3) array the classifiers feed to preprocessing. Runs on
+tests/apple.jpg (224x224), tests/pizza.jpg (1500x1000) and a synthetic 12 MP photo.
+Pass --temp-dir to time the temp file path on a different volume.
+
+Usage:
+    python tests/benchmarks/bench_image_decode.py [--iterations N] [--temp-dir DIR]
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+from keras.preprocessing import image as keras_image
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from backend.utils.image_decode import decode_image
+
+TARGET_SIZE = (224, 224)
+
+
+def synthetic_photo():
+    """A 4000x3000 JPEG with smooth gradients plus noise, roughly what a phone camera uploads."""
+    rng = np.random.default_rng(7)
+    y, x = np.mgrid[0:3000, 0:4000]
+    pixels = np.stack([x * 255 // 4000, y * 255 // 3000, (x + y) * 255 // 7000], axis=-1)
+    pixels = np.clip(pixels + rng.normal(0, 12, pixels.shape), 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def via_temp_file(data, temp_dir):
+    upload = FileStorage(stream=io.BytesIO(data), filename='upload.jpg')
+    path = os.path.join(temp_dir, 'upload.jpg')
+    upload.save(path)
+    try:
+        return keras_image.img_to_array(keras_image.load_img(path, target_size=TARGET_SIZE))
+    finally:
+        os.remove(path)
+
+
+def in_memory(data):
+    upload = FileStorage(stream=io.BytesIO(data), filename='upload.jpg')
+    return keras_image.img_to_array(decode_image(upload.stream, TARGET_SIZE))
+
+
+def time_calls(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--temp-dir', default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    images = {}
+    for name in ('apple.jpg', 'pizza.jpg'):
+        with open(os.path.join(PROJECT_ROOT, 'tests', name), 'rb') as f:
+            images[name] = f.read()
+    images['12MP photo'] = synthetic_photo()
+
+    print(f"{'image':>12} {'KB':>7} {'temp file p50':>14} {'in memory p50':>14} {'speedup':>8} {'mean abs diff':>14}")
+    for name, data in images.items():
+        difference = np.abs(via_temp_file(data, args.temp_dir) - in_memory(data)).mean()
+        temp_file = time_calls(lambda: via_temp_file(data, args.temp_dir), args.iterations)
+        memory = time_calls(lambda: in_memory(data), args.iterations)
+        print(f"{name:>12} {len(data) / 1024:>7.0f} {statistics.median(temp_file):>11.2f} ms "
+              f"{statistics.median(memory):>11.2f} ms {statistics.median(temp_file) / statistics.median(memory):>7.1f}x "
+              f"{difference:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: classifier inference in the API process vs in an InferencePool of worker processes.
+
+Runs a simulated API process (a spawned child) per configuration. Inside it, --clients
+threads classify tests/pizza.jpg in a loop, as concurrent /api/classify requests would,
+while one more thread serves a pure-Python "JSON endpoint" (serialising a recipe list)
+as fast as it can. Reported per configuration:
+
+  img/s            - classification throughput
+  json p50/p99 ms  - latency of the non-ML endpoint under the classification load, which
+                     shows how much the in-process model competes with request threads
+  API RSS MB       - resident memory of the API process
+  TF in API        - whether the API process imported TensorFlow
+
+In-process runs the compiled, micro-batched FoodClassifier in the API process; pool:N runs
+it in N workers behind a RemoteClassifier. Uses food_model.keras when present, otherwise an
+untrained MobileNetV2 stand-in of the same cost. On a machine with few cores the workers
+and the API process share CPUs, so the pool mostly buys isolation rather than throughput.
+
+Usage:
+    python tests/benchmarks/bench_inference_pool.py [--workers 1,2] [--clients 16] [--seconds S]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+
+CLASSIFIER_DIR = os.path.join(PROJECT_ROOT, 'backend', 'ai_models', 'food_classification')
+IMAGE_PATH = os.path.join(PROJECT_ROOT, 'tests', 'pizza.jpg')
+RECIPES = [{'recipe_id': i, 'title': f"Recipe {i}", 'ingredients': [{'name': f"ingredient {j}", 'quantity': j * 1.5}
+                                                                      for j in range(12)]} for i in range(50)]
+
+
+def build_standin(model_dir):
+    import tensorflow as tf
+
+    with open(os.path.join(CLASSIFIER_DIR, 'class_names.json')) as f:
+        num_classes = len(json.load(f))
+    model = tf.keras.applications.MobileNetV2(weights=None, input_shape=(224, 224, 3), classes=num_classes)
+    model.save(os.path.join(model_dir, 'food_model.keras'))
+    shutil.copy(os.path.join(CLASSIFIER_DIR, 'class_names.json'), model_dir)
+
+
+def load_classifier():
+    """Module-level so the pool's workers can run it; the model directory comes from the environment."""
+    from backend.ai_models.food_classification.food_classifier import FoodClassifier
+
+    classifier = FoodClassifier(model_base_path=os.environ['BENCH_MODEL_DIR'])
+    classifier.compile_inference(warmup=True)
+    classifier.enable_batching(16, 5.0)
+    return classifier
+
+
+def api_process(workers, clients, seconds, results):
+    import psutil
+
+    pool = None
+    if workers:
+        from backend.utils.inference_pool import InferencePool, RemoteClassifier
+        pool = InferencePool({'food': load_classifier}, workers=workers, threads_per_worker=16).start()
+        pool.wait_ready(600)
+        while pool.stats()['ready_workers'] < workers:
+            time.sleep(0.1)
+        classifier = RemoteClassifier(pool, 'food')
+    else:
+        classifier = load_classifier()
+    classifier.predict_food(IMAGE_PATH)
+
+    counts = [0] * clients
+    json_timings = []
+    deadline = time.perf_counter() + seconds
+
+    def client(index):
+        while time.perf_counter() < deadline:
+            if not classifier.predict_food(IMAGE_PATH):
+                raise SystemExit("Prediction failed")
+            counts[index] += 1
+
+    def json_endpoint():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            json.dumps(RECIPES)
+            json_timings.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    threads.append(threading.Thread(target=json_endpoint))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    throughput = sum(counts) / (time.perf_counter() - start)
+
+    rss_mb = psutil.Process().memory_info().rss / 1024 / 1024
+    results.put((throughput, float(np.percentile(json_timings, 50)), float(np.percentile(json_timings, 99)),
+                 rss_mb, 'tensorflow' in sys.modules))
+    if pool is not None:
+        pool.close()
+
+
+def collect(process, results):
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"Benchmark process exited with code {process.exitcode}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--workers', default='1,2')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=15.0)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_inference_pool_')
+    try:
+        model_dir = CLASSIFIER_DIR
+        if not os.path.exists(os.path.join(CLASSIFIER_DIR, 'food_model.keras')):
+            print("food_model.keras not found; using an untrained MobileNetV2 stand-in.")
+            model_dir = work_dir
+            build_standin(model_dir)
+        os.environ['BENCH_MODEL_DIR'] = model_dir
+
+        context = multiprocessing.get_context('spawn')
+        print(f"{os.cpu_count()} CPUs, {args.clients} classifying clients")
+        print(f"{'mode':>11} {'img/s':>7} {'json p50 ms':>12} {'json p99 ms':>12} {'API RSS MB':>11} {'TF in API':>10}")
+        for workers in [0] + [int(w) for w in args.workers.split(',')]:
+            results = context.Queue()
+            process = context.Process(target=api_process, args=(workers, args.clients, args.seconds, results))
+            process.start()
+            throughput, p50, p99, rss_mb, tf_imported = collect(process, results)
+            process.join()
+            mode = f"pool:{workers}" if workers else 'in-process'
+            print(f"{mode:>11} {throughput:>7.1f} {p50:>12.2f} {p99:>12.2f} {rss_mb:>11.0f} {str(tf_imported):>10}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
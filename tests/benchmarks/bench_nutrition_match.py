@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: indexed vs full-scan fuzzy food matching in OfflineNutritionLookup.
+
+Compares _match_food (token index shortlist, then fuzzy scoring) with
+_match_food_scan (fuzzy scoring over every description, then regex filter).
+The scan can only keep base-word matches that also made the overall fuzzy
+top 10, so the indexed path typically resolves more of the queries.
+
+Uses the USDA CSVs in backend/ai_models/nutrition_lookup/Data when food.csv and
+food_nutrient.csv are present. Otherwise a food table is synthesised from the
+names in FOOD-DATA.csv, replicated with preparation suffixes up to --rows.
+
+Usage:
+    python tests/benchmarks/bench_nutrition_match.py [--data-folder DIR] [--rows N] [--repeat N]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pandas as pd
+
+from backend.ai_models.nutrition_lookup.nutrition_lookup import OfflineNutritionLookup
+
+USDA_DATA_FOLDER = os.path.join(PROJECT_ROOT, 'backend', 'ai_models', 'nutrition_lookup', 'Data')
+FOOD_DATA_CSV = os.path.join(PROJECT_ROOT, 'backend', 'ai_models', 'food_data', 'Data', 'FOOD-DATA.csv')
+QUERIES = ['Pizza', 'Apple', 'apples', 'chicken breast', 'Banana', 'cheddar cheese', 'eggs', 'brown rice',
+           'salmon', 'Caesar Salad', 'unknownfood']
+SUFFIXES = ['', ', raw', ', cooked', ', boiled', ', frozen', ', canned', ', dried', ', fried', ', baked', ', roasted']
+
+
+def build_synthetic_folder(rows):
+    folder = tempfile.mkdtemp(prefix='bench_nutrition_')
+    names = pd.read_csv(FOOD_DATA_CSV)['food'].str.strip().tolist()
+    descriptions = []
+    while len(descriptions) < rows:
+        batch = len(descriptions) // len(names)
+        suffix = SUFFIXES[batch % len(SUFFIXES)] + (f" {batch}" if batch >= len(SUFFIXES) else '')
+        descriptions.extend(f"{name.capitalize()}{suffix}" for name in names)
+    descriptions = descriptions[:rows]
+
+    pd.DataFrame({'fdc_id': range(1, rows + 1), 'description': descriptions}).to_csv(
+        os.path.join(folder, 'food.csv'), index=False)
+    shutil.copy(os.path.join(USDA_DATA_FOLDER, 'nutrient.csv'), os.path.join(folder, 'nutrient.csv'))
+    pd.DataFrame({'fdc_id': range(1, rows + 1), 'nutrient_id': 1008, 'amount': 100.0}).to_csv(
+        os.path.join(folder, 'food_nutrient.csv'), index=False)
+    return folder
+
+
+def time_calls(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            fn(query)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data-folder', help='Folder with food.csv, nutrient.csv and food_nutrient.csv')
+    parser.add_argument('--rows', type=int, nargs='+', default=[2_000, 20_000, 200_000],
+                        help='Synthetic table sizes when USDA data is not available')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.data_folder:
+        runs = [(args.data_folder, False)]
+    elif all(os.path.exists(os.path.join(USDA_DATA_FOLDER, f)) for f in ('food.csv', 'food_nutrient.csv')):
+        runs = [(USDA_DATA_FOLDER, False)]
+    else:
+        print("USDA food.csv not found; using synthetic descriptions built from FOOD-DATA.csv.")
+        runs = [(build_synthetic_folder(rows), True) for rows in args.rows]
+
+    print(f"{'foods':>10} {'scan p50 ms':>12} {'scan mean':>10} {'index p50 ms':>13} {'index mean':>11} {'speedup':>8} {'matched scan/index':>19}")
+    for folder, is_temp in runs:
+        try:
+            lookup = OfflineNutritionLookup(data_folder=folder, use_cache=False)
+            matched_scan = sum(1 for q in QUERIES if lookup._match_food_scan(q))
+            matched_index = sum(1 for q in QUERIES if lookup._match_food(q))
+            scan = time_calls(lookup._match_food_scan, args.repeat)
+            indexed = time_calls(lookup._match_food, args.repeat)
+            print(f"{len(lookup.food_df):>10} {statistics.median(scan):>12.2f} {statistics.mean(scan):>10.2f} "
+                  f"{statistics.median(indexed):>13.3f} {statistics.mean(indexed):>11.3f} "
+                  f"{statistics.mean(scan) / statistics.mean(indexed):>7.1f}x {f'{matched_scan}/{matched_index} of {len(QUERIES)}':>19}")
+        finally:
+            if is_temp:
+                shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
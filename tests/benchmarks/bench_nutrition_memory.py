@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-worker memory of the nutrition datasets, private copies vs memory-mapped tables.
+
+Starts N worker processes (spawned, like gunicorn workers without --preload) that
+each load OfflineNutritionLookup and NutritionDatabase, read every table once and
+answer a few lookups, then report their memory while all of them are alive:
+
+  private  - the layout before the mmap cache: USDA tables parsed from CSV into
+             pandas/lists (use_cache=False) and FOOD-DATA rows as dicts of dicts.
+  shared   - both datasets loaded from their memory-mapped .npy caches.
+
+RSS counts every resident page, including file pages shared with other workers,
+so the shared layout shows up in USS (pages private to the worker) and PSS
+(shared pages divided between the processes mapping them). "data" columns are
+the growth over each worker's footprint right after imports.
+
+Uses the USDA CSVs in backend/ai_models/nutrition_lookup/Data when food.csv and
+food_nutrient.csv are present, otherwise a synthetic food table of --rows rows.
+
+Usage:
+    python tests/benchmarks/bench_nutrition_memory.py [--workers N] [--rows N] [--data-folder DIR]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psutil
+
+from bench_nutrition_match import FOOD_DATA_CSV, QUERIES, USDA_DATA_FOLDER, build_synthetic_folder
+
+MB = 1024 * 1024
+
+
+def memory_info():
+    info = psutil.Process().memory_full_info()
+    return {'rss': info.rss, 'uss': info.uss, 'pss': getattr(info, 'pss', 0)}
+
+
+def worker(mode, data_folder, csv_path, barrier, results):
+    from backend.ai_models.food_data.nutrition_database import NutritionDatabase
+    from backend.ai_models.nutrition_lookup.nutrition_lookup import OfflineNutritionLookup
+
+    before = memory_info()
+    shared = mode == 'shared'
+    lookup = OfflineNutritionLookup(data_folder=data_folder, use_cache=shared)
+    database = NutritionDatabase(csv_path=csv_path, use_cache=shared)
+    if not shared:
+        # The pre-cache NutritionDatabase held these dicts in every worker.
+        food_data = {name: database.food_data[name] for name in database.food_data}
+        name_lookup = dict(database.name_lookup)
+
+    # Read every table once so each worker has the whole dataset resident.
+    sum(len(description) for description in lookup.food_descriptions)
+    sum(len(description) for description in lookup._descriptions_clean)
+    sum(len(token) for token in lookup.tokens)
+    float(lookup.nutrient_amounts.sum()) + int(lookup.token_positions.sum())
+    for query in QUERIES:
+        lookup.get_nutrition_for_food(query)
+        database.get_food_info(query)
+
+    barrier.wait()
+    results.put((mode, before, memory_info()))
+    barrier.wait()
+
+
+def run_mode(mode, workers, data_folder, csv_path):
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(mode, data_folder, csv_path, barrier, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=200_000, help='Synthetic food rows when USDA data is not available')
+    parser.add_argument('--data-folder', help='Folder with food.csv, nutrient.csv and food_nutrient.csv')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_memory_')
+    try:
+        if args.data_folder:
+            source_folder = args.data_folder
+        elif all(os.path.exists(os.path.join(USDA_DATA_FOLDER, f)) for f in ('food.csv', 'food_nutrient.csv')):
+            source_folder = USDA_DATA_FOLDER
+        else:
+            print(f"USDA food.csv not found; using {args.rows} synthetic descriptions built from FOOD-DATA.csv.")
+            source_folder = build_synthetic_folder(args.rows)
+
+        # Work on copies so the caches written here never touch the real Data folders.
+        data_folder = os.path.join(work_dir, 'usda')
+        os.makedirs(data_folder)
+        for file_name in ('food.csv', 'nutrient.csv', 'food_nutrient.csv'):
+            shutil.copy(os.path.join(source_folder, file_name), os.path.join(data_folder, file_name))
+        if source_folder not in (args.data_folder, USDA_DATA_FOLDER):
+            shutil.rmtree(source_folder, ignore_errors=True)
+        csv_path = os.path.join(work_dir, 'FOOD-DATA.csv')
+        shutil.copy(FOOD_DATA_CSV, csv_path)
+
+        from backend.ai_models.food_data.nutrition_database import NutritionDatabase
+        from backend.ai_models.nutrition_lookup.nutrition_lookup import OfflineNutritionLookup
+        lookup = OfflineNutritionLookup(data_folder=data_folder)
+        NutritionDatabase(csv_path=csv_path)
+        print(f"{len(lookup.food_descriptions)} USDA foods, {args.workers} workers")
+        del lookup
+
+        print(f"{'layout':>8} {'RSS MB':>8} {'USS MB':>8} {'PSS MB':>8} {'data RSS':>9} {'data USS':>9} {'data PSS':>9}")
+        for mode in ('private', 'shared'):
+            samples = run_mode(mode, args.workers, data_folder, csv_path)
+            mean = lambda key, which: statistics.mean(sample[which][key] for sample in samples) / MB
+            grown = lambda key: statistics.mean(sample[2][key] - sample[1][key] for sample in samples) / MB
+            print(f"{mode:>8} {mean('rss', 2):>8.1f} {mean('uss', 2):>8.1f} {mean('pss', 2):>8.1f} "
+                  f"{grown('rss'):>9.1f} {grown('uss'):>9.1f} {grown('pss'):>9.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: personalized recipe listing, allergen subqueries vs precomputed allergen masks.
+
+Fills an in-memory sqlite database with N public recipes of 8 ingredients each
+(a quarter of the ingredients carry one of 20 allergies), then times the first
+page of RecipeDAO.get_personalized_recipes_for_user for a user with 3 allergies:
+
+  subqueries - the previous filter: collect allergic ingredient ids, then the
+               recipes using them, then NOT IN that id list.
+  masks      - the (Recipes.AllergenMask & user_mask) = 0 predicate.
+
+Usage:
+    python tests/benchmarks/bench_personalized_recipes.py [--recipes 1000 10000 50000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from flask import Flask
+
+from backend.db import db
+from backend.dao import IngredientDAO, RecipeDAO
+from backend.models import Ingredient, Recipe, RecipeIngredient, User, UserAllergy, AllergyIntolerance
+from backend.models.ingredient import ingredient_allergies_association_table
+
+INGREDIENTS = 2000
+ALLERGIES = 20
+
+
+def populate(recipe_count):
+    random.seed(1)
+    user = User(Name='Cook', Email='cook@example.com', PasswordHash='x')
+    db.session.add(user)
+    db.session.add_all(AllergyIntolerance(id=i, name=f'allergy {i}') for i in range(1, ALLERGIES + 1))
+    db.session.flush()
+    db.session.execute(Ingredient.__table__.insert(), [{'Name': f'ingredient {i}', 'AllergenMask': 0}
+                                                       for i in range(1, INGREDIENTS + 1)])
+    db.session.execute(ingredient_allergies_association_table.insert(), [
+        {'ingredient_id': i, 'allergy_intolerance_id': random.randint(1, ALLERGIES)}
+        for i in range(1, INGREDIENTS + 1, 4)])
+    db.session.execute(Recipe.__table__.insert(), [
+        {'UserID': user.UserID, 'Title': f'Recipe {i}', 'Instructions': 'Mix.', 'is_public': True, 'AllergenMask': 0}
+        for i in range(recipe_count)])
+    db.session.execute(RecipeIngredient.__table__.insert(), [
+        {'RecipeID': recipe_id, 'IngredientID': ingredient_id, 'Quantity': '1', 'Unit': 'cup'}
+        for recipe_id in range(1, recipe_count + 1)
+        for ingredient_id in random.sample(range(1, INGREDIENTS + 1), 8)])
+    IngredientDAO().rebuild_allergen_masks()
+    db.session.add_all(UserAllergy(UserID=user.UserID, AllergyID=allergy_id) for allergy_id in (3, 7, 11))
+    db.session.commit()
+    return user.UserID
+
+
+def subquery_page(user_id, limit=12):
+    user_allergy_ids = [ual.AllergyID for ual in UserAllergy.query.filter_by(UserID=user_id).all()]
+    recipes_query = Recipe.query.filter(Recipe.is_public == True)
+    allergic_ingredient_ids = [row[0] for row in db.session.query(ingredient_allergies_association_table.c.ingredient_id)
+                               .filter(ingredient_allergies_association_table.c.allergy_intolerance_id.in_(user_allergy_ids))
+                               .distinct().all()]
+    recipes_to_exclude_ids = [row[0] for row in db.session.query(RecipeIngredient.RecipeID)
+                              .filter(RecipeIngredient.IngredientID.in_(allergic_ingredient_ids)).distinct().all()]
+    recipes_query = recipes_query.filter(Recipe.RecipeID.notin_(recipes_to_exclude_ids))
+    return recipes_query.order_by(Recipe.CreatedAt.desc()).limit(limit).all()
+
+
+def mask_page(user_id, limit=12):
+    user_allergy_ids = [ual.AllergyID for ual in UserAllergy.query.filter_by(UserID=user_id).all()]
+    recipes_query = Recipe.query.filter(Recipe.is_public == True,
+                                        RecipeDAO().allergen_exclusion_filter(user_allergy_ids))
+    return recipes_query.order_by(Recipe.CreatedAt.desc()).limit(limit).all()
+
+
+def time_ms(fn, user_id, repeats=20):
+    timings = []
+    for _ in range(repeats):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn(user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--recipes', type=int, nargs='+', default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'recipes':>8} {'excluded':>9} {'subqueries ms':>14} {'masks ms':>9}")
+    for recipe_count in args.recipes:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            user_id = populate(recipe_count)
+            expected = [recipe.RecipeID for recipe in subquery_page(user_id)]
+            if [recipe.RecipeID for recipe in mask_page(user_id)] != expected:
+                raise SystemExit("Mask filter returned a different page")
+            excluded = recipe_count - Recipe.query.filter(
+                RecipeDAO().allergen_exclusion_filter([3, 7, 11])).count()
+            print(f"{recipe_count:>8} {excluded:>9} {time_ms(subquery_page, user_id):>14.2f} "
+                  f"{time_ms(mask_page, user_id):>9.2f}")
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: spaCy pipelines loaded per consumer vs shared through spacy_registry.
+
+Each mode runs in a fresh spawned process that sets up the two spaCy consumers,
+FoodChatbot and SubstitutionRecommender:
+
+  separate  - the layout before the registry: the chatbot loads the full model and
+              the recommender loads a second copy with parser and ner disabled.
+  registry  - one shared load (ner excluded) handed out as a view per consumer.
+
+It reports load time and process RSS growth, then per-text latency for each consumer:
+the chatbot's pipeline no longer runs ner, and the recommender's view runs tok2vec,
+tagger, attribute_ruler and lemmatizer as its own parser/ner-disabled copy did.
+
+Uses --model (default en_core_web_sm) when it is installed, otherwise a stand-in
+pipeline with the same tok2vec/tagger/parser/attribute_ruler/ner layout built
+from spaCy's efficiency config. The stand-in has no lemmatizer, as rule
+lemmatizer tables are not bundled with spaCy.
+
+Usage:
+    python tests/benchmarks/bench_spacy_pipelines.py [--model NAME_OR_PATH] [--texts N]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import psutil
+
+MB = 1024 * 1024
+CHATBOT_COMPONENTS = ('tagger', 'parser', 'lemmatizer')
+RECOMMENDER_COMPONENTS = ('tagger', 'lemmatizer')
+INGREDIENTS = ['unsalted butter', 'extra virgin olive oil', 'fresh basil leaves', 'skim milk', 'brown sugar',
+               'all purpose flour', 'large eggs', 'dark chocolate chips', 'smoked paprika', 'greek yogurt']
+
+
+def build_standin(path):
+    import spacy
+    from spacy.cli.init_config import init_config
+    from spacy.training import Example
+
+    nlp = spacy.util.load_model_from_config(
+        init_config(lang='en', pipeline=['tagger', 'parser', 'ner'], optimize='efficiency'), auto_fill=True)
+    nlp.add_pipe('attribute_ruler', after='parser')
+    annotations = {'tags': ['PRP', 'VBP', 'NN', 'IN', 'DT', 'NN'], 'heads': [1, 1, 1, 1, 5, 3],
+                   'deps': ['nsubj', 'ROOT', 'dobj', 'prep', 'det', 'pobj'], 'entities': ['O'] * 6}
+    examples = [Example.from_dict(nlp.make_doc("I need butter for the cake"), annotations)]
+    nlp.initialize(lambda: examples)
+    nlp.to_disk(path)
+
+
+def worker(mode, model, texts, results):
+    import spacy
+    from backend.utils.spacy_registry import spacy_registry
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    if mode == 'separate':
+        chatbot_nlp = spacy.load(model)
+        recommender_nlp = spacy.load(model, disable=['parser', 'ner'])
+    else:
+        chatbot_nlp = spacy_registry.get(model, CHATBOT_COMPONENTS)
+        recommender_nlp = spacy_registry.get(model, RECOMMENDER_COMPONENTS)
+    load_seconds = time.perf_counter() - start
+    rss_mb = (process.memory_info().rss - rss_before) / MB
+
+    timings = {}
+    for consumer, nlp in (('chatbot', chatbot_nlp), ('recommender', recommender_nlp)):
+        timings[consumer] = []
+        for text in texts:
+            start = time.perf_counter()
+            nlp(text)
+            timings[consumer].append((time.perf_counter() - start) * 1000)
+    results.put((mode, load_seconds, rss_mb, timings))
+
+
+def run_mode(mode, model, texts):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=worker, args=(mode, model, texts, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default='en_core_web_sm')
+    parser.add_argument('--texts', type=int, default=2000)
+    args = parser.parse_args()
+
+    import spacy
+
+    work_dir = tempfile.mkdtemp(prefix='bench_spacy_')
+    try:
+        model = args.model
+        if not spacy.util.is_package(model) and not os.path.isdir(model):
+            print(f"'{model}' is not installed; using a stand-in pipeline built from spaCy's efficiency config.")
+            model = os.path.join(work_dir, 'standin')
+            build_standin(model)
+
+        texts = [f"what can I use instead of {INGREDIENTS[i % len(INGREDIENTS)]} {i}" for i in range(args.texts)]
+        print(f"{'mode':>10} {'load s':>8} {'RSS MB':>8} {'chatbot ms':>11} {'recommender ms':>15}  (mean per text)")
+        for mode in ('separate', 'registry'):
+            mode, load_seconds, rss_mb, timings = run_mode(mode, model, texts)
+            print(f"{mode:>10} {load_seconds:>8.2f} {rss_mb:>8.1f} {statistics.mean(timings['chatbot']):>11.3f} "
+                  f"{statistics.mean(timings['recommender']):>15.3f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
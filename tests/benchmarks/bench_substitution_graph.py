@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the precomputed substitution graph artifact.
+
+Builds the graph from sub_normalized.csv, writes it as memory-mapped tables and
+reports:
+
+  - build time, artifact size on disk and how long a recommender takes to open the
+    artifact (no CSV parse, no graph build);
+  - coverage: the share of ingredients with at least --top-n suggestions using
+    direct substitutions only (the previous behaviour) vs direct plus 2-hop;
+  - query latency of SubstitutionGraph.ranked over a sample of ingredients.
+
+Uses backend/ai_models/substitution_models/sub_normalized.csv when present (or
+--data-file), otherwise the synthetic CSV from bench_substitution_lookup.
+
+Usage:
+    python tests/benchmarks/bench_substitution_graph.py [--rows N] [--vocabulary N] [--top-n N] [--data-file PATH]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import spacy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_substitution_lookup import SUBSTITUTES_CSV, build_synthetic_csv  # noqa: E402
+from backend.ai_models.substitution_models import substitution_graph  # noqa: E402
+from backend.ai_models.substitution_models.substitution_recommender import SubstitutionRecommender  # noqa: E402
+
+
+def coverage(tables, top_n, hops):
+    """Share of ingredients with at least top_n candidates of at most the given hop count."""
+    ingredient_ids = np.repeat(np.arange(len(tables['offsets']) - 1), np.diff(tables['offsets']))
+    counts = np.bincount(ingredient_ids[tables['hops'] <= hops], minlength=len(tables['offsets']) - 1)
+    return float(np.mean(counts >= top_n))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=1_700_000)
+    parser.add_argument('--vocabulary', type=int, default=20_000, help='Distinct names in the synthetic CSV')
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--data-file')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_substitution_graph_')
+    try:
+        data_file = args.data_file or SUBSTITUTES_CSV
+        if not os.path.exists(data_file):
+            print(f"sub_normalized.csv not found; using {args.rows} synthetic rows built from FOOD-DATA.csv.")
+            data_file = os.path.join(work_dir, 'sub_normalized.csv')
+            build_synthetic_csv(data_file, args.rows, args.vocabulary)
+        cache_dir = os.path.join(work_dir, 'graph_cache')
+        pipeline_dir = os.path.join(work_dir, 'blank_en')
+        spacy.blank('en').to_disk(pipeline_dir)
+
+        start = time.perf_counter()
+        df = pd.read_csv(data_file)
+        read_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        tables = substitution_graph.build_tables(df)
+        build_seconds = time.perf_counter() - start
+        artifact_dir = substitution_graph.save_tables(data_file, tables, cache_dir)
+        size = sum(os.path.getsize(os.path.join(artifact_dir, f)) for f in os.listdir(artifact_dir))
+
+        start = time.perf_counter()
+        recommender = SubstitutionRecommender(data_file_path=data_file, spacy_model_name=pipeline_dir,
+                                              graph_cache_dir=cache_dir)
+        open_seconds = time.perf_counter() - start
+        if not recommender.is_ready() or recommender._df_substitutes is not None:
+            raise SystemExit("Recommender did not load the artifact")
+
+        graph = recommender.substitute_graph
+        print(f"{len(df)} rows, {len(graph)} ingredients, {len(tables['candidates'])} candidates "
+              f"({int(np.count_nonzero(tables['hops'] == 2))} via 2 hops)")
+        print(f"CSV read {read_seconds:.2f} s, graph build {build_seconds:.2f} s, "
+              f"artifact {size / 1024 / 1024:.1f} MB, recommender load from artifact {open_seconds * 1000:.0f} ms")
+        print(f"ingredients with >= {args.top_n} suggestions: direct {coverage(tables, args.top_n, 1):.1%}, "
+              f"direct + 2-hop {coverage(tables, args.top_n, 2):.1%}")
+
+        rng = np.random.default_rng(5)
+        names = [graph.names[i] for i in rng.integers(0, len(graph.names), args.queries).tolist()]
+        timings = []
+        for name in names:
+            start = time.perf_counter()
+            graph.ranked(name, args.top_n)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"ranked(): p50 {statistics.median(timings):.4f} ms, mean {statistics.mean(timings):.4f} ms, "
+              f"max {max(timings):.4f} ms over {len(timings)} queries")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
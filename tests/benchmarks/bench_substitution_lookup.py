@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SubstitutionRecommender.get_substitutes, per-call DataFrame filtering vs the precomputed graph.
+
+The DataFrame path is the original get_substitutes: two boolean-mask scans of
+df_substitutes and a value_counts() ranking on every call. The graph path is the
+precomputed substitution graph (built in memory here, without the artifact). Every
+direct candidate the graph returns must carry the DataFrame path's score; the time
+to build the graph is reported separately.
+
+Uses backend/ai_models/substitution_models/sub_normalized.csv when present (or
+--data-file), otherwise a synthetic CSV of --rows rows over --vocabulary names
+derived from FOOD-DATA with a Zipf-like popularity, roughly the shape of the real
+~1.7M-row file. A blank spaCy pipeline is used so the timings do not depend on
+en_core_web_sm being installed.
+
+Usage:
+    python tests/benchmarks/bench_substitution_lookup.py [--rows N] [--vocabulary N] [--queries N] [--data-file PATH]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+import spacy
+
+from backend.ai_models.substitution_models import substitution_graph
+from backend.ai_models.substitution_models.substitution_recommender import SubstitutionRecommender
+
+SUBSTITUTES_CSV = os.path.join(PROJECT_ROOT, 'backend', 'ai_models', 'substitution_models', 'sub_normalized.csv')
+FOOD_DATA_CSV = os.path.join(PROJECT_ROOT, 'backend', 'ai_models', 'food_data', 'Data', 'FOOD-DATA.csv')
+
+
+MODIFIERS = ['', 'fresh', 'frozen', 'dried', 'canned', 'organic', 'low fat', 'smoked', 'ground', 'raw',
+             'roasted', 'sweet', 'unsalted', 'whole', 'powdered', 'sliced', 'minced', 'light', 'dark', 'baby']
+
+
+def build_synthetic_csv(path, rows, vocabulary=20_000):
+    rng = np.random.default_rng(11)
+    foods = pd.read_csv(FOOD_DATA_CSV)['food'].str.strip().str.lower().drop_duplicates().tolist()
+    names = np.array(list(dict.fromkeys(f"{modifier} {food}".strip() for modifier in MODIFIERS for food in foods))[:vocabulary],
+                     dtype=object)
+    rng.shuffle(names)
+    popularity = 1.0 / np.arange(1, len(names) + 1)
+    popularity /= popularity.sum()
+    pd.DataFrame({
+        'normalized_ingredient': rng.choice(names, rows, p=popularity),
+        'normalized_substitute': rng.choice(names, rows, p=popularity),
+    }).to_csv(path, index=False)
+
+
+def dataframe_substitutes(recommender, input_ingredient, top_n=5):
+    normalized_input = recommender.normalize_ingredient(input_ingredient)
+    df = recommender.df_substitutes
+    all_subs_list = df[df['normalized_ingredient'] == normalized_input]['normalized_substitute'].tolist() + \
+        df[df['normalized_substitute'] == normalized_input]['normalized_ingredient'].tolist()
+    if not all_subs_list:
+        return []
+    sub_counts = pd.Series(all_subs_list).value_counts().reset_index()
+    sub_counts.columns = ['name', 'score']
+    sub_counts['score'] = sub_counts['score'] / sub_counts['score'].max()
+    sub_counts_sorted = sub_counts.sort_values(by=['score', 'name'], ascending=[False, True])
+    return sub_counts_sorted.head(top_n).to_dict(orient='records')
+
+
+def time_calls(fn, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=1_700_000)
+    parser.add_argument('--vocabulary', type=int, default=20_000, help='Distinct names in the synthetic CSV')
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--data-file')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_substitution_')
+    try:
+        data_file = args.data_file or SUBSTITUTES_CSV
+        if not os.path.exists(data_file):
+            print(f"sub_normalized.csv not found; using {args.rows} synthetic rows built from FOOD-DATA.csv.")
+            data_file = os.path.join(work_dir, 'sub_normalized.csv')
+            build_synthetic_csv(data_file, args.rows, args.vocabulary)
+        pipeline_dir = os.path.join(work_dir, 'blank_en')
+        spacy.blank('en').to_disk(pipeline_dir)
+
+        start = time.perf_counter()
+        recommender = SubstitutionRecommender(data_file_path=data_file, spacy_model_name=pipeline_dir,
+                                              use_graph_cache=False)
+        load_seconds = time.perf_counter() - start
+        if not recommender.is_ready():
+            raise SystemExit("Recommender failed to load")
+        start = time.perf_counter()
+        substitution_graph.build_tables(recommender.df_substitutes)
+        graph_seconds = time.perf_counter() - start
+
+        counts = pd.concat([recommender.df_substitutes['normalized_ingredient'],
+                            recommender.df_substitutes['normalized_substitute']]).value_counts()
+        step = max(1, len(counts) // args.queries)
+        queries = counts.index[::step][:args.queries].tolist() + ['unknown ingredient']
+        for query in queries:
+            expected = {r['name']: r['score'] for r in dataframe_substitutes(recommender, query, top_n=None)}
+            for name, score, hops in recommender.substitute_graph.ranked(query, top_n=5, include_hops=True):
+                if hops == 1 and expected.get(name) != score:
+                    raise SystemExit(f"Mismatch for '{query}' -> '{name}'")
+
+        print(f"{len(recommender.df_substitutes)} rows, {len(recommender.substitute_graph)} ingredients, "
+              f"load {load_seconds:.2f} s (graph build {graph_seconds:.2f} s), {len(queries)} queries")
+        print(f"{'method':>10} {'p50 ms':>10} {'mean ms':>10} {'max ms':>10}")
+        frame = time_calls(lambda query: dataframe_substitutes(recommender, query), queries)
+        graph = time_calls(recommender.get_substitutes, queries)
+        for label, timings in (('dataframe', frame), ('graph', graph)):
+            print(f"{label:>10} {statistics.median(timings):>10.4f} {statistics.mean(timings):>10.4f} "
+                  f"{max(timings):>10.4f}")
+        print(f"speedup: {statistics.mean(frame) / statistics.mean(graph):.0f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Keras vs quantized TFLite classifier backends - accuracy delta, throughput and memory.
+
+For the food and ingredient classifiers, converts the model to dynamic-range and int8
+TFLite files (int8 calibrated on tests/*.jpg) and loads each backend in a fresh spawned
+process. Every backend classifies the same evaluation set, --eval-images random crops and
+flips of the test images, and reports:
+
+  size MB       - model file on disk
+  load RSS MB   - resident memory added by loading the model and serving one image
+                  (Keras includes tracing the compiled inference function)
+  1-img p50 ms  - single-image latency
+  batch img/s   - throughput with batches of --batch-size images
+  top-1 agree   - share of images whose top class matches the Keras backend
+  max |dp|      - largest absolute probability difference from the Keras backend
+
+Uses the real .keras models when present, otherwise untrained MobileNetV2 stand-ins. An
+untrained model's probabilities are nearly flat, so there top-1 agreement understates what
+a trained model gives and max |dp| is the more telling number.
+
+Usage:
+    python tests/benchmarks/bench_tflite_backend.py [--eval-images N] [--batch-size N] [--requests N]
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+
+from backend.ai_models.tflite_conversion import calibration_images  # noqa: E402
+
+TESTS_DIR = os.path.join(PROJECT_ROOT, 'tests')
+TEST_IMAGES = [os.path.join(TESTS_DIR, 'apple.jpg'), os.path.join(TESTS_DIR, 'pizza.jpg')]
+MODELS = {
+    'food': ('food_classification', 'food_model'),
+    'ingredient': ('ingredient_classification', 'ingredient_model'),
+}
+
+
+def make_classifier(kind, model_dir, backend='keras', tflite_file_name=None):
+    if kind == 'food':
+        from backend.ai_models.food_classification.food_classifier import FoodClassifier
+        return FoodClassifier(model_base_path=model_dir, backend=backend,
+                              tflite_file_name=tflite_file_name or 'food_model.tflite')
+    from backend.ai_models.ingredient_classification.ingredient_classifier import FoodIngredientClassifier
+    return FoodIngredientClassifier(model_base_path=model_dir, backend=backend,
+                                    tflite_file_name=tflite_file_name or 'ingredient_model.tflite')
+
+
+def prepare_model_dir(kind, work_dir):
+    """The real model directory when its .keras file exists, otherwise a directory with an untrained stand-in."""
+    import tensorflow as tf
+
+    folder, stem = MODELS[kind]
+    source_dir = os.path.join(PROJECT_ROOT, 'backend', 'ai_models', folder)
+    model_dir = os.path.join(work_dir, kind)
+    os.makedirs(model_dir)
+    shutil.copy(os.path.join(source_dir, 'class_names.json'), model_dir)
+    keras_path = os.path.join(source_dir, f"{stem}.keras")
+    if os.path.exists(keras_path):
+        shutil.copy(keras_path, model_dir)
+        return model_dir, False
+    with open(os.path.join(source_dir, 'class_names.json')) as f:
+        num_classes = len(json.load(f))
+    model = tf.keras.applications.MobileNetV2(weights=None, input_shape=(224, 224, 3), classes=num_classes)
+    model.save(os.path.join(model_dir, f"{stem}.keras"))
+    return model_dir, True
+
+
+def worker(kind, model_dir, backend, tflite_file_name, eval_images, batch_size, requests, results):
+    import psutil
+
+    make_classifier(kind, os.path.join(model_dir, 'missing'))  # imports the classifier module and TensorFlow
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    classifier = make_classifier(kind, model_dir, 'keras' if backend == 'keras' else 'tflite', tflite_file_name)
+    classifier.compile_inference(warmup=True)
+    classifier.predict_batch(classifier.preprocess_image(classifier.load_image(eval_images[0])))
+    rss_after = process.memory_info().rss
+    batch = np.concatenate([classifier.preprocess_image(classifier.load_image(data)) for data in eval_images])
+    probabilities = classifier.predict_batch(batch)
+
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        classifier.predict_batch(batch[i % len(batch):][:1])
+        timings.append((time.perf_counter() - start) * 1000)
+
+    batches = [batch[i:i + batch_size] for i in range(0, len(batch) - batch_size + 1, batch_size)] or [batch]
+    start = time.perf_counter()
+    for chunk in batches * 3:
+        classifier.predict_batch(chunk)
+    throughput = sum(len(chunk) for chunk in batches) * 3 / (time.perf_counter() - start)
+    results.put((probabilities, (rss_after - rss_before) / 1024 / 1024, float(np.percentile(timings, 50)), throughput))
+
+
+def collect(process, results):
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"Benchmark worker exited with code {process.exitcode}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--eval-images', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    eval_images = []
+    for img in calibration_images(TEST_IMAGES, args.eval_images, seed=1):
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=90)
+        eval_images.append(buffer.getvalue())
+
+    from backend.ai_models.tflite_conversion import convert_classifier
+
+    work_dir = tempfile.mkdtemp(prefix='bench_tflite_')
+    context = multiprocessing.get_context('spawn')
+    try:
+        for kind, (_, stem) in MODELS.items():
+            model_dir, standin = prepare_model_dir(kind, work_dir)
+            print(f"\n{kind} classifier{' (untrained MobileNetV2 stand-in)' if standin else ''}, "
+                  f"{len(eval_images)} evaluation images")
+            classifier = make_classifier(kind, model_dir)
+            files = {'keras': f"{stem}.keras"}
+            for quantization in ('dynamic', 'int8'):
+                files[quantization] = f"{stem}_{quantization}.tflite"
+                tflite_model = convert_classifier(classifier, quantization, TEST_IMAGES, calibration_samples=64)
+                with open(os.path.join(model_dir, files[quantization]), 'wb') as f:
+                    f.write(tflite_model)
+            del classifier
+
+            print(f"{'backend':>8} {'size MB':>8} {'load RSS MB':>12} {'1-img p50 ms':>13} {'batch img/s':>12} "
+                  f"{'top-1 agree':>12} {'max |dp|':>9}")
+            reference = None
+            for backend, file_name in files.items():
+                results = context.Queue()
+                process = context.Process(target=worker, args=(kind, model_dir, backend, file_name, eval_images,
+                                                               args.batch_size, args.requests, results))
+                process.start()
+                probabilities, rss_mb, p50, throughput = collect(process, results)
+                process.join()
+                if reference is None:
+                    reference = probabilities
+                agreement = np.mean(probabilities.argmax(axis=1) == reference.argmax(axis=1))
+                size_mb = os.path.getsize(os.path.join(model_dir, file_name)) / 1024 / 1024
+                print(f"{backend:>8} {size_mb:>8.1f} {rss_mb:>12.0f} {p50:>13.1f} {throughput:>12.0f} "
+                      f"{agreement:>12.1%} {np.abs(probabilities - reference).max():>9.4f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,15 @@ from unittest.mock import MagicMock
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 
+@pytest.fixture(autouse=True)
+def fresh_spacy_registry():
+    """Tests patch spacy.load, so pipelines must not leak between them through the shared registry."""
+    from backend.utils.spacy_registry import spacy_registry
+    spacy_registry.clear()
+    yield
+    spacy_registry.clear()
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files."""
@@ -225,6 +225,45 @@ class TestAllergyAnalyzer(unittest.TestCase):
         self.assertEqual(set(analyzer.df.columns), expected_columns)
         self.assertEqual(set(allergies), {'tree nuts', 'dairy products'})
 
+    def test_matcher_matches_row_scan_on_shipped_csv(self):
+        """Test that the automaton returns the same allergens as testing every CSV row by substring."""
+        analyzer = AllergyAnalyzer()
+        allergy_columns = [col for col in analyzer.df.columns if col != 'food']
+
+        def scan(ingredient_name):
+            allergies = set()
+            for _, row in analyzer.df.iterrows():
+                if row['food'] in ingredient_name.lower():
+                    allergies.update(col.replace('_', ' ') for col in allergy_columns if row[col] == 1)
+            return allergies
+
+        foods = analyzer.df['food'].tolist()
+        queries = foods + [food.upper() + ' sauce' for food in foods[::7]]
+        queries += [' and '.join(foods[i:i + 3]) for i in range(0, len(foods), 11)]
+        queries += ['', 'water', 'peanut butter cookies with milk chocolate']
+        for query in queries:
+            self.assertEqual(set(analyzer.get_allergies(query)), scan(query), query)
+
+    def test_allergen_mask_round_trip(self):
+        """Test that a mask maps back to the allergens, in column order."""
+        analyzer = AllergyAnalyzer(csv_file_path=self.csv_path)
+
+        mask = analyzer.get_allergen_mask("peanuts and milk")
+
+        self.assertEqual(analyzer.allergens_for_mask(mask), ['dairy', 'peanuts'])
+        self.assertEqual(analyzer.get_allergen_mask("water"), 0)
+
+    def test_analyze_many(self):
+        """Test that analyze_many returns get_allergies for every distinct name."""
+        analyzer = AllergyAnalyzer(csv_file_path=self.csv_path)
+        names = ["peanut butter", "Milk", "water", "peanut butter"]
+
+        result = analyzer.analyze_many(names)
+
+        self.assertEqual(list(result), ["peanut butter", "Milk", "water"])
+        for name in names:
+            self.assertEqual(result[name], analyzer.get_allergies(name))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,142 @@
+import unittest
+import unittest.mock
+import os
+import sys
+import random
+import shutil
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from flask import Flask
+
+from backend.db import db
+from backend.ai_models.food_data.nutrition_database import NutritionDatabase
+from backend.dao import IngredientDAO
+from backend.models import Ingredient, Recipe, RecipeIngredient, User
+from backend.services.main import autocomplete_service
+from backend.services.main.autocomplete_service import AutocompleteService, AUTOCOMPLETE_MODEL
+from backend.services.main.food_lookup_service import FOOD_DATABASE_MODEL
+from backend.utils.model_loader import ModelLoader
+from backend.utils.prefix_trie import PrefixTrie
+
+
+class TestPrefixTrie(unittest.TestCase):
+
+    def test_matches_brute_force_ranking(self):
+        """Test that every prefix returns the same top-k as sorting all matching terms by weight."""
+        random.seed(7)
+        words = ['apple', 'apple pie', 'applesauce', 'apricot', 'banana', 'banana bread', 'band', 'bean',
+                 'beans', 'beef', 'beef stew', 'beet', 'a', 'ab', 'abc']
+        trie = PrefixTrie(max_k=3)
+        weights = {}
+        for _ in range(200):
+            word = random.choice(words)
+            weight = random.randint(1, 4)
+            trie.add(word, weight)
+            weights[word] = weights.get(word, 0) + weight
+
+        prefixes = {word[:i] for word in words for i in range(1, len(word) + 1)} | {'x', 'apz', 'beefy'}
+        for prefix in prefixes:
+            expected = sorted((w for w in weights if w.startswith(prefix)), key=lambda w: (-weights[w], w))[:3]
+            self.assertEqual([name for name, _ in trie.complete(prefix)], expected, prefix)
+
+    def test_normalizes_case_and_whitespace(self):
+        """Test that keys are case-insensitive and keep the first spelling for display."""
+        trie = PrefixTrie()
+        trie.add('Chicken  Breast')
+        trie.add('chicken breast', 2)
+
+        self.assertEqual(trie.complete('CHICKEN b'), [('Chicken Breast', 3)])
+        self.assertIn('chicken breast', trie)
+        self.assertEqual(len(trie), 1)
+
+
+class TestAutocompleteService(unittest.TestCase):
+
+    def setUp(self):
+        """Build an in-memory app with a few ingredients and a small FOOD-DATA table."""
+        self.test_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(self.test_dir, 'food_data.csv')
+        with open(csv_path, 'w') as f:
+            f.write("food,Protein\nchicken breast,31\nchickpeas,19\ncheddar cheese,25\n")
+
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        with self.app.app_context():
+            db.create_all()
+            user = User(Name='Cook', Email='cook@example.com', PasswordHash='x')
+            db.session.add(user)
+            db.session.flush()
+            recipe = Recipe(UserID=user.UserID, Title='Curry', Instructions='Simmer.')
+            db.session.add(recipe)
+            for name in ['Chili Flakes', 'Chicken Thigh']:
+                db.session.add(Ingredient(Name=name))
+            db.session.flush()
+            thigh = Ingredient.query.filter_by(Name='Chicken Thigh').first()
+            db.session.add(RecipeIngredient(RecipeID=recipe.RecipeID, IngredientID=thigh.IngredientID,
+                                            Quantity='2', Unit='pcs'))
+            db.session.commit()
+
+        self.loader = ModelLoader()
+        self.loader.register(FOOD_DATABASE_MODEL, lambda: NutritionDatabase(csv_path=csv_path, use_cache=False))
+        self.loader.register(AUTOCOMPLETE_MODEL, lambda: AutocompleteService.build_index(self.app))
+        patcher = unittest.mock.patch.object(autocomplete_service, 'model_loader', self.loader)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = AutocompleteService()
+        instance_patcher = unittest.mock.patch.object(AutocompleteService, '_instance', self.service)
+        instance_patcher.start()
+        self.addCleanup(instance_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_completions_are_weighted_by_recipe_usage(self):
+        """Test that an ingredient used in a recipe outranks names that occur once."""
+        data, error, status = self.service.complete('chi', 5)
+
+        self.assertIsNone(error)
+        self.assertEqual(status, 200)
+        names = [item['name'] for item in data['suggestions']]
+        self.assertEqual(names[0], 'Chicken Thigh')
+        self.assertEqual(set(names), {'Chicken Thigh', 'chicken breast', 'chickpeas', 'Chili Flakes'})
+
+    def test_create_ingredient_refreshes_index(self):
+        """Test that an ingredient created by IngredientDAO is completable once its transaction commits."""
+        self.service.complete('chi', 5)
+        with self.app.app_context():
+            IngredientDAO().create_ingredient('Chives')
+            self.assertEqual(self.service.complete('chiv', 5)[0]['suggestions'], [])
+            db.session.commit()
+
+        data, _, _ = self.service.complete('chiv', 5)
+        self.assertEqual([item['name'] for item in data['suggestions']], ['Chives'])
+
+    def test_rolled_back_ingredients_are_not_suggested(self):
+        """Test that ingredients created in a transaction that rolls back never reach the index."""
+        self.service.complete('chi', 5)
+        with self.app.app_context():
+            dao = IngredientDAO()
+            dao.create_ingredient('Chives')
+            dao.get_or_create_ingredients(['Chia Seeds', 'Chili Flakes'])
+            db.session.rollback()
+            # A later commit in the same session does not bring them back
+            dao.create_ingredient('Chard')
+            db.session.commit()
+
+        names = [item['name'] for item in self.service.complete('ch', 10)[0]['suggestions']]
+        self.assertIn('Chard', names)
+        self.assertNotIn('Chives', names)
+        self.assertNotIn('Chia Seeds', names)
+
+    def test_invalid_requests(self):
+        """Test that empty prefixes and out-of-range limits are rejected."""
+        self.assertEqual(self.service.complete('  ', 5)[2], 400)
+        self.assertEqual(self.service.complete('chi', 0)[2], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
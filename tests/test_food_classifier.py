@@ -181,7 +181,7 @@ class TestFoodClassifier(unittest.TestCase):
         
         mock_model = MagicMock()
         mock_predictions = np.array([[0.1, 0.8, 0.05, 0.05]])  # High confidence for "apple"
-        mock_model.predict.return_value = mock_predictions
+        mock_model.return_value = mock_predictions
         mock_load_model.return_value = mock_model
         
         mock_preprocessed_image = np.random.rand(1, 224, 224, 3)
@@ -257,6 +257,58 @@ class TestFoodClassifier(unittest.TestCase):
         
         self.assertEqual(results, [])
 
+    @patch('tensorflow.keras.models.load_model')
+    @patch('backend.ai_models.food_classification.food_classifier.FoodClassifier.preprocess_image')
+    def test_predict_food_batched(self, mock_preprocess, mock_load_model):
+        """Test that concurrent predictions share one forward pass once batching is enabled."""
+        with open(self.model_path, 'w') as f:
+            f.write("mock model")
+
+        mock_model = MagicMock(side_effect=lambda images, training: np.tile([0.1, 0.8, 0.05, 0.05], (len(images), 1)))
+        mock_load_model.return_value = mock_model
+        mock_preprocess.return_value = np.zeros((1, 224, 224, 3))
+
+        classifier = FoodClassifier(
+            model_base_path=self.test_dir,
+            model_file_name="food_model.keras",
+            indices_json_name="class_names.json"
+        )
+        classifier.enable_batching(max_batch_size=4, max_wait_ms=1000)
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: classifier.predict_food("test_image.jpg", top_k=1), range(4)))
+
+        self.assertEqual(results, [[{"name": "Apple", "confidence": 0.8}]] * 4)
+        self.assertEqual(mock_model.call_count, 1)
+        self.assertEqual(mock_model.call_args[0][0].shape, (4, 224, 224, 3))
+
+    @patch('tensorflow.keras.models.load_model')
+    def test_compiled_inference_matches_eager(self, mock_load_model):
+        """Test that the warmed-up tf.function gives the eager model's outputs for any batch size."""
+        import tensorflow as tf
+        with open(self.model_path, 'w') as f:
+            f.write("mock model")
+
+        model = tf.keras.Sequential([
+            tf.keras.Input(shape=(224, 224, 3)),
+            tf.keras.layers.GlobalAveragePooling2D(),
+            tf.keras.layers.Dense(4, activation='softmax')
+        ])
+        mock_load_model.return_value = model
+        classifier = FoodClassifier(
+            model_base_path=self.test_dir,
+            model_file_name="food_model.keras",
+            indices_json_name="class_names.json"
+        )
+        images = np.random.default_rng(0).uniform(-1, 1, (3, 224, 224, 3)).astype(np.float32)
+        eager = classifier.predict_batch(images)
+
+        classifier.compile_inference(warmup=True)
+
+        for batch in (images[:1], images):
+            np.testing.assert_allclose(classifier.predict_batch(batch), eager[:len(batch)], rtol=1e-5, atol=1e-6)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
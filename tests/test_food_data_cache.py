@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import time
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.ai_models.food_data import food_data_cache
+from backend.ai_models.food_data.nutrition_database import NutritionDatabase
+from backend.utils.mmap_tables import StringTable
+
+
+class TestFoodDataCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.test_dir, 'food_data.csv')
+        self._write_csv("""food,Caloric Value,Fat,Protein
+Apple,52,0.2,0.3
+Apple Pie,237,invalid,2.4
+crème brûlée,300,-1,4.5
+Banana,89,0.3,1.1""")
+
+    def tearDown(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_csv(self, content):
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_cached_load_matches_csv_load(self):
+        """Test that a database loaded from the mmap cache answers exactly like one parsed from CSV."""
+        from_csv = NutritionDatabase(csv_path=self.csv_path, use_cache=False)
+        NutritionDatabase(csv_path=self.csv_path)
+        from_cache = NutritionDatabase(csv_path=self.csv_path)
+
+        self.assertIsInstance(from_cache.values, np.memmap)
+        self.assertIsInstance(from_cache.names, StringTable)
+        self.assertEqual(list(from_cache.food_data), list(from_csv.food_data))
+        self.assertEqual(dict(from_cache.food_data), dict(from_csv.food_data))
+        self.assertEqual(dict(from_cache.name_lookup), dict(from_csv.name_lookup))
+        self.assertEqual(from_cache.food_data['Apple Pie']['Fat'], None)
+        self.assertEqual(from_cache.name_lookup['crème brûlée'], 'crème brûlée')
+        for query in ['apple', 'bananas', 'crème', 'pizza']:
+            self.assertEqual(from_cache.get_food_info(query), from_csv.get_food_info(query))
+
+    def test_views_reject_unknown_keys(self):
+        """Test that the read-only views behave like the dicts they replace for missing keys."""
+        db = NutritionDatabase(csv_path=self.csv_path)
+
+        self.assertNotIn('apple', db.food_data)
+        self.assertNotIn(None, db.name_lookup)
+        self.assertIsNone(db.food_data.get('Pizza'))
+        with self.assertRaises(KeyError):
+            db.name_lookup['pizza']
+
+    def test_artifact_rebuilt_when_csv_changes(self):
+        """Test that editing the CSV invalidates the old artifact."""
+        NutritionDatabase(csv_path=self.csv_path)
+        cache_root = food_data_cache.default_cache_root(self.csv_path)
+        old_fingerprint = food_data_cache.source_fingerprint(self.csv_path)
+
+        time.sleep(0.01)
+        self._write_csv("""food,Caloric Value
+Apple,60""")
+        self.assertIsNone(food_data_cache.load_tables(self.csv_path))
+
+        db = NutritionDatabase(csv_path=self.csv_path)
+        self.assertEqual(db.food_data['Apple'], {'Caloric Value': 60.0})
+        self.assertEqual(os.listdir(cache_root), [food_data_cache.source_fingerprint(self.csv_path)])
+        self.assertNotEqual(old_fingerprint, food_data_cache.source_fingerprint(self.csv_path))
+
+    def test_use_cache_disabled(self):
+        """Test that use_cache=False neither reads nor writes the artifact."""
+        NutritionDatabase(csv_path=self.csv_path, use_cache=False)
+
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, food_data_cache.CACHE_DIR_NAME)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import io
+import os
+import sys
+
+import numpy as np
+from flask import Request
+from keras.preprocessing import image as keras_image
+from PIL import Image
+from werkzeug.test import EnvironBuilder
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.utils.image_decode import InMemoryUploadRequest, decode_image
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestImageDecode(unittest.TestCase):
+
+    def test_matches_load_img_without_draft(self):
+        """Test that an image already at the target size decodes exactly as load_img does."""
+        path = os.path.join(TESTS_DIR, 'apple.jpg')
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        expected = keras_image.img_to_array(keras_image.load_img(path, target_size=(224, 224)))
+        np.testing.assert_array_equal(keras_image.img_to_array(decode_image(data, (224, 224))), expected)
+        np.testing.assert_array_equal(keras_image.img_to_array(decode_image(io.BytesIO(data), (224, 224))), expected)
+
+    def test_large_jpeg_uses_draft(self):
+        """Test that a large JPEG is reduced while decoding and still resized to the target size."""
+        path = os.path.join(TESTS_DIR, 'pizza.jpg')
+        with open(path, 'rb') as f:
+            img = decode_image(f, (224, 224))
+
+        self.assertEqual(img.size, (224, 224))
+        self.assertEqual(img.mode, 'RGB')
+        full = keras_image.img_to_array(keras_image.load_img(path, target_size=(224, 224)))
+        # Draft decoding averages pixels where nearest-neighbour picks one, so allow a small mean difference.
+        self.assertLess(np.abs(keras_image.img_to_array(img) - full).mean(), 20)
+
+    def test_uploads_stay_in_memory(self):
+        """Test that a multi-megabyte upload, which Werkzeug would spool to disk, stays in memory."""
+        photo = io.BytesIO()
+        pixels = np.random.default_rng(3).integers(0, 256, (1200, 1600, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(photo, format='JPEG', quality=95)
+        self.assertGreater(photo.tell(), 1024 * 1024)
+
+        def upload_stream(request_class):
+            builder = EnvironBuilder(method='POST', data={'image_file': (io.BytesIO(photo.getvalue()), 'photo.jpg')})
+            return request_class(builder.get_environ()).files['image_file'].stream
+
+        self.assertTrue(upload_stream(Request)._rolled)
+        stream = upload_stream(InMemoryUploadRequest)
+        self.assertFalse(stream._rolled)
+        self.assertEqual(decode_image(stream, (224, 224)).size, (224, 224))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import io
+import os
+import shutil
+import sys
+import tempfile
+import json
+from unittest.mock import patch, MagicMock
+
+from PIL import Image
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.utils.image_decode import decode_image
+from backend.utils.image_result_cache import ImageResultCache, perceptual_hash, colour_signature
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PREDICTIONS = [{'name': 'Apple Pie', 'confidence': 0.9}]
+
+
+def load(name, size=(224, 224)):
+    with open(os.path.join(TESTS_DIR, name), 'rb') as f:
+        return decode_image(f, size)
+
+
+class TestImageResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.spill_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def test_hash_survives_reencoding(self):
+        """Test that a re-compressed, rescaled copy of an image hashes the same and a different image does not."""
+        original = load('apple.jpg')
+        buffer = io.BytesIO()
+        original.resize((320, 320)).save(buffer, format='JPEG', quality=60)
+        reencoded = decode_image(buffer.getvalue(), (224, 224))
+
+        self.assertEqual(len(perceptual_hash(original)), 16)
+        self.assertEqual(perceptual_hash(original), perceptual_hash(reencoded))
+        self.assertEqual(colour_signature(original), colour_signature(reencoded))
+        self.assertNotEqual(perceptual_hash(original), perceptual_hash(load('pizza.jpg')))
+
+    def test_flat_images_of_different_colours_do_not_collide(self):
+        """Test that solid images, whose difference hashes are all equal, get separate cache entries."""
+        cache = ImageResultCache(maxsize=4)
+        red, blue, white = (Image.new('RGB', (64, 64), colour) for colour in ('red', 'blue', 'white'))
+        self.assertEqual(perceptual_hash(red), perceptual_hash(blue))
+        cache.put(cache.key('food', red), {'predictions': PREDICTIONS})
+
+        self.assertEqual(len({cache.key('food', img) for img in (red, blue, white)}), 3)
+        self.assertIsNone(cache.get(cache.key('food', blue)))
+        self.assertIsNone(cache.get(cache.key('food', white)))
+        self.assertEqual(cache.get(cache.key('food', Image.new('RGB', (64, 64), 'red')))['predictions'], PREDICTIONS)
+
+    def test_keys_include_mode(self):
+        """Test that the same image classified in each mode gets separate entries."""
+        cache = ImageResultCache(maxsize=4)
+        img = load('apple.jpg')
+        cache.put(cache.key('food', img), {'predictions': PREDICTIONS})
+
+        self.assertEqual(cache.get(cache.key('food', img))['predictions'], PREDICTIONS)
+        self.assertIsNone(cache.get(cache.key('ingredient', img)))
+        self.assertAlmostEqual(cache.stats()['hit_ratio'], 0.5)
+
+    def test_spill_round_trip(self):
+        """Test that an entry evicted from memory is served from the spill directory and moved back."""
+        cache = ImageResultCache(maxsize=1, spill_dir=self.spill_dir)
+        cache.put('food:a', {'predictions': PREDICTIONS})
+        cache.put('food:b', {'predictions': []})
+
+        self.assertEqual(os.listdir(self.spill_dir), ['food-a.json'])
+        self.assertEqual(cache.get('food:a')['predictions'], PREDICTIONS)
+        # Promoting 'a' evicted 'b' in its place
+        self.assertEqual(os.listdir(self.spill_dir), ['food-b.json'])
+
+        stats = cache.stats()
+        self.assertEqual(stats['disk_hits'], 1)
+        self.assertEqual(stats['disk_entries'], 1)
+        self.assertEqual(stats['memory_hit_ratio'], 0.0)
+        self.assertEqual(stats['hit_ratio'], 1.0)
+
+    def test_spill_is_pruned_and_honours_ttl(self):
+        """Test that the spill directory is bounded and expired spilled entries are misses."""
+        cache = ImageResultCache(maxsize=1, spill_dir=self.spill_dir, spill_max_entries=3)
+        for i in range(6):
+            cache.put(f"food:{i}", {'predictions': PREDICTIONS})
+        self.assertLessEqual(len(os.listdir(self.spill_dir)), 3)
+
+        expiring = ImageResultCache(maxsize=1, ttl=60, spill_dir=self.spill_dir)
+        expiring.put('food:old', {'predictions': PREDICTIONS, 'cached_at': 0})
+        expiring.put('food:new', {'predictions': PREDICTIONS})
+        self.assertIsNone(expiring.get('food:old'))
+
+    def test_chatbot_shares_cached_predictions(self):
+        """Test that FoodChatbot serves an image classified earlier from the shared cache without a forward pass."""
+        with patch.dict('sys.modules', {
+            'backend.services.main.food_lookup_service': MagicMock(),
+            'backend.services.main.substitution_service': MagicMock()
+        }):
+            from backend.ai_models.chatbot.food_chatbot import FoodChatbot
+
+            cache = ImageResultCache(maxsize=4)
+            classifier = MagicMock()
+            classifier.load_image.side_effect = lambda source: decode_image(source, (224, 224))
+            classifier.predict_food.return_value = PREDICTIONS
+            config_path = os.path.join(self.spill_dir, 'config.json')
+            with open(config_path, 'w') as f:
+                json.dump({'intents': {}}, f)
+
+            with patch('spacy.load'):
+                chatbot = FoodChatbot(classifier, MagicMock(), MagicMock(), config_path=config_path,
+                                      classification_cache=cache)
+
+            with open(os.path.join(TESTS_DIR, 'apple.jpg'), 'rb') as f:
+                data = f.read()
+            self.assertEqual(chatbot._classify_image(data), PREDICTIONS)
+            self.assertEqual(chatbot._classify_image(io.BytesIO(data)), PREDICTIONS)
+            classifier.predict_food.assert_called_once()
+            self.assertIn(cache.key('food', load('apple.jpg')), cache.memory)
+
+
+if __name__ == '__main__':
+    unittest.main()
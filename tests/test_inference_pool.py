@@ -0,0 +1,138 @@
+import unittest
+import os
+import sys
+import io
+import subprocess
+import time
+from concurrent.futures import wait
+
+import numpy as np
+from PIL import Image
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.utils.inference_pool import InferencePool, InferenceWorkerError, RemoteClassifier
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class BrightnessClassifier:
+    """Picklable-by-reference stand-in for a classifier: names an image after its mean pixel value."""
+    image_size = (8, 8)
+
+    def is_model_loaded(self):
+        return True
+
+    def predict_food(self, img, top_k=3):
+        time.sleep(0.05)
+        return [{'name': f"mean_{int(np.asarray(img).mean())}", 'confidence': 1.0, 'pid': os.getpid()}][:top_k]
+
+    def crash(self, img):
+        os._exit(3)
+
+    def hang(self, img):
+        time.sleep(60)
+
+
+def _load_brightness_classifier():
+    return BrightnessClassifier()
+
+
+class TestInferencePool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = InferencePool({'food': _load_brightness_classifier}, workers=2, threads_per_worker=4,
+                                  hang_timeout=1.0, health_interval=0.2).start()
+        self.assertTrue(self.pool.wait_ready(30))
+        deadline = time.monotonic() + 30
+        while self.pool.stats()['ready_workers'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_remote_classifier_round_trip(self):
+        """Test that a RemoteClassifier decodes locally and predicts in the workers, spreading concurrent requests."""
+        classifier = RemoteClassifier(self.pool, 'food', timeout=10)
+        self.assertTrue(classifier.is_model_loaded())
+        self.assertEqual(classifier.image_size, (8, 8))
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (64, 48), (200, 200, 200)).save(buffer, format='PNG')
+        predictions = classifier.predict_food(buffer.getvalue(), top_k=1)
+        self.assertEqual([p['name'] for p in predictions], ['mean_200'])
+        self.assertNotEqual(predictions[0]['pid'], os.getpid())
+        self.assertEqual(classifier.load_image(io.BytesIO(buffer.getvalue())).size, (8, 8))
+
+        pixels = np.full((8, 8, 3), 10, dtype=np.uint8)
+        futures = [self.pool.submit('food', 'predict_food', pixels) for _ in range(8)]
+        done, _ = wait(futures, timeout=10)
+        self.assertEqual(len(done), 8)
+        self.assertEqual({future.result()[0]['name'] for future in futures}, {'mean_10'})
+        self.assertEqual(len({future.result()[0]['pid'] for future in futures}), 2)
+
+        stats = self.pool.stats()
+        self.assertEqual(stats['workers'], 2)
+        self.assertEqual(stats['ready_workers'], 2)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['completed'], 9)
+        self.assertTrue(all(worker['completed'] > 0 and worker['throughput_per_s'] > 0 for worker in stats['per_worker']))
+
+    def test_crashed_worker_is_restarted(self):
+        """Test that a worker exiting mid-request fails the request and is replaced."""
+        pixels = np.zeros((8, 8, 3), dtype=np.uint8)
+        with self.assertRaises(InferenceWorkerError):
+            self.pool.submit('food', 'crash', pixels).result(10)
+
+        deadline = time.monotonic() + 30
+        while self.pool.stats()['ready_workers'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+        stats = self.pool.stats()
+        self.assertEqual(stats['restarts'], 1)
+        self.assertEqual(stats['ready_workers'], 2)
+        self.assertEqual(self.pool.submit('food', 'predict_food', pixels).result(10)[0]['name'], 'mean_0')
+
+    def test_hung_worker_is_restarted(self):
+        """Test that a worker not replying within hang_timeout is killed, failing its requests."""
+        pixels = np.zeros((8, 8, 3), dtype=np.uint8)
+        with self.assertRaises(InferenceWorkerError):
+            self.pool.submit('food', 'hang', pixels).result(10)
+        self.assertEqual(self.pool.stats()['restarts'], 1)
+
+    def test_failed_request_does_not_restart(self):
+        """Test that an exception inside the model is returned to the caller without restarting the worker."""
+        with self.assertRaises(InferenceWorkerError):
+            self.pool.submit('food', 'missing_method', np.zeros((8, 8, 3), dtype=np.uint8)).result(10)
+        stats = self.pool.stats()
+        self.assertEqual(stats['restarts'], 0)
+        self.assertEqual(sum(worker['errors'] for worker in stats['per_worker']), 1)
+
+    def test_close_finishes_outstanding_requests(self):
+        """Test that close() lets the workers answer the requests they hold before they exit."""
+        pixels = np.full((8, 8, 3), 30, dtype=np.uint8)
+        futures = [self.pool.submit('food', 'predict_food', pixels) for _ in range(6)]
+        self.pool.close()
+        self.assertEqual({future.result(0)[0]['name'] for future in futures}, {'mean_30'})
+        self.assertTrue(all(worker['pid'] is None for worker in self.pool.stats()['per_worker']))
+        with self.assertRaises(InferenceWorkerError):
+            self.pool.submit('food', 'predict_food', pixels)
+
+
+class TestAPIProcessImports(unittest.TestCase):
+
+    def test_api_modules_do_not_import_tensorflow(self):
+        """Test that the classification and chatbot services load without TensorFlow."""
+        code = ("import sys\n"
+                "import backend.services.main.classification_service\n"
+                "import backend.services.main.chatbot_service\n"
+                "import backend.ai_models.chatbot.food_chatbot\n"
+                "print('tensorflow' in sys.modules)\n")
+        output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                env={**os.environ, 'INFERENCE_WORKERS': '2'}, timeout=120)
+        self.assertEqual(output.returncode, 0, output.stderr)
+        self.assertEqual(output.stdout.strip().splitlines()[-1], 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
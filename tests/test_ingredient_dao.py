@@ -0,0 +1,180 @@
+import unittest
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from flask import Flask
+from sqlalchemy import event
+
+from backend.db import db
+from backend.dao import IngredientDAO, RecipeDAO
+from backend.services.main.meal_suggestion_service import MealSuggestionService
+from backend.models import Ingredient, AllergyIntolerance, Recipe, User, UserAllergy
+from backend.models.allergy_intolerance import allergen_mask, ALLERGEN_MASK_BITS
+from backend.models.ingredient import ingredient_allergies_association_table
+
+
+class IngredientDatabaseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Build an in-memory app with one ingredient that already has an allergy."""
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        milk = Ingredient(Name='milk')
+        milk.allergies.append(AllergyIntolerance(name='lactose intolerance'))
+        db.session.add(milk)
+        db.session.add(AllergyIntolerance(name='nut allergy'))
+        db.session.commit()
+        self.dao = IngredientDAO()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def count_statements(self):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, db.engine, 'before_cursor_execute', listener)
+        return statements
+
+    def associations(self):
+        rows = db.session.query(Ingredient.Name, AllergyIntolerance.name) \
+            .join(ingredient_allergies_association_table,
+                  ingredient_allergies_association_table.c.ingredient_id == Ingredient.IngredientID) \
+            .join(AllergyIntolerance,
+                  AllergyIntolerance.id == ingredient_allergies_association_table.c.allergy_intolerance_id).all()
+        return set(rows)
+
+
+class TestIngredientDAOBulk(IngredientDatabaseTestCase):
+
+    def test_get_or_create_ingredients(self):
+        """Test that existing names are reused, new ones created once and all get IDs."""
+        ingredients = self.dao.get_or_create_ingredients(['milk', 'almonds', 'almonds'])
+
+        self.assertEqual(list(ingredients), ['milk', 'almonds'])
+        self.assertEqual(ingredients['milk'].IngredientID, Ingredient.query.filter_by(Name='milk').one().IngredientID)
+        self.assertIsNotNone(ingredients['almonds'].IngredientID)
+        self.assertEqual(Ingredient.query.count(), 2)
+
+    def test_add_allergies_matches_per_ingredient_path(self):
+        """Test that the bulk insert adds only missing associations and creates unknown allergies."""
+        names = ['milk', 'almond milk', 'walnuts', 'water']
+        allergies = {'milk': ['lactose intolerance'], 'almond milk': ['lactose intolerance', 'nut allergy'],
+                     'walnuts': ['nut allergy', 'tree nut allergy'], 'water': []}
+        ingredients = self.dao.get_or_create_ingredients(names)
+
+        added = self.dao.add_allergies_to_ingredients({ingredients[name]: allergies[name] for name in names})
+
+        self.assertEqual(added, 4)
+        expected = {(name, allergy) for name in names for allergy in allergies[name]}
+        self.assertEqual(self.associations(), expected)
+        self.assertEqual(AllergyIntolerance.query.filter_by(name='tree nut allergy').count(), 1)
+        self.assertEqual([a.name for a in ingredients['walnuts'].allergies.order_by(AllergyIntolerance.name)],
+                         ['nut allergy', 'tree nut allergy'])
+        self.assertEqual(self.dao.add_allergies_to_ingredients({ingredients['milk']: ['lactose intolerance']}), 0)
+
+    def test_recipe_sized_batch_uses_constant_queries(self):
+        """Test that 20 ingredients, their allergies and masks take a handful of statements instead of several each."""
+        names = [f'ingredient {i}' for i in range(19)] + ['milk']
+        statements = self.count_statements()
+
+        ingredients = self.dao.get_or_create_ingredients(names)
+        self.dao.add_allergies_to_ingredients({ingredients[name]: ['lactose intolerance', 'nut allergy']
+                                               for name in names})
+
+        self.assertLessEqual(len(statements), 8)
+        self.assertEqual(len(self.associations()), 40)
+
+
+
+class TestAllergenMasks(IngredientDatabaseTestCase):
+
+    def setUp(self):
+        """Backfill the mask of the ingredient seeded without the DAO."""
+        super().setUp()
+        self.dao.rebuild_allergen_masks()
+        db.session.commit()
+
+    def create_recipe(self, title, ingredient_names):
+        user = User.query.first()
+        if user is None:
+            user = User(Name='Cook', Email='cook@example.com', PasswordHash='x')
+            db.session.add(user)
+            db.session.flush()
+        ingredients = self.dao.get_or_create_ingredients(ingredient_names)
+        recipe = RecipeDAO().create_recipe(
+            user_id=user.UserID, title=title, description=None, instructions='Mix.', prep_time=None,
+            cook_time=None, servings=None, image_url=None, is_public=True,
+            ingredients_data=[{'ingredient_model': ingredients[name], 'quantity': '1', 'unit': 'cup'}
+                              for name in ingredient_names])
+        db.session.flush()
+        return recipe
+
+    def allergy_id(self, name):
+        return AllergyIntolerance.query.filter_by(name=name).one().id
+
+    def test_masks_follow_allergy_writes(self):
+        """Test that ingredient masks and the recipes using them pick up newly added allergies."""
+        latte = self.create_recipe('Latte', ['milk', 'coffee'])
+        self.assertEqual(latte.AllergenMask, allergen_mask([self.allergy_id('lactose intolerance')])[0])
+
+        coffee = Ingredient.query.filter_by(Name='coffee').one()
+        self.dao.add_allergy_to_ingredient(coffee, 'caffeine intolerance')
+        db.session.commit()
+
+        expected = allergen_mask([self.allergy_id('lactose intolerance'), self.allergy_id('caffeine intolerance')])[0]
+        self.assertEqual(db.session.get(Recipe, latte.RecipeID).AllergenMask, expected)
+        self.assertEqual(self.dao.rebuild_allergen_masks(), (0, 0))
+
+    def test_rebuild_allergen_masks(self):
+        """Test that stale masks are recomputed from the association tables."""
+        recipe = self.create_recipe('Cereal', ['milk', 'oats'])
+        recipe.AllergenMask = 0
+        Ingredient.query.filter_by(Name='milk').one().AllergenMask = 0
+        db.session.commit()
+
+        self.assertEqual(self.dao.rebuild_allergen_masks(), (1, 1))
+        self.assertEqual(db.session.get(Recipe, recipe.RecipeID).AllergenMask,
+                         allergen_mask([self.allergy_id('lactose intolerance')])[0])
+
+    def test_personalized_recipes_exclude_allergens(self):
+        """Test that personalized listing and meal suggestions drop recipes containing the user's allergies, with and without mask bits."""
+        self.create_recipe('Cereal', ['milk', 'oats'])
+        self.create_recipe('Trail mix', ['walnuts', 'raisins'])
+        self.create_recipe('Porridge', ['oats', 'water'])
+        self.dao.add_allergies_to_ingredients({Ingredient.query.filter_by(Name='walnuts').one(): ['nut allergy']})
+        # An allergy id past the last mask bit is matched through the association table.
+        late = AllergyIntolerance(id=ALLERGEN_MASK_BITS + 5, name='raisin allergy')
+        db.session.add(late)
+        db.session.flush()
+        self.dao.add_allergies_to_ingredients({Ingredient.query.filter_by(Name='raisins').one(): ['raisin allergy']})
+        user = User.query.first()
+        db.session.commit()
+
+        def titles():
+            listed = sorted(recipe.Title for recipe in RecipeDAO().get_personalized_recipes_for_user(user.UserID).items)
+            suggestable = MealSuggestionService()._filter_recipes_by_allergies(Recipe.query.all(), user.UserID)
+            self.assertEqual(sorted(recipe.Title for recipe in suggestable), listed)
+            return listed
+
+        self.assertEqual(titles(), ['Cereal', 'Porridge', 'Trail mix'])
+        db.session.add(UserAllergy(UserID=user.UserID, AllergyID=self.allergy_id('lactose intolerance')))
+        db.session.commit()
+        self.assertEqual(titles(), ['Porridge', 'Trail mix'])
+        UserAllergy.query.delete()
+        db.session.add(UserAllergy(UserID=user.UserID, AllergyID=late.id))
+        db.session.commit()
+        self.assertEqual(titles(), ['Cereal', 'Porridge'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import os
+import sys
+import threading
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.utils.lru_cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_put_and_counters(self):
+        """Test basic hits and misses are counted."""
+        cache = LRUCache(maxsize=2)
+
+        self.assertIsNone(cache.get('apple'))
+        cache.put('apple', 1)
+        self.assertEqual(cache.get('apple'), 1)
+        self.assertEqual(cache.get('pear', 'default'), 'default')
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['size'], 1)
+        self.assertAlmostEqual(stats['hit_ratio'], 1 / 3, places=3)
+
+    def test_evicts_least_recently_used(self):
+        """Test that reading an entry protects it from eviction."""
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_on_evict_receives_evicted_entries(self):
+        """Test that entries evicted for size are handed to on_evict."""
+        evicted = []
+        cache = LRUCache(maxsize=1, on_evict=lambda key, value: evicted.append((key, value)))
+        cache.put('a', 1)
+        cache.put('a', 2)
+        cache.put('b', 3)
+
+        self.assertEqual(evicted, [('a', 2)])
+
+    def test_cached_none_is_a_hit(self):
+        """Test that None values are cached, so negative lookups are not repeated."""
+        cache = LRUCache(maxsize=2)
+        cache.put('unknown food', None)
+        sentinel = object()
+
+        self.assertIsNone(cache.get('unknown food', sentinel))
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        clock = FakeClock()
+        cache = LRUCache(maxsize=2, ttl=10, clock=clock)
+        cache.put('a', 1)
+
+        clock.now = 9.9
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 10.0
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['expirations'], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid_maxsize(self):
+        """Test that a non-positive maxsize is rejected."""
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_concurrent_access_stays_bounded(self):
+        """Test that concurrent writers never grow the cache past maxsize."""
+        cache = LRUCache(maxsize=50)
+
+        def worker(offset):
+            for i in range(500):
+                cache.put(offset + i, i)
+                cache.get(offset + i // 2)
+
+        threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(stats['size'], 50)
+        self.assertEqual(stats['hits'] + stats['misses'], 8 * 500)
+        self.assertEqual(stats['evictions'], 8 * 500 - 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
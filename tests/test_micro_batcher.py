@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import threading
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.utils.micro_batcher import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.batch_sizes = []
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _double(self, batch):
+        self.batch_sizes.append(len(batch))
+        return batch * 2
+
+    def test_requests_share_a_batch(self):
+        """Test that queued requests run as one call and each gets its own rows back."""
+        batcher = MicroBatcher(self._double, max_batch_size=8, max_wait_ms=1000)
+        futures = [batcher.submit(np.full((1, 2), i)) for i in range(3)]
+        futures.append(batcher.submit(np.full((2, 2), 3)))
+        futures.append(batcher.submit(np.full((3, 2), 4)))
+
+        results = [future.result(5) for future in futures]
+
+        self.assertEqual(self.batch_sizes, [8])
+        for i, result in enumerate(results[:3]):
+            np.testing.assert_array_equal(result, np.full((1, 2), 2 * i))
+        np.testing.assert_array_equal(results[4], np.full((3, 2), 8))
+        self.assertEqual(batcher.stats()['mean_batch_size'], 8)
+
+    def test_batch_size_and_wait_limits(self):
+        """Test that a batch closes at max_batch_size, and after max_wait_ms when it does not fill."""
+        def blocked(batch):
+            self.release.wait(5)
+            return self._double(batch)
+
+        batcher = MicroBatcher(blocked, max_batch_size=2, max_wait_ms=10)
+        first = batcher.submit(np.zeros((1, 1)))
+        futures = [batcher.submit(np.zeros((1, 1))) for _ in range(2)]
+        self.release.set()
+        for future in [first] + futures:
+            future.result(5)
+
+        self.assertEqual(self.batch_sizes, [2, 1])
+        self.assertEqual(batcher.stats()['largest_batch'], 2)
+
+    def test_errors_reach_every_request(self):
+        """Test that a failing batch raises in every caller and the worker keeps serving."""
+        def flaky(batch):
+            if not self.batch_sizes:
+                self.batch_sizes.append(len(batch))
+                raise RuntimeError("inference failed")
+            return self._double(batch)
+
+        batcher = MicroBatcher(flaky, max_batch_size=2, max_wait_ms=1000)
+        futures = [batcher.submit(np.ones((1, 1))) for _ in range(2)]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(5)
+
+        np.testing.assert_array_equal(batcher.predict(np.ones((1, 1)), timeout=5), [[2]])
+        self.assertEqual(batcher.stats()['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+import os
+import sys
+import threading
+import unittest.mock
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from flask import Flask
+
+from backend.routes import health_routes
+from backend.utils.model_loader import ModelLoader, ModelNotReadyError
+
+
+class TestModelLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = ModelLoader()
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _slow_factory(self, value='model'):
+        def factory():
+            self.release.wait(5)
+            return value
+        return factory
+
+    def test_background_load_and_wait(self):
+        """Test that get() waits for a background load to finish."""
+        self.loader.register('slow', self._slow_factory())
+        self.loader.start()
+
+        self.assertEqual(self.loader.status()['slow']['state'], ModelLoader.LOADING)
+        self.release.set()
+        self.assertEqual(self.loader.get('slow', timeout=5), 'model')
+        self.assertEqual(self.loader.status()['slow']['state'], ModelLoader.READY)
+        self.assertTrue(self.loader.all_loaded())
+
+    def test_deadline_raises_not_ready(self):
+        """Test that a request gets ModelNotReadyError instead of blocking past the deadline."""
+        self.loader.register('slow', self._slow_factory())
+        self.loader.start('slow')
+
+        with self.assertRaises(ModelNotReadyError) as ctx:
+            self.loader.get('slow', timeout=0.05)
+        self.assertEqual(ctx.exception.state, ModelLoader.LOADING)
+        self.assertFalse(self.loader.is_ready('slow'))
+
+    def test_failed_factory(self):
+        """Test that a factory exception is recorded and reported on every get()."""
+        def broken():
+            raise FileNotFoundError('weights missing')
+        self.loader.register('broken', broken)
+        self.loader.load_all()
+
+        with self.assertRaises(ModelNotReadyError) as ctx:
+            self.loader.get('broken', timeout=0)
+        self.assertIn('weights missing', str(ctx.exception))
+        self.assertEqual(self.loader.status()['broken']['state'], ModelLoader.FAILED)
+        self.assertEqual(self.loader.status()['broken']['error'], 'weights missing')
+
+    def test_degraded_model_is_still_returned(self):
+        """Test that a model reporting itself unavailable is degraded but still handed to callers."""
+        self.loader.register('classifier', lambda: 'stub', is_available=lambda model: False)
+
+        self.assertEqual(self.loader.get('classifier'), 'stub')
+        self.assertEqual(self.loader.status()['classifier']['state'], ModelLoader.DEGRADED)
+
+    def test_get_loads_unstarted_model_inline(self):
+        """Test that get() loads a model in the caller's thread when startup never started it."""
+        calls = []
+        self.loader.register('lazy', lambda: calls.append(1) or 'lazy-model')
+
+        self.assertEqual(self.loader.get('lazy'), 'lazy-model')
+        self.assertEqual(self.loader.get('lazy'), 'lazy-model')
+        self.assertEqual(len(calls), 1)
+
+    def test_get_with_timeout_starts_unstarted_model(self):
+        """Test that get() with a timeout starts a never-started model in the background instead of blocking."""
+        self.loader.register('slow', self._slow_factory())
+
+        with self.assertRaises(ModelNotReadyError) as ctx:
+            self.loader.get('slow', timeout=0.05)
+        self.assertEqual(ctx.exception.state, ModelLoader.LOADING)
+        self.release.set()
+        self.assertEqual(self.loader.get('slow', timeout=5), 'model')
+
+    def test_register_is_idempotent(self):
+        """Test that re-registering a name keeps the first factory."""
+        self.loader.register('shared', lambda: 'first')
+        self.loader.register('shared', lambda: 'second')
+
+        self.assertEqual(self.loader.get('shared'), 'first')
+
+    def test_overall_state(self):
+        """Test that a failed model outranks loading, degraded and ready models in the summary."""
+        self.assertEqual(self.loader.overall_state(), ModelLoader.READY)
+        self.loader.register('ready', lambda: 'model')
+        self.loader.register('stub', lambda: 'stub', is_available=lambda model: False)
+        self.loader.register('slow', self._slow_factory())
+        self.loader.start('slow')
+        self.assertEqual(self.loader.overall_state(), ModelLoader.LOADING)
+
+        self.loader.load_all()
+        self.release.set()
+        self.loader.get('slow', timeout=5)
+        self.assertEqual(self.loader.overall_state(), ModelLoader.DEGRADED)
+
+        def broken():
+            raise FileNotFoundError('weights missing')
+        self.loader.register('broken', broken)
+        self.loader.load_all()
+        self.assertTrue(self.loader.all_loaded())
+        self.assertEqual(self.loader.overall_state(), ModelLoader.FAILED)
+
+    def test_unknown_model(self):
+        """Test that an unregistered name raises KeyError."""
+        with self.assertRaises(KeyError):
+            self.loader.get('missing')
+
+
+class TestModelHealthRoutes(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = ModelLoader()
+        self.loader.register('ready', lambda: 'model')
+        patcher = unittest.mock.patch.object(health_routes, 'model_loader', self.loader)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        db_patcher = unittest.mock.patch.object(health_routes, 'DatabaseHealthCheck')
+        db_patcher.start().return_value.check_database_connectivity.return_value = True
+        self.addCleanup(db_patcher.stop)
+        app = Flask(__name__)
+        app.register_blueprint(health_routes.health_bp)
+        self.client = app.test_client()
+
+    def test_ready_models(self):
+        """Test that loaded models report ok on both health endpoints."""
+        self.loader.load_all()
+
+        response = self.client.get('/api/health/models')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'ok')
+        response = self.client.get('/api/health/full')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['models']['status'], 'ok')
+
+    def test_failed_model_is_not_healthy(self):
+        """Test that a model whose loader raised is reported as failed with a 503, not as loaded."""
+        def broken():
+            raise FileNotFoundError('weights missing')
+        self.loader.register('broken', broken)
+        self.loader.load_all()
+
+        response = self.client.get('/api/health/models')
+        body = response.get_json()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(body['status'], 'failed')
+        self.assertEqual(body['models']['broken']['error'], 'weights missing')
+
+        response = self.client.get('/api/health/full')
+        body = response.get_json()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(body['models']['status'], 'failed')
+        self.assertEqual(body['overall']['status'], 'degraded')
+
+    def test_degraded_model_still_serves(self):
+        """Test that a degraded model is reported as such without failing the health check."""
+        self.loader.register('stub', lambda: 'stub', is_available=lambda model: False)
+        self.loader.load_all()
+
+        response = self.client.get('/api/health/models')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'degraded')
+
+
+if __name__ == '__main__':
+    unittest.main()
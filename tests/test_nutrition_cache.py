@@ -0,0 +1,122 @@
+import unittest
+import bisect
+import os
+import sys
+import tempfile
+import shutil
+import time
+import pandas as pd
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.ai_models.nutrition_lookup import nutrition_cache
+from backend.ai_models.nutrition_lookup.nutrition_lookup import OfflineNutritionLookup
+from backend.utils.mmap_tables import StringTable
+
+
+class TestNutritionCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+
+        pd.DataFrame({
+            'fdc_id': [1001, 1002, 1003],
+            'description': ['Apple, raw', 'Banana, raw', 'Crème brûlée'],
+            'data_type': ['sr_legacy_food'] * 3,
+            'publication_date': ['2019-04-01'] * 3
+        }).to_csv(os.path.join(self.test_dir, 'food.csv'), index=False)
+
+        pd.DataFrame({
+            'id': [1008, 1003],
+            'name': ['Energy', 'Protein'],
+            'unit_name': ['kcal', 'g'],
+            'nutrient_nbr': [208, 203]
+        }).to_csv(os.path.join(self.test_dir, 'nutrient.csv'), index=False)
+
+        self.food_nutrient_csv = os.path.join(self.test_dir, 'food_nutrient.csv')
+        pd.DataFrame({
+            'fdc_id': [1001, 1001, 1002],
+            'nutrient_id': [1008, 1003, 1008],
+            'amount': [52.0, 0.3, 89.0]
+        }).to_csv(self.food_nutrient_csv, index=False)
+
+        self.cache_root = os.path.join(self.test_dir, nutrition_cache.CACHE_DIR_NAME)
+
+    def tearDown(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_first_load_writes_artifact(self):
+        """Test that parsing the CSVs publishes a cache artifact for later boots."""
+        OfflineNutritionLookup(data_folder=self.test_dir)
+
+        fingerprint = nutrition_cache.source_fingerprint(self.test_dir)
+        self.assertTrue(os.path.exists(os.path.join(self.cache_root, fingerprint, 'manifest.json')))
+        self.assertIsNotNone(nutrition_cache.load_tables(self.test_dir))
+
+    def test_cached_load_matches_csv_load(self):
+        """Test that a lookup loaded from the cache answers exactly like one parsed from CSV."""
+        from_csv = OfflineNutritionLookup(data_folder=self.test_dir)
+        from_cache = OfflineNutritionLookup(data_folder=self.test_dir)
+
+        self.assertIsInstance(from_cache.nutrient_amounts, np.memmap)
+        self.assertIsInstance(from_cache.food_descriptions, StringTable)
+        self.assertIsInstance(from_cache.food_descriptions.blob, np.memmap)
+        self.assertEqual(list(from_cache.food_df['description']), list(from_csv.food_df['description']))
+        self.assertEqual(list(from_cache.food_df['description_clean']), list(from_csv.food_df['description_clean']))
+        self.assertEqual(from_cache.nutrient_lookup, from_csv.nutrient_lookup)
+        for query in ['apple', 'bananas', 'creme', 'pizza']:
+            self.assertEqual(from_cache.get_nutrition_for_food(query), from_csv.get_nutrition_for_food(query))
+
+    def test_string_table_round_trip(self):
+        """Test that string tables keep order, empty and non-ASCII entries, and support bisection."""
+        values = ['', 'apple', 'brûlée', 'zucchini']
+        table = StringTable.from_strings(values)
+
+        self.assertEqual(list(table), values)
+        self.assertEqual(table[2], 'brûlée')
+        self.assertEqual(table[-1], 'zucchini')
+        self.assertEqual(bisect.bisect_left(table, 'brûlée'), 2)
+        with self.assertRaises(IndexError):
+            table[4]
+
+    def test_artifact_rebuilt_when_csv_changes(self):
+        """Test that editing a source CSV invalidates the old artifact."""
+        OfflineNutritionLookup(data_folder=self.test_dir)
+        old_fingerprint = nutrition_cache.source_fingerprint(self.test_dir)
+
+        time.sleep(0.01)
+        pd.DataFrame({
+            'fdc_id': [1001],
+            'nutrient_id': [1008],
+            'amount': [60.0]
+        }).to_csv(self.food_nutrient_csv, index=False)
+        self.assertIsNone(nutrition_cache.load_tables(self.test_dir))
+
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir)
+        self.assertEqual(lookup.get_nutrition_for_food('apple')['nutrition']['Energy']['amount'], 60.0)
+        self.assertEqual(os.listdir(self.cache_root), [nutrition_cache.source_fingerprint(self.test_dir)])
+        self.assertNotIn(old_fingerprint, os.listdir(self.cache_root))
+
+    def test_use_cache_disabled(self):
+        """Test that use_cache=False neither reads nor writes the artifact."""
+        OfflineNutritionLookup(data_folder=self.test_dir, use_cache=False)
+
+        self.assertFalse(os.path.exists(self.cache_root))
+
+    def test_corrupt_artifact_falls_back_to_csv(self):
+        """Test that an unreadable artifact is ignored rather than failing start-up."""
+        OfflineNutritionLookup(data_folder=self.test_dir)
+        fingerprint = nutrition_cache.source_fingerprint(self.test_dir)
+        os.remove(os.path.join(self.cache_root, fingerprint, 'nutrient_amounts.npy'))
+
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir)
+
+        self.assertTrue(lookup.get_nutrition_for_food('apple')['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,6 @@ import unittest
 import os
 import sys
 import tempfile
-import json
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
@@ -172,8 +171,7 @@ Green Apple,52,0.2,0.3"""
         """Test getting food info for single match."""
         db = NutritionDatabase(csv_path=self.csv_path)
         
-        result = db.get_food_info("Apple")
-        result_data = json.loads(result)
+        result_data = db.get_food_info("Apple")
         
         self.assertEqual(result_data['food'], 'Apple')
         self.assertIn('data', result_data)
@@ -193,8 +191,7 @@ Apple Pie,237,11,2.4"""
             f.write(csv_content)
         
         db = NutritionDatabase(csv_path=multi_csv_path)
-        result = db.get_food_info("apple")  # No exact match, should return multiple matches
-        result_data = json.loads(result)
+        result_data = db.get_food_info("apple")  # No exact match, should return multiple matches
         
         self.assertIn('matches', result_data)
         self.assertIn('message', result_data)
@@ -204,8 +201,7 @@ Apple Pie,237,11,2.4"""
         """Test getting food info when no matches found."""
         db = NutritionDatabase(csv_path=self.csv_path)
         
-        result = db.get_food_info("pizza")
-        result_data = json.loads(result)
+        result_data = db.get_food_info("pizza")
         
         self.assertIn('error', result_data)
         self.assertEqual(result_data['error'], 'Food not found')
@@ -214,8 +210,7 @@ Apple Pie,237,11,2.4"""
         """Test getting food by exact name."""
         db = NutritionDatabase(csv_path=self.csv_path)
         
-        result = db.get_food_by_exact_name("Apple")
-        result_data = json.loads(result)
+        result_data = db.get_food_by_exact_name("Apple")
         
         self.assertEqual(result_data['food'], 'Apple')
         self.assertIn('data', result_data)
@@ -224,18 +219,16 @@ Apple Pie,237,11,2.4"""
         """Test getting food by exact name when not found."""
         db = NutritionDatabase(csv_path=self.csv_path)
         
-        result = db.get_food_by_exact_name("Pizza")
-        result_data = json.loads(result)
+        result_data = db.get_food_by_exact_name("Pizza")
         
         self.assertIn('error', result_data)
         self.assertEqual(result_data['error'], 'Exact food name not found')
     
-    def test_format_food_json_with_units(self):
+    def test_format_food_with_units(self):
         """Test JSON formatting includes proper units."""
         db = NutritionDatabase(csv_path=self.csv_path)
         
-        result = db._format_food_json("Apple")
-        result_data = json.loads(result)
+        result_data = db._format_food("Apple")
         
         # Check that units are properly assigned
         self.assertEqual(result_data['data']['Caloric Value']['unit'], 'kcal')
@@ -244,7 +237,15 @@ Apple Pie,237,11,2.4"""
         self.assertEqual(result_data['data']['Sodium']['unit'], 'g')
         self.assertEqual(result_data['data']['Vitamin C']['unit'], 'mg')
     
-    def test_format_food_json_excludes_none_values(self):
+    def test_formatted_payload_is_reused(self):
+        """Test that a food's payload is built once and returned by both lookup paths."""
+        db = NutritionDatabase(csv_path=self.csv_path)
+
+        self.assertIs(db.get_food_info("apple"), db.get_food_by_exact_name("Apple"))
+        with self.assertRaises(KeyError):
+            db._format_food("Pizza")
+
+    def test_format_food_excludes_none_values(self):
         """Test that None values are excluded from JSON output."""
         # Create CSV with some invalid values
         csv_content = """food,Caloric Value,Fat,Invalid Column
@@ -255,14 +256,62 @@ Test Food,52,invalid_value,"""
             f.write(csv_content)
         
         db = NutritionDatabase(csv_path=invalid_csv_path)
-        result = db._format_food_json("Test Food")
-        result_data = json.loads(result)
+        result_data = db._format_food("Test Food")
         
         # Should only include valid values
         self.assertIn('Caloric Value', result_data['data'])
         self.assertNotIn('Fat', result_data['data'])  # Invalid value should be excluded
         self.assertNotIn('Invalid Column', result_data['data'])  # Empty value should be excluded
 
+    def test_find_matches_matches_linear_scan(self):
+        """Test that the trigram index returns the same matches, in the same order, as scanning every name."""
+        csv_path = os.path.join(os.path.dirname(__file__), '..', 'backend', 'ai_models', 'food_data', 'Data', 'FOOD-DATA.csv')
+        db = NutritionDatabase(csv_path=csv_path, use_cache=False)
+        names = list(db.food_data)
+
+        def scan(query):
+            normalized = query.strip().lower()
+            candidates = [normalized, normalized[:-1] if normalized.endswith('s') else normalized + 's']
+            if any(name in db.name_lookup for name in candidates):
+                return None
+            return [name for name in names if any(term in name.lower() for term in candidates)]
+
+        queries = ['a', 'ch', 'egg', 'chees', 'Chicken Bre', 'RICE', 'apples', ' oil ', 'xyz', 'ed ch', '']
+        queries += [name[i:i + length] for name in names[::40] for i in (0, 2) for length in (3, 5, 8)]
+        for query in queries:
+            expected = scan(query)
+            if expected is not None:
+                self.assertEqual(db.find_matches(query), expected, query)
+
+    def test_query_foods_filters_and_top_n(self):
+        """Test vectorized filtering with a descending top-N by another nutrient."""
+        db = NutritionDatabase(csv_path=self.csv_path)
+
+        result = db.query_foods([('Dietary Fiber', '>', 2), ('sugars', '<', 11)], [('Protein', True)], limit=2)
+
+        self.assertEqual(result['total'], 2)
+        self.assertEqual([item['food'] for item in result['results']], ['Broccoli', 'Apple'])
+        self.assertEqual(result['results'][0]['data']['Protein'], {'value': 2.8, 'unit': 'g'})
+        self.assertEqual(set(result['results'][0]['data']), {'Dietary Fiber', 'Sugars', 'Protein'})
+
+    def test_query_foods_multi_key_sort(self):
+        """Test that later sort keys break ties in the earlier ones and the limit applies after sorting."""
+        db = NutritionDatabase(csv_path=self.csv_path)
+
+        result = db.query_foods(sort_by=[('Sugars', False), ('Sodium', True)], limit=3)
+
+        self.assertEqual(result['total'], 5)
+        self.assertEqual([item['food'] for item in result['results']], ['Chicken Breast', 'Salmon', 'Broccoli'])
+
+    def test_query_foods_rejects_unknown_columns(self):
+        """Test that unknown nutrients and operators raise ValueError."""
+        db = NutritionDatabase(csv_path=self.csv_path)
+
+        with self.assertRaises(ValueError):
+            db.query_foods([('Unobtainium', '>', 1)])
+        with self.assertRaises(ValueError):
+            db.query_foods([('Protein', '!=', 1)])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
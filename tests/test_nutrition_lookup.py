@@ -1,4 +1,5 @@
 import unittest
+import unittest.mock
 import os
 import sys
 import tempfile
@@ -169,6 +170,43 @@ class TestOfflineNutritionLookup(unittest.TestCase):
         self.assertGreater(len(matches_singular), 0)
         self.assertGreater(len(matches_plural), 0)
     
+    def test_candidate_index_matches_regex_filter(self):
+        """Test that the token index shortlists exactly the rows the base-word regex accepts."""
+        import re
+        food_data = {
+            'fdc_id': list(range(2001, 2009)),
+            'description': ['Apples, raw', 'Applesauce, canned', 'Apple juice', 'Pineapple, raw',
+                            'Chicken breast, raw', 'Chicken, breasts, roasted', 'Breast of chicken', 'Egg, whole'],
+        }
+        pd.DataFrame(food_data).to_csv(self.food_csv, index=False)
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir)
+
+        for query in ['apple', 'apples', 'chicken breast', 'chicken breasts', 'egg', 'eggs', 'breast', 'pizza']:
+            base_word = lookup._clean_string(query).rstrip('s')
+            pattern = r'\b' + re.escape(base_word) + r's?\b'
+            expected = [i for i, d in enumerate(lookup.food_df['description_clean']) if re.search(pattern, d)]
+            self.assertEqual(lookup._candidate_positions(base_word).tolist(), expected, query)
+
+    def test_match_food_index_agrees_with_scan(self):
+        """Test that the indexed match returns the same ranking as the full scan."""
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir)
+
+        for query in ['apple', 'apples', 'chicken', 'chicken breast', 'banana', 'pizza', '']:
+            self.assertEqual(lookup._match_food(query, top_n=5), lookup._match_food_scan(query, top_n=5), query)
+
+    def test_match_food_not_crowded_out_by_other_words(self):
+        """Test that base-word matches outside the global top_n are still returned by the indexed match."""
+        food_data = {
+            'fdc_id': [3001, 3002, 3003, 3004, 3005],
+            'description': ['Eggplant, raw', 'Eggplant, cooked', 'Eggnog', 'Eggs, scrambled', 'Egg, whole, raw, fresh, large'],
+        }
+        pd.DataFrame(food_data).to_csv(self.food_csv, index=False)
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir)
+
+        # The three eggplant/eggnog rows outscore both egg rows, so the scan filters its top 3 down to nothing
+        self.assertEqual(lookup._match_food_scan('egg', top_n=3), [])
+        self.assertEqual([m['fdc_id'] for m in lookup._match_food('egg', top_n=3)], [3004, 3005])
+
     def test_get_nutrition_for_food_success(self):
         """Test successful nutrition retrieval."""
         lookup = OfflineNutritionLookup(data_folder=self.test_dir)
@@ -211,6 +249,59 @@ class TestOfflineNutritionLookup(unittest.TestCase):
         self.assertTrue(result['success'])
         self.assertEqual(result['matched_item']['description'], 'Apple, raw')
     
+    def test_match_cache_shared_by_plural_retry(self):
+        """Test that the plural/singular retry reuses cached matches."""
+        from backend.utils.lru_cache import LRUCache
+        cache = LRUCache(maxsize=16)
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir, match_cache=cache)
+
+        first = lookup.get_nutrition_for_food("Apple")
+        with unittest.mock.patch.object(lookup, '_match_food', wraps=lookup._match_food) as match_food:
+            again = lookup.get_nutrition_for_food(" apple ")
+            plural = lookup.get_nutrition_for_food("apples")
+            # 'apples' has its own entry; 'pizzas' misses, retries 'pizza' and caches both misses
+            lookup.get_nutrition_for_food("pizzas")
+            lookup.get_nutrition_for_food("pizza")
+
+        self.assertEqual(again, first)
+        self.assertEqual(plural['matched_item']['fdc_id'], first['matched_item']['fdc_id'])
+        called_with = [call.args[0] for call in match_food.call_args_list]
+        self.assertEqual(called_with, ["apples", "pizzas", "pizza"])
+        self.assertIn('pizza', cache)
+
+    def test_get_nutrition_for_foods_matches_single_lookups(self):
+        """Test that the batch lookup returns the same per-name results as single lookups."""
+        food_data = {
+            'fdc_id': [1001, 1002, 1003, 1004, 1005, 1006],
+            'description': ['Apple, raw', 'Banana, raw', 'Chicken breast, raw', 'Broccoli, raw',
+                            'Apples, dried', 'Chicken, breasts, roasted'],
+        }
+        pd.DataFrame(food_data).to_csv(self.food_csv, index=False)
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir)
+        names = ['apple', 'Bananas', 'chicken breast', 'pizza', 'apple', '', 'broccoli!', 'breasts']
+
+        batch = lookup.get_nutrition_for_foods(names, nutrients=['Energy'], workers=2)
+
+        self.assertEqual(len(batch), len(names))
+        for name, item in zip(names, batch):
+            expected = lookup.get_nutrition_for_food(name, nutrients=['Energy'])
+            self.assertEqual(item, {'query': name, **expected}, name)
+        self.assertFalse(batch[3]['success'])
+        self.assertIn('No food match found', batch[3]['error'])
+
+    def test_get_nutrition_for_foods_uses_match_cache(self):
+        """Test that batch and single lookups share match cache entries."""
+        from backend.utils.lru_cache import LRUCache
+        cache = LRUCache(maxsize=16)
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir, match_cache=cache)
+        lookup.get_nutrition_for_food('apple')
+
+        with unittest.mock.patch.object(lookup, '_match_foods_batch', wraps=lookup._match_foods_batch) as batch_match:
+            lookup.get_nutrition_for_foods(['apple', 'banana'])
+
+        batch_match.assert_called_once_with(['banana'], workers=1)
+        self.assertIn('banana', cache)
+
     def test_get_nutrition_empty_nutrition_data(self):
         """Test nutrition retrieval when nutrition data is empty."""
         # Create food with no nutrition data
@@ -282,6 +373,37 @@ class TestOfflineNutritionLookup(unittest.TestCase):
         
         self.assertEqual(nutrition, {})
     
+    def test_get_nutrition_subset(self):
+        """Test that only the requested nutrients are returned."""
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir)
+
+        result = lookup.get_nutrition_for_food("apple", nutrients=['Energy', 'Protein', 'Vitamin Z'])
+
+        self.assertTrue(result['success'])
+        self.assertEqual(set(result['nutrition'].keys()), {'Energy', 'Protein'})
+        self.assertEqual(result['nutrition']['Protein']['amount'], 0.3)
+
+    def test_nutrient_index_groups_unsorted_rows(self):
+        """Test that the fdc_id index handles rows that are not grouped by food in the CSV."""
+        food_nutrient_data = {
+            'fdc_id': [1002, 1001, 1002, 1001, 9999],
+            'nutrient_id': [1008, 1008, 1005, 1003, 7777],
+            'amount': [89.0, 52.0, 23.0, 0.3, 1.0],
+        }
+        pd.DataFrame(food_nutrient_data).to_csv(self.food_nutrient_csv, index=False)
+        lookup = OfflineNutritionLookup(data_folder=self.test_dir)
+
+        self.assertEqual(lookup._get_nutrition(1001), {
+            'Energy': {'amount': 52.0, 'unit': 'kcal'},
+            'Protein': {'amount': 0.3, 'unit': 'g'}
+        })
+        self.assertEqual(lookup._get_nutrition(1002), {
+            'Energy': {'amount': 89.0, 'unit': 'kcal'},
+            'Carbohydrate, by difference': {'amount': 23.0, 'unit': 'g'}
+        })
+        # Rows for unknown nutrient ids are dropped from the index
+        self.assertEqual(lookup._get_nutrition(9999), {})
+
     def test_nutrient_lookup_creation(self):
         """Test that nutrient lookup dictionary is created correctly."""
         lookup = OfflineNutritionLookup(data_folder=self.test_dir)
@@ -0,0 +1,183 @@
+import unittest
+import unittest.mock
+import os
+import sys
+import shutil
+import tempfile
+import time
+import pandas as pd
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.ai_models.nutrition_lookup.nutrition_lookup import OfflineNutritionLookup
+from backend.ai_models.nutrition_lookup.recipe_nutrition import (
+    RecipeNutritionCalculator, parse_quantity, normalize_unit
+)
+from backend.services.main.nutrition_service import NutritionService
+
+
+class TestRecipeNutritionCalculator(unittest.TestCase):
+
+    def setUp(self):
+        """Create small USDA-style tables: per-100 g values for a few staple foods."""
+        self.test_dir = tempfile.mkdtemp()
+        foods = {
+            2001: ('Wheat flour, white, all-purpose', {1008: 364.0, 1003: 10.3, 1004: 1.0, 1005: 76.3}),
+            2002: ('Egg, whole, raw', {1008: 143.0, 1003: 12.6, 1004: 9.5, 1253: 372.0, 1093: 142.0}),
+            2003: ('Milk, whole', {1008: 61.0, 1003: 3.2, 1004: 3.3, 1005: 4.8}),
+            2004: ('Sugar, granulated', {1008: 387.0, 1005: 100.0, 2000: 99.8}),
+            2005: ('Butter, salted', {1008: 717.0, 1004: 81.1, 1093: 643.0, 1253: 215.0}),
+        }
+        pd.DataFrame({
+            'fdc_id': list(foods),
+            'description': [description for description, _ in foods.values()]
+        }).to_csv(os.path.join(self.test_dir, 'food.csv'), index=False)
+        pd.DataFrame({
+            'id': [1008, 1003, 1004, 1005, 1093, 1253, 2000],
+            'name': ['Energy', 'Protein', 'Total lipid (fat)', 'Carbohydrate, by difference',
+                     'Sodium, Na', 'Cholesterol', 'Total Sugars'],
+            'unit_name': ['KCAL', 'G', 'G', 'G', 'MG', 'MG', 'G']
+        }).to_csv(os.path.join(self.test_dir, 'nutrient.csv'), index=False)
+        rows = [(fdc_id, nutrient_id, amount)
+                for fdc_id, (_, amounts) in foods.items() for nutrient_id, amount in amounts.items()]
+        pd.DataFrame(rows, columns=['fdc_id', 'nutrient_id', 'amount']).to_csv(
+            os.path.join(self.test_dir, 'food_nutrient.csv'), index=False)
+
+        self.lookup = OfflineNutritionLookup(data_folder=self.test_dir, use_cache=False)
+        self.calculator = RecipeNutritionCalculator(self.lookup)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _service(self):
+        patcher = unittest.mock.patch.object(NutritionService, 'lookup', new_callable=unittest.mock.PropertyMock,
+                                             return_value=self.lookup)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return NutritionService.__new__(NutritionService)
+
+    def test_parse_quantity(self):
+        """Test integers, decimals, fractions, mixed numbers, unicode fractions and ranges."""
+        self.assertEqual(parse_quantity(2), 2.0)
+        self.assertEqual(parse_quantity('1.5'), 1.5)
+        self.assertEqual(parse_quantity('1/2'), 0.5)
+        self.assertEqual(parse_quantity('1 1/2'), 1.5)
+        self.assertEqual(parse_quantity('1½'), 1.5)
+        self.assertEqual(parse_quantity('2-3'), 2.5)
+        self.assertIsNone(parse_quantity('some'))
+        self.assertIsNone(parse_quantity('1/0'))
+
+    def test_normalize_unit(self):
+        """Test that plurals, trailing dots and case are normalized."""
+        self.assertEqual(normalize_unit('Tbsps.'), 'tbsp')
+        self.assertEqual(normalize_unit('cups'), 'cup')
+        self.assertEqual(normalize_unit('Cloves'), 'clove')
+        self.assertEqual(normalize_unit(None), '')
+
+    def test_to_grams(self):
+        """Test mass, volume (with density), counted items and unknown units."""
+        self.assertAlmostEqual(self.calculator.to_grams('butter', '1', 'lb'), 453.592)
+        self.assertAlmostEqual(self.calculator.to_grams('flour', '1', 'cup'), 236.588 * 0.53)
+        self.assertAlmostEqual(self.calculator.to_grams('egg', '2', ''), 100.0)
+        self.assertAlmostEqual(self.calculator.to_grams('eggs', '2', 'large'), 125.0)
+        self.assertEqual(self.calculator.to_grams('salt', '', 'to taste'), 0.0)
+        self.assertIsNone(self.calculator.to_grams('mystery', '1', 'piece'))
+        self.assertIsNone(self.calculator.to_grams('flour', '1', 'shovel'))
+
+    def test_calculate_sums_and_divides_by_servings(self):
+        """Test per-serving totals for a simple recipe."""
+        recipe = {
+            'Servings': 2,
+            'Ingredients': [
+                {'Ingredient': 'Flour', 'Quantity': '200', 'Unit': 'g'},
+                {'Ingredient': 'Eggs', 'Quantity': '2', 'Unit': ''},
+            ]
+        }
+        per_serving, resolved, unresolved = self.calculator.calculate(recipe)
+
+        self.assertEqual(unresolved, [])
+        self.assertEqual(len(resolved), 2)
+        expected_calories = (364.0 * 2 + 143.0 * 1) / 2
+        self.assertAlmostEqual(per_serving['calories'], expected_calories)
+        self.assertAlmostEqual(per_serving['cholesterol'], 372.0 / 2)
+
+    def test_service_output_matches_gemini_shape(self):
+        """Test that the local result has the NutritionInfoJSON shape and skips the fallback."""
+        fallback = unittest.mock.Mock()
+        recipe = {
+            'Servings': '4',
+            'Ingredients': [
+                {'Ingredient': 'whole milk', 'Quantity': '1', 'Unit': 'cup'},
+                {'Ingredient': 'sugar', 'Quantity': '1/2', 'Unit': 'cup'},
+                {'Ingredient': 'salt', 'Quantity': '', 'Unit': 'to taste'},
+            ]
+        }
+        result = self._service().get_recipe_nutrition(recipe, fallback=fallback)
+
+        fallback.assert_not_called()
+        self.assertTrue(result['success'])
+        self.assertTrue(result['per_serving'])
+        self.assertEqual(result['source'], 'local')
+        self.assertEqual(set(result['nutrition']),
+                         {'calories', 'protein', 'carbohydrates', 'fat', 'fiber', 'sugar', 'sodium', 'cholesterol'})
+        self.assertEqual(result['nutrition']['calories']['unit'], 'kcal')
+        self.assertEqual(result['nutrition']['sodium']['unit'], 'mg')
+
+    def test_fallback_only_receives_unresolved_ingredients(self):
+        """Test that Gemini is asked only about the ingredients the local engine cannot match."""
+        fallback = unittest.mock.Mock(return_value={
+            'success': True,
+            'nutrition': {'calories': {'amount': 50, 'unit': 'kcal'}, 'vitamin_c': {'amount': 5, 'unit': 'mg'}}
+        })
+        recipe = {
+            'Servings': 1,
+            'Ingredients': [
+                {'Ingredient': 'butter', 'Quantity': '100', 'Unit': 'g'},
+                {'Ingredient': 'dragonfruit', 'Quantity': '1', 'Unit': 'piece'},
+            ]
+        }
+        result = self._service().get_recipe_nutrition(recipe, fallback=fallback)
+
+        sent = fallback.call_args[0][0]
+        self.assertEqual([ing['Ingredient'] for ing in sent['Ingredients']], ['dragonfruit'])
+        self.assertEqual(result['source'], 'local+gemini')
+        self.assertAlmostEqual(result['nutrition']['calories']['amount'], 767.0)
+        self.assertNotIn('vitamin_c', result['nutrition'])
+
+    def test_failed_fallback_keeps_local_totals(self):
+        """Test that a failing fallback still returns the local estimate, noting what was left out."""
+        fallback = unittest.mock.Mock(return_value={'success': False, 'error': 'API key not configured'})
+        recipe = {'Servings': 1, 'Ingredients': [
+            {'Ingredient': 'butter', 'Quantity': '100', 'Unit': 'g'},
+            {'Ingredient': 'dragonfruit', 'Quantity': '1', 'Unit': 'piece'},
+        ]}
+        result = self._service().get_recipe_nutrition(recipe, fallback=fallback)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['unresolved_ingredients'], ['dragonfruit'])
+        self.assertAlmostEqual(result['nutrition']['calories']['amount'], 717.0)
+
+    def test_nothing_resolved_returns_fallback_result(self):
+        """Test that the fallback result is returned as-is when nothing resolves locally."""
+        fallback_result = {'success': False, 'error': 'Unable to calculate'}
+        fallback = unittest.mock.Mock(return_value=fallback_result)
+        recipe = {'Servings': 1, 'Ingredients': [{'Ingredient': 'dragonfruit', 'Quantity': '1', 'Unit': 'piece'}]}
+
+        self.assertEqual(self._service().get_recipe_nutrition(recipe, fallback=fallback), fallback_result)
+
+    def test_fifteen_ingredients_under_50ms(self):
+        """Test that a 15-ingredient recipe is calculated well within the latency budget."""
+        names = ['flour', 'eggs', 'milk', 'sugar', 'butter']
+        recipe = {'Servings': 6, 'Ingredients': [
+            {'Ingredient': names[i % len(names)], 'Quantity': str(i + 1), 'Unit': 'tbsp'} for i in range(15)
+        ]}
+        self.calculator.calculate(recipe)
+
+        start = time.perf_counter()
+        self.calculator.calculate(recipe)
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.utils.spacy_registry import SpacyRegistry
+
+
+def fake_nlp():
+    """A stand-in for en_core_web_sm without NER, where tagger and parser listen to tok2vec."""
+    pipes = {
+        'tok2vec': SimpleNamespace(listening_components=['tagger', 'parser']),
+        'tagger': SimpleNamespace(),
+        'parser': SimpleNamespace(),
+        'attribute_ruler': SimpleNamespace(),
+        'lemmatizer': SimpleNamespace(),
+    }
+    nlp = MagicMock()
+    nlp.pipe_names = list(pipes)
+    nlp.get_pipe.side_effect = pipes.__getitem__
+    return nlp
+
+
+class TestSpacyRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = SpacyRegistry(exclude=['ner'])
+
+    @patch('spacy.load')
+    def test_views_share_one_load(self, mock_spacy_load):
+        """Test that each model loads once and every view runs only what its components need."""
+        nlp = fake_nlp()
+        mock_spacy_load.return_value = nlp
+
+        lemmas = self.registry.get('en_core_web_sm', ('tagger', 'lemmatizer'))
+        parses = self.registry.get('en_core_web_sm', ('parser', 'lemmatizer', 'tagger'))
+        everything = self.registry.get('en_core_web_sm')
+
+        mock_spacy_load.assert_called_once_with('en_core_web_sm', exclude=['ner'])
+        self.assertIs(lemmas.nlp, parses.nlp)
+        self.assertIs(self.registry.get('en_core_web_sm', ('lemmatizer', 'tagger')), lemmas)
+        self.assertEqual(lemmas.enabled, ['tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer'])
+        self.assertEqual(lemmas.disabled, ['parser'])
+        self.assertEqual(parses.disabled, [])
+        self.assertEqual(everything.enabled, nlp.pipe_names)
+
+        lemmas("butter")
+        nlp.assert_called_once_with("butter", disable=['parser'])
+        list(lemmas.pipe(["butter", "milk"], batch_size=8))
+        nlp.pipe.assert_called_once_with(["butter", "milk"], batch_size=8, n_process=1, disable=['parser'])
+
+    @patch('spacy.load')
+    def test_failed_load_is_retried(self, mock_spacy_load):
+        """Test that a model that failed to load is not cached."""
+        mock_spacy_load.side_effect = [OSError("Can't find model"), fake_nlp()]
+
+        with self.assertRaises(OSError):
+            self.registry.get('en_core_web_sm', ('tagger',))
+        self.assertEqual(self.registry.stats(), {})
+
+        self.registry.get('en_core_web_sm', ('tagger',))
+        self.assertEqual(mock_spacy_load.call_count, 2)
+
+    @patch('spacy.load')
+    def test_stats(self, mock_spacy_load):
+        """Test that stats report components, load time, memory and views per model."""
+        mock_spacy_load.return_value = fake_nlp()
+        self.registry.get('en_core_web_sm', ('tagger', 'lemmatizer'))
+
+        stats = self.registry.stats()['en_core_web_sm']
+
+        self.assertEqual(stats['excluded'], ['ner'])
+        self.assertEqual(stats['views'], {'lemmatizer+tagger': ['tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer']})
+        self.assertGreaterEqual(stats['load_seconds'], 0)
+        self.assertGreaterEqual(stats['rss_mb'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import time
+import pandas as pd
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.ai_models.substitution_models import substitution_graph
+from backend.ai_models.substitution_models.substitution_graph import SubstitutionGraph, build_tables
+from backend.ai_models.substitution_models.substitution_recommender import SubstitutionRecommender
+from backend.utils.mmap_tables import StringTable
+
+
+def graph_for(rows):
+    return SubstitutionGraph(build_tables(pd.DataFrame(rows, columns=['normalized_ingredient', 'normalized_substitute'])))
+
+
+class TestSubstitutionGraph(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.test_dir, 'sub_normalized.csv')
+        self._write_csv([('butter', 'oil'), ('butter', 'oil'), ('oil', 'ghee'), ('milk', 'cream')])
+
+    def tearDown(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_csv(self, rows):
+        pd.DataFrame(rows, columns=['normalized_ingredient', 'normalized_substitute']).to_csv(self.csv_path, index=False)
+
+    def test_two_hop_candidates_are_decayed(self):
+        """Test that neighbours of neighbours follow the direct substitutes with decayed scores."""
+        graph = graph_for([('butter', 'oil'), ('butter', 'oil'), ('oil', 'ghee'), ('milk', 'cream')])
+
+        self.assertEqual(graph.ranked('butter', include_hops=True), [('oil', 1.0, 1), ('ghee', 0.25, 2)])
+        self.assertEqual(graph.ranked('ghee', include_hops=True), [('oil', 1.0, 1), ('butter', 0.5, 2)])
+        self.assertEqual(graph.ranked('oil'), [('butter', 1.0), ('ghee', 0.5)])
+        self.assertEqual(graph.ranked('butter', top_n=1), [('oil', 1.0)])
+        self.assertEqual(graph.ranked('chocolate'), [])
+        self.assertEqual(len(graph), 5)
+
+    def test_best_path_and_candidate_limit(self):
+        """Test that 2-hop scores keep the best path and lists are capped at MAX_CANDIDATES."""
+        rows = [('a', 'b'), ('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd'), ('c', 'd')]
+        rows += [('hub', f'spoke {i:02d}') for i in range(substitution_graph.MAX_CANDIDATES + 5)]
+        graph = graph_for(rows)
+
+        # a-b-d scores 0.5 * 1.0 * 0.5, a-c-d scores 0.5 * 0.5 * 1.0: the best path wins, not the sum.
+        self.assertEqual(graph.ranked('a', include_hops=True), [('b', 1.0, 1), ('c', 0.5, 1), ('d', 0.25, 2)])
+        self.assertEqual(len(graph.ranked('hub', top_n=100)), substitution_graph.MAX_CANDIDATES)
+        self.assertEqual(graph.ranked('hub', top_n=2), [('spoke 00', 1.0), ('spoke 01', 1.0)])
+
+    def test_artifact_round_trip_and_rebuild(self):
+        """Test that the recommender reuses the artifact and rebuilds it when the CSV changes."""
+        with patch('spacy.load', return_value=MagicMock()):
+            SubstitutionRecommender(data_file_path=self.csv_path, graph_cache_dir=os.path.join(self.test_dir, 'cache'))
+            with patch.object(substitution_graph, 'build_tables', side_effect=AssertionError('rebuilt')):
+                cached = SubstitutionRecommender(data_file_path=self.csv_path,
+                                                 graph_cache_dir=os.path.join(self.test_dir, 'cache'))
+
+            self.assertTrue(cached.is_ready())
+            self.assertIsInstance(cached.substitute_graph.names, StringTable)
+            self.assertIsInstance(cached.substitute_graph.scores, np.memmap)
+            self.assertIsNone(cached._df_substitutes)
+            self.assertEqual(cached.substitute_graph.ranked('butter'), [('oil', 1.0), ('ghee', 0.25)])
+
+            time.sleep(0.01)
+            self._write_csv([('butter', 'margarine')])
+            rebuilt = SubstitutionRecommender(data_file_path=self.csv_path,
+                                              graph_cache_dir=os.path.join(self.test_dir, 'cache'))
+            self.assertEqual(rebuilt.substitute_graph.ranked('butter'), [('margarine', 1.0)])
+            self.assertEqual(len(os.listdir(os.path.join(self.test_dir, 'cache'))), 1)
+
+    def test_main_builds_artifact(self):
+        """Test that the CLI writes an artifact next to the CSV."""
+        self.assertEqual(substitution_graph.main([self.csv_path]), 0)
+
+        tables = substitution_graph.load_tables(self.csv_path)
+        self.assertIsNotNone(tables)
+        self.assertEqual(SubstitutionGraph(tables).ranked('milk'), [('cream', 1.0)])
+        self.assertEqual(substitution_graph.main([os.path.join(self.test_dir, 'missing.csv')]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
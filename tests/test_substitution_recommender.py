@@ -9,6 +9,18 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from backend.ai_models.substitution_models.substitution_recommender import SubstitutionRecommender
+from backend.utils.lru_cache import LRUCache
+
+
+def noun_doc(text, disable=()):
+    """Fake spaCy doc treating each word as a noun lemma."""
+    tokens = []
+    for word in text.split():
+        token = MagicMock()
+        token.pos_ = "NOUN"
+        token.lemma_ = word.rstrip('s')
+        tokens.append(token)
+    return tokens
 
 
 class TestSubstitutionRecommender(unittest.TestCase):
@@ -45,7 +57,7 @@ class TestSubstitutionRecommender(unittest.TestCase):
         
         self.assertTrue(recommender.is_ready())
         self.assertEqual(len(recommender.df_substitutes), 5)
-        mock_spacy_load.assert_called_once_with("en_core_web_sm", disable=["parser", "ner"])
+        mock_spacy_load.assert_called_once_with("en_core_web_sm", exclude=["ner"])
     
     def test_init_missing_csv_file(self):
         """Test initialization with missing CSV file."""
@@ -322,6 +334,74 @@ class TestSubstitutionRecommender(unittest.TestCase):
         # Note: The actual implementation might not filter out "extra" as expected
         # This test verifies the current behavior rather than the ideal behavior
 
+    @patch('spacy.load')
+    def test_substitute_graph_matches_dataframe_ranking(self, mock_spacy_load):
+        """Test that graph lookups rank exactly like counting both CSV columns with value_counts."""
+        import random
+        random.seed(3)
+        names = ['butter', 'oil', 'margarine', 'ghee', 'lard', 'milk', 'cream', 'yogurt', None]
+        rows = [(random.choice(names), random.choice(names)) for _ in range(300)]
+        graph_csv = os.path.join(self.test_dir, "graph.csv")
+        pd.DataFrame(rows, columns=['normalized_ingredient', 'normalized_substitute']).to_csv(graph_csv, index=False)
+        mock_spacy_load.return_value = MagicMock()
+
+        recommender = SubstitutionRecommender(data_file_path=graph_csv, spacy_model_name="en_core_web_sm")
+        df = recommender.df_substitutes
+        for name in names[:-1] + ['chocolate']:
+            subs = df[df['normalized_ingredient'] == name]['normalized_substitute'].tolist() + \
+                df[df['normalized_substitute'] == name]['normalized_ingredient'].tolist()
+            counts = pd.Series(subs, dtype=object).value_counts()
+            expected = sorted(((sub, count / counts.max()) for sub, count in counts.items()), key=lambda r: (-r[1], r[0]))
+            with patch.object(recommender, 'normalize_ingredient', return_value=name):
+                for top_n in (3, 20):
+                    results = recommender.get_substitutes(name, top_n=top_n)
+                    self.assertEqual([(r['name'], r['score']) for r in results], expected[:top_n], name)
+
+    @patch('spacy.load')
+    def test_normalize_ingredient_uses_cache(self, mock_spacy_load):
+        """Test that repeated normalizations, in any case, run spaCy once."""
+        mock_nlp = MagicMock(side_effect=noun_doc)
+        mock_spacy_load.return_value = mock_nlp
+        cache = LRUCache(maxsize=8)
+        recommender = SubstitutionRecommender(data_file_path=self.csv_path, normalize_cache=cache)
+
+        self.assertEqual(recommender.normalize_ingredient("Eggs"), "egg")
+        self.assertEqual(recommender.normalize_ingredient("eggs"), "egg")
+
+        self.assertEqual(mock_nlp.call_count, 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    @patch('spacy.load')
+    def test_normalize_many_batches_uncached_texts(self, mock_spacy_load):
+        """Test that normalize_many keeps input order and pipes each uncached distinct text once."""
+        mock_nlp = MagicMock(side_effect=noun_doc)
+        mock_nlp.pipe.side_effect = lambda texts, **kwargs: [noun_doc(text) for text in texts]
+        mock_spacy_load.return_value = mock_nlp
+        recommender = SubstitutionRecommender(data_file_path=self.csv_path, normalize_cache=LRUCache(maxsize=8))
+        recommender.normalize_ingredient("butter")
+
+        result = recommender.normalize_many(["Eggs", "butter", "sugar", "eggs"], batch_size=16, n_process=1)
+
+        self.assertEqual(result, ["egg", "butter", "sugar", "egg"])
+        mock_nlp.pipe.assert_called_once_with(["eggs", "sugar"], batch_size=16, n_process=1, disable=[])
+
+    @patch('spacy.load')
+    def test_get_substitutes_many(self, mock_spacy_load):
+        """Test that batch lookups match get_substitutes for each ingredient."""
+        mock_nlp = MagicMock(side_effect=noun_doc)
+        mock_nlp.pipe.side_effect = lambda texts, **kwargs: [noun_doc(text) for text in texts]
+        mock_spacy_load.return_value = mock_nlp
+        recommender = SubstitutionRecommender(data_file_path=self.csv_path)
+        names = ["Butter", "milk", "chocolate", "Butter"]
+
+        results = recommender.get_substitutes_many(names, top_n=2)
+
+        self.assertEqual(list(results), ["Butter", "milk", "chocolate"])
+        for name in names:
+            self.assertEqual(results[name], recommender.get_substitutes(name, top_n=2))
+        self.assertEqual(results["Butter"], [{'name': 'oil', 'score': 1.0}])
+        self.assertEqual(mock_nlp.pipe.call_count, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,97 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import json
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from backend.ai_models.food_classification.food_classifier import FoodClassifier
+from backend.ai_models.ingredient_classification.ingredient_classifier import FoodIngredientClassifier
+from backend.ai_models.tflite_conversion import convert_classifier
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES = [os.path.join(TESTS_DIR, 'apple.jpg'), os.path.join(TESTS_DIR, 'pizza.jpg')]
+IMAGE_SIZE = (32, 32)
+
+
+class TestTFLiteBackend(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Saves a small convolutional model as both classifiers' .keras files."""
+        import keras
+
+        cls.test_dir = tempfile.mkdtemp()
+        inputs = keras.Input(IMAGE_SIZE + (3,))
+        x = keras.layers.Conv2D(8, 3, activation='relu')(inputs)
+        x = keras.layers.GlobalAveragePooling2D()(x)
+        outputs = keras.layers.Dense(4, activation='softmax')(x)
+        model = keras.Model(inputs, outputs)
+        model.save(os.path.join(cls.test_dir, 'food_model.keras'))
+        model.save(os.path.join(cls.test_dir, 'ingredient_model.keras'))
+        with open(os.path.join(cls.test_dir, 'class_names.json'), 'w') as f:
+            json.dump(['apple_pie', 'pizza', 'sushi', 'ramen'], f)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+
+    def tearDown(self):
+        for name in ('food_model.tflite', 'ingredient_model.tflite'):
+            path = os.path.join(self.test_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _batch(self, classifier):
+        return np.concatenate([classifier.preprocess_image(path) for path in IMAGES])
+
+    def test_dynamic_matches_keras(self):
+        """Test that a dynamic-range food model predicts like the Keras model, for any batch size."""
+        keras_classifier = FoodClassifier(model_base_path=self.test_dir, image_size=IMAGE_SIZE)
+        with open(keras_classifier.tflite_path, 'wb') as f:
+            f.write(convert_classifier(keras_classifier, 'dynamic'))
+
+        tflite_classifier = FoodClassifier(model_base_path=self.test_dir, image_size=IMAGE_SIZE, backend='tflite')
+        self.assertEqual(tflite_classifier.backend, 'tflite')
+        self.assertTrue(tflite_classifier.is_model_loaded())
+
+        # Growing batches after a smaller one, and a 3-image batch padded to 4
+        batch = self._batch(keras_classifier)
+        batch = np.concatenate([batch, batch[:1]])
+        expected = keras_classifier.predict_batch(batch)
+        np.testing.assert_allclose(tflite_classifier.predict_batch(batch[:1]), expected[:1], atol=0.02)
+        np.testing.assert_allclose(tflite_classifier.predict_batch(batch[:2]), expected[:2], atol=0.02)
+        np.testing.assert_allclose(tflite_classifier.predict_batch(batch), expected, atol=0.02)
+        self.assertEqual(tflite_classifier.predict_food(IMAGES[0])[0]['name'],
+                         keras_classifier.predict_food(IMAGES[0])[0]['name'])
+
+    def test_int8_with_calibration(self):
+        """Test that a calibrated int8 ingredient model stays close to the Keras model."""
+        keras_classifier = FoodIngredientClassifier(model_base_path=self.test_dir, img_size=IMAGE_SIZE)
+        with self.assertRaises(ValueError):
+            convert_classifier(keras_classifier, 'int8')
+        tflite_model = convert_classifier(keras_classifier, 'int8', IMAGES, calibration_samples=8)
+        with open(keras_classifier.tflite_path, 'wb') as f:
+            f.write(tflite_model)
+
+        tflite_classifier = FoodIngredientClassifier(model_base_path=self.test_dir, img_size=IMAGE_SIZE, backend='tflite')
+        self.assertEqual(tflite_classifier.backend, 'tflite')
+        batch = self._batch(keras_classifier)
+        np.testing.assert_allclose(tflite_classifier.predict_batch(batch), keras_classifier.predict_batch(batch), atol=0.1)
+        self.assertEqual(len(tflite_classifier.predict_ingredient(IMAGES[1])), 3)
+
+    def test_missing_tflite_falls_back_to_keras(self):
+        """Test that the tflite backend without a converted file loads the Keras model."""
+        classifier = FoodClassifier(model_base_path=self.test_dir, image_size=IMAGE_SIZE, backend='tflite')
+
+        self.assertEqual(classifier.backend, 'keras')
+        self.assertTrue(classifier.is_model_loaded())
+
+
+if __name__ == '__main__':
+    unittest.main()